@@ -18,6 +18,13 @@ from app.models.admin_user import AdminUser
 from app.models.system_settings import SystemSettings
 from app.models.usage_stats import UsageStats
 from app.models.login_history import LoginHistory
+from app.models.email_outbox import EmailOutbox
+from app.models.broadcast_job import BroadcastJob
+from app.models.signing_key import SigningKey
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
+from app.models.one_time_token import OneTimeToken
+from app.models.login_anomaly import LoginAnomaly
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,47 @@
+"""add_broadcast_jobs
+
+Revision ID: 0b6e2d94a7c3
+Revises: f1a4c8e35d62
+Create Date: 2026-10-18 13:40:52.617204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b6e2d94a7c3'
+down_revision: Union[str, None] = 'f1a4c8e35d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('broadcast_jobs',
+    sa.Column('id', sa.CHAR(36), nullable=False),
+    sa.Column('template', sa.String(), nullable=False),
+    sa.Column('context', sa.Text(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('total_recipients', sa.Integer(), nullable=False),
+    sa.Column('processed_count', sa.Integer(), nullable=False),
+    sa.Column('sent_count', sa.Integer(), nullable=False),
+    sa.Column('deferred_count', sa.Integer(), nullable=False),
+    sa.Column('last_user_id', sa.CHAR(36), nullable=True),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('active_seconds', sa.Float(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_by_user_id', sa.CHAR(36), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['created_by_user_id'], ['users.id'], ondelete='SET NULL'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_broadcast_jobs_status'), 'broadcast_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_broadcast_jobs_status'), table_name='broadcast_jobs')
+    op.drop_table('broadcast_jobs')
@@ -0,0 +1,39 @@
+"""add_login_anomalies
+
+Revision ID: 5d2b8f0c6a13
+Revises: 8e41b7c2d5f9
+Create Date: 2026-10-19 00:12:07.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8f0c6a13'
+down_revision: Union[str, None] = '8e41b7c2d5f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('login_anomalies',
+    sa.Column('id', sa.CHAR(36), nullable=False),
+    sa.Column('kind', sa.String(length=32), nullable=False),
+    sa.Column('user_id', sa.CHAR(36), nullable=False),
+    sa.Column('ip_address', sa.String(), nullable=True),
+    sa.Column('observed', sa.Integer(), nullable=False),
+    sa.Column('detected_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_login_anomalies_user_id'), 'login_anomalies', ['user_id'], unique=False)
+    op.create_index(op.f('ix_login_anomalies_detected_at'), 'login_anomalies', ['detected_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_login_anomalies_detected_at'), table_name='login_anomalies')
+    op.drop_index(op.f('ix_login_anomalies_user_id'), table_name='login_anomalies')
+    op.drop_table('login_anomalies')
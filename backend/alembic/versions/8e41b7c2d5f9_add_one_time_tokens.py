@@ -0,0 +1,99 @@
+"""add_one_time_tokens
+
+Moves email verification and password reset tokens out of users into a
+table keyed by the token hash. Pending tokens are carried over (hashed).
+
+Revision ID: 8e41b7c2d5f9
+Revises: 3c9f6a1e8b47
+Create Date: 2026-10-18 18:22:46.310527
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+import hashlib
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41b7c2d5f9'
+down_revision: Union[str, None] = '3c9f6a1e8b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Verification tokens had no expiry; give carried-over ones the new default lifetime
+VERIFICATION_LIFETIME = timedelta(hours=168)
+
+
+def upgrade() -> None:
+    one_time_tokens = op.create_table('one_time_tokens',
+    sa.Column('id', sa.CHAR(36), nullable=False),
+    sa.Column('token_hash', sa.String(length=64), nullable=False),
+    sa.Column('purpose', sa.String(), nullable=False),
+    sa.Column('user_id', sa.CHAR(36), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('token_hash')
+    )
+    op.create_index(op.f('ix_one_time_tokens_user_id'), 'one_time_tokens', ['user_id'], unique=False)
+    op.create_index(op.f('ix_one_time_tokens_expires_at'), 'one_time_tokens', ['expires_at'], unique=False)
+
+    users = sa.table('users',
+        sa.column('id', sa.CHAR(36)),
+        sa.column('email_verification_token', sa.String()),
+        sa.column('password_reset_token', sa.String()),
+        sa.column('password_reset_expires', sa.DateTime(timezone=True)),
+    )
+    conn = op.get_bind()
+    now = datetime.utcnow()
+    rows = []
+    for user_id, verification_token, reset_token, reset_expires in conn.execute(
+        sa.select(
+            users.c.id,
+            users.c.email_verification_token,
+            users.c.password_reset_token,
+            users.c.password_reset_expires,
+        ).where(sa.or_(
+            users.c.email_verification_token.isnot(None),
+            users.c.password_reset_token.isnot(None),
+        ))
+    ):
+        if verification_token:
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'token_hash': hashlib.sha256(verification_token.encode()).hexdigest(),
+                'purpose': 'email_verification',
+                'user_id': str(user_id),
+                'expires_at': now + VERIFICATION_LIFETIME,
+            })
+        if reset_token and reset_expires:
+            rows.append({
+                'id': str(uuid.uuid4()),
+                'token_hash': hashlib.sha256(reset_token.encode()).hexdigest(),
+                'purpose': 'password_reset',
+                'user_id': str(user_id),
+                'expires_at': reset_expires,
+            })
+    if rows:
+        op.bulk_insert(one_time_tokens, rows)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('password_reset_expires')
+        batch_op.drop_column('password_reset_token')
+        batch_op.drop_column('email_verification_token')
+
+
+def downgrade() -> None:
+    # Pending tokens are not restored (only their hashes were kept)
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('email_verification_token', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('password_reset_token', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('password_reset_expires', sa.DateTime(timezone=True), nullable=True))
+
+    op.drop_index(op.f('ix_one_time_tokens_expires_at'), table_name='one_time_tokens')
+    op.drop_index(op.f('ix_one_time_tokens_user_id'), table_name='one_time_tokens')
+    op.drop_table('one_time_tokens')
@@ -0,0 +1,36 @@
+"""add_signing_keys
+
+Revision ID: a7d3e91f5c28
+Revises: 0b6e2d94a7c3
+Create Date: 2026-10-18 15:12:07.441390
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e91f5c28'
+down_revision: Union[str, None] = '0b6e2d94a7c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('signing_keys',
+    sa.Column('kid', sa.String(length=32), nullable=False),
+    sa.Column('algorithm', sa.String(), nullable=False),
+    sa.Column('private_key', sa.Text(), nullable=False),
+    sa.Column('public_jwk', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=False),
+    sa.Column('not_before', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('kid')
+    )
+    op.create_index(op.f('ix_signing_keys_not_before'), 'signing_keys', ['not_before'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_signing_keys_not_before'), table_name='signing_keys')
+    op.drop_table('signing_keys')
@@ -0,0 +1,38 @@
+"""add_login_history_keyset_indexes
+
+Composite (user_id, logged_in_at DESC, id DESC) and
+(ip_address, logged_in_at DESC, id DESC) indexes for the keyset-paginated admin
+login history pages (id breaks ties between equal timestamps, so a page needs
+no sort). The user_id index is superseded by the composite one. On PostgreSQL the indexes are built CONCURRENTLY so logins
+keep being recorded while a large table is indexed.
+
+Revision ID: b93e4a7d1c56
+Revises: 5d2b8f0c6a13
+Create Date: 2026-10-19 00:31:44.207615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b93e4a7d1c56'
+down_revision: Union[str, None] = '5d2b8f0c6a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_login_history_user_id_logged_in_at', 'login_history', ['user_id', sa.text('logged_in_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_login_history_ip_address_logged_in_at', 'login_history', ['ip_address', sa.text('logged_in_at DESC'), sa.text('id DESC')], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_login_history_user_id', table_name='login_history', postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index('ix_login_history_user_id', 'login_history', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.drop_index('ix_login_history_ip_address_logged_in_at', table_name='login_history', postgresql_concurrently=True)
+        op.drop_index('ix_login_history_user_id_logged_in_at', table_name='login_history', postgresql_concurrently=True)
@@ -0,0 +1,29 @@
+"""clear_delivered_email_bodies
+
+Clears the bodies of outbox messages that were already sent or given up on.
+They hold verification and password reset links; the outbox now clears them
+itself when a message leaves the queue. Nothing to restore on downgrade.
+
+Revision ID: c7e19b3a5d42
+Revises: f4a2c8d61b3e
+Create Date: 2026-10-19 03:05:12.841907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e19b3a5d42'
+down_revision: Union[str, None] = 'f4a2c8d61b3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE email_outbox SET body = '', html_body = NULL WHERE status IN ('sent', 'failed')")
+
+
+def downgrade() -> None:
+    pass
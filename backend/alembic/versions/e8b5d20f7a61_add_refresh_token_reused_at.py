@@ -0,0 +1,29 @@
+"""add_refresh_token_reused_at
+
+Records the one extra exchange a refresh token allows within the reuse grace
+period after rotation, so a second replay revokes the session.
+
+Revision ID: e8b5d20f7a61
+Revises: c7e19b3a5d42
+Create Date: 2026-10-19 03:41:26.305518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b5d20f7a61'
+down_revision: Union[str, None] = 'c7e19b3a5d42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('refresh_tokens', sa.Column('reused_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('refresh_tokens', 'reused_at')
@@ -0,0 +1,26 @@
+"""add_email_outbox_html_body
+
+Revision ID: f1a4c8e35d62
+Revises: e5b7a2c94f10
+Create Date: 2026-10-18 11:03:27.194532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a4c8e35d62'
+down_revision: Union[str, None] = 'e5b7a2c94f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('email_outbox', sa.Column('html_body', sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('email_outbox', 'html_body')
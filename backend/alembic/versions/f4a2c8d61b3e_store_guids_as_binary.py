@@ -0,0 +1,111 @@
+"""store_guids_as_binary
+
+Converts every GUID column from CHAR(36) text to 16 bytes, which more than
+halves the size of the keys and of every index on them: to BLOB on SQLite
+and to the native uuid type on PostgreSQL (the earlier migrations created
+CHAR(36) columns there too). On PostgreSQL each table is rewritten under an
+exclusive lock, and the foreign keys to users.id are dropped and recreated
+around the conversion. Other databases keep CHAR(36).
+
+Revision ID: f4a2c8d61b3e
+Revises: b93e4a7d1c56
+Create Date: 2026-10-19 02:14:37.518204
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a2c8d61b3e'
+down_revision: Union[str, None] = 'b93e4a7d1c56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# GUID columns per table, with their nullability
+GUID_COLUMNS = {
+    'users': [('id', False)],
+    'admin_users': [('id', False), ('user_id', False), ('added_by_user_id', True)],
+    'system_settings': [('id', False), ('updated_by_user_id', True)],
+    'usage_stats': [('id', False)],
+    'login_history': [('id', False), ('user_id', False)],
+    'email_outbox': [('id', False)],
+    'broadcast_jobs': [('id', False), ('last_user_id', True), ('created_by_user_id', True)],
+    'refresh_tokens': [('id', False), ('user_id', False), ('family_id', False)],
+    'one_time_tokens': [('id', False), ('user_id', False)],
+    'login_anomalies': [('id', False), ('user_id', False)],
+}
+
+# The table copy recreates reflected indexes without their sort order
+DESCENDING_INDEXES = {
+    'login_history': [
+        ('ix_login_history_user_id_logged_in_at', ['user_id', 'logged_in_at DESC', 'id DESC']),
+        ('ix_login_history_ip_address_logged_in_at', ['ip_address', 'logged_in_at DESC', 'id DESC']),
+    ],
+}
+
+
+def _guid_to_bytes(value):
+    return uuid.UUID(value).bytes if isinstance(value, str) else value
+
+
+def _guid_to_text(value):
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+
+def _convert_postgresql(bind, from_type, to_type, cast: str) -> None:
+    # A foreign key needs matching types on both sides, so none may exist
+    # while users.id and the columns referencing it are converted one by one
+    inspector = sa.inspect(bind)
+    foreign_keys = [(table, fk) for table in GUID_COLUMNS for fk in inspector.get_foreign_keys(table)]
+    for table, fk in foreign_keys:
+        op.drop_constraint(fk['name'], table, type_='foreignkey')
+    for table, columns in GUID_COLUMNS.items():
+        for column, nullable in columns:
+            op.alter_column(
+                table, column, existing_type=from_type, type_=to_type,
+                existing_nullable=nullable, postgresql_using=f'{column}::{cast}',
+            )
+    for table, fk in foreign_keys:
+        op.create_foreign_key(
+            fk['name'], table, fk['referred_table'], fk['constrained_columns'], fk['referred_columns'],
+            ondelete=fk['options'].get('ondelete'),
+        )
+
+
+def _convert(function, from_type, to_type) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        if isinstance(to_type, sa.LargeBinary):
+            _convert_postgresql(bind, sa.CHAR(36), postgresql.UUID(as_uuid=True), 'uuid')
+        else:
+            _convert_postgresql(bind, postgresql.UUID(as_uuid=True), sa.CHAR(36), 'text')
+        return
+    if bind.dialect.name != 'sqlite':
+        return
+
+    # Values are converted in place first: SQLite keeps a value's own type
+    # whatever the column's, and the table copy below only casts BLOB to BLOB
+    # (upgrade) or text to text (downgrade)
+    bind.connection.driver_connection.create_function('convert_guid', 1, function, deterministic=True)
+    for table, columns in GUID_COLUMNS.items():
+        for column, _ in columns:
+            op.execute(f'UPDATE {table} SET {column} = convert_guid({column}) WHERE {column} IS NOT NULL')
+        with op.batch_alter_table(table) as batch_op:
+            for column, nullable in columns:
+                batch_op.alter_column(column, existing_type=from_type, type_=to_type, existing_nullable=nullable)
+        for index, index_columns in DESCENDING_INDEXES.get(table, []):
+            op.drop_index(index, table_name=table)
+            op.create_index(index, table, [sa.text(column) for column in index_columns], unique=False)
+
+
+def upgrade() -> None:
+    _convert(_guid_to_bytes, sa.CHAR(36), sa.LargeBinary())
+
+
+def downgrade() -> None:
+    _convert(_guid_to_text, sa.LargeBinary(), sa.CHAR(36))
@@ -1,27 +1,99 @@
 """
 API dependencies for authentication and authorization.
 """
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
+from app.core.profiling import dependant_codes, start_request_profile
+from app.core.revocation import revocation_list
 from app.core.security import decode_access_token
 from app.models.user import User
 
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+@dataclass
+class Principal:
+    """Authenticated user as described by the access token claims."""
+
+    id: uuid.UUID
+    email: str
+    is_admin: bool
+
+
+def _unauthorized(detail: str = "Invalid authentication credentials") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+def get_token_payload(
     credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> Dict[str, Any]:
+    """
+    Dependency to verify the bearer token and return its claims.
+
+    Checks the signature, expiry and the in-memory revocation list; no
+    database query.
+
+    Args:
+        credentials: HTTP Bearer token credentials
+
+    Returns:
+        Token claims
+
+    Raises:
+        HTTPException: If the token is invalid, expired or revoked
+    """
+    payload = decode_access_token(credentials.credentials)
+    if payload is None or payload.get("sub") is None:
+        raise _unauthorized()
+
+    jti = payload.get("jti")
+    if jti and revocation_list.is_revoked(jti):
+        raise _unauthorized("Token has been revoked")
+
+    return payload
+
+
+def get_optional_token_payload(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> Optional[Dict[str, Any]]:
+    """
+    Dependency returning the bearer token's claims, or None without a valid token.
+
+    Args:
+        credentials: HTTP Bearer token credentials, if sent
+
+    Returns:
+        Token claims, or None if the token is missing, invalid, expired or revoked
+    """
+    if credentials is None:
+        return None
+    try:
+        return get_token_payload(credentials)
+    except HTTPException:
+        return None
+
+
+def get_current_user(
+    payload: Dict[str, Any] = Depends(get_token_payload),
     db: Session = Depends(get_db),
 ) -> User:
     """
     Dependency to get current authenticated user from JWT token.
 
     Args:
-        credentials: HTTP Bearer token credentials
+        payload: Verified token claims
         db: Database session
 
     Returns:
@@ -30,41 +102,53 @@ def get_current_user(
     Raises:
         HTTPException: If authentication fails
     """
-    token = credentials.credentials
+    # Tokens issued before sessions carry only the email
+    user_id: Optional[str] = payload.get("uid")
+    if user_id is not None:
+        user = db.get(User, uuid.UUID(user_id))
+    else:
+        user = db.query(User).filter(User.email == payload["sub"]).first()
+    if user is None:
+        raise _unauthorized("User not found")
 
-    # Decode JWT token
-    payload = decode_access_token(token)
-    if payload is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+    return user
 
-    # Extract user email from token
-    email: Optional[str] = payload.get("sub")
-    if email is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
 
-    # Get user from database
-    user = db.query(User).filter(User.email == email).first()
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-            headers={"WWW-Authenticate": "Bearer"},
+def get_current_principal(
+    payload: Dict[str, Any] = Depends(get_token_payload),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """
+    Dependency to get the authenticated user from the token claims alone.
+
+    For endpoints that only need the user's identity and admin flag. Claims
+    stay current because changing the admin flag revokes the user's access
+    tokens.
+
+    Args:
+        payload: Verified token claims
+        db: Database session (only used for tokens without a "uid" claim)
+
+    Returns:
+        Principal of the authenticated user
+
+    Raises:
+        HTTPException: If authentication fails
+    """
+    if "uid" in payload:
+        return Principal(
+            id=uuid.UUID(payload["uid"]),
+            email=payload["sub"],
+            is_admin=bool(payload.get("adm")),
         )
 
-    return user
+    user = get_current_user(payload, db)
+    return Principal(id=user.id, email=user.email, is_admin=user.is_admin)
 
 
 def require_admin(
-    current_user: User = Depends(get_current_user),
-) -> User:
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
     """
     Dependency to require admin privileges.
 
@@ -72,7 +156,7 @@ def require_admin(
         current_user: Current authenticated user
 
     Returns:
-        User object if user is admin
+        Principal of the user if user is admin
 
     Raises:
         HTTPException: If user is not admin
@@ -83,3 +167,31 @@ def require_admin(
             detail="Admin access required",
         )
     return current_user
+
+
+def profile_request(
+    request: Request,
+    current_user: Principal = Depends(require_admin),
+) -> None:
+    """
+    Dependency to profile the current request on demand.
+
+    Admins add ?_profile=1 (or the header X-Profile: 1) to a request to run
+    the sampling profiler until the response starts, on the threads running
+    the route's endpoint and dependencies. ProfilingMiddleware
+    stores the profile and returns its id in the X-Profile-Id header; fetch it
+    from GET /api/v1/admin/profiles/{id}.
+
+    Args:
+        request: FastAPI request object
+        current_user: Current admin user (profiling is checked after require_admin)
+    """
+    if not settings.profiling_enabled:
+        return
+    if request.query_params.get("_profile") != "1" and request.headers.get("X-Profile") != "1":
+        return
+    # Sample only threads running this route's endpoint or its dependencies
+    route = request.scope.get("route")
+    request.state.profiler = start_request_profile(
+        dependant_codes(route.dependant) if route is not None else None
+    )
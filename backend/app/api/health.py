@@ -0,0 +1,49 @@
+"""
+Health check endpoints.
+"""
+from fastapi import APIRouter
+
+from app.core.health import readiness
+from app.core.responses import DefaultResponse
+from app.core.worker_stats import worker_stats
+
+router = APIRouter()
+
+
+@router.get("")
+def health_check():
+    """Health check endpoint."""
+    return {"status": "healthy"}
+
+
+@router.get("/live")
+async def liveness_check():
+    """
+    Liveness check endpoint.
+
+    Only proves the event loop is serving requests; it never touches
+    dependencies, so a database outage does not get the instance restarted.
+    """
+    return {"status": "alive"}
+
+
+@router.get("/ready")
+def readiness_check():
+    """
+    Readiness check endpoint.
+
+    Reports not ready (503) while the schema is behind the code, the
+    database is unreachable or a dependency is over its configured
+    threshold. Dependency probes are cached for a short TTL.
+    """
+    ready, checks = readiness.check()
+    return DefaultResponse(
+        {"status": "ready" if ready else "not_ready", "checks": checks},
+        status_code=200 if ready else 503,
+    )
+
+
+@router.get("/worker")
+def worker_health():
+    """Stats of the worker process that served this request."""
+    return worker_stats.snapshot()
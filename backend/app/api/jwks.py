@@ -0,0 +1,19 @@
+"""
+JSON Web Key Set endpoint.
+"""
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.config import settings
+from app.core.keys import key_store
+
+router = APIRouter()
+
+
+@router.get("/.well-known/jwks.json")
+def jwks():
+    """Public keys that verify access tokens, matched by the token's "kid" header."""
+    return JSONResponse(
+        key_store.jwks(),
+        headers={"Cache-Control": f"public, max-age={int(settings.jwt_keys_cache_seconds)}"},
+    )
@@ -0,0 +1,15 @@
+"""
+Prometheus metrics endpoint.
+"""
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.metrics import CONTENT_TYPE_LATEST, render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+def metrics():
+    """Metrics of all worker processes in Prometheus text exposition format."""
+    return Response(render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,153 @@
+"""
+Admin broadcast email API endpoints.
+"""
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from pydantic import UUID4
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.broadcast_job import BroadcastJob
+from app.schemas.admin import BroadcastCreateRequest, BroadcastJobResponse
+from app.services.broadcast import broadcast_service
+from app.services.email_templates import TEMPLATES, email_templates, sample_context
+from app.api.deps import Principal, require_admin
+
+router = APIRouter()
+
+
+def _job_response(job: BroadcastJob) -> BroadcastJobResponse:
+    return BroadcastJobResponse(
+        id=job.id,
+        template=job.template,
+        status=job.status,
+        total_recipients=job.total_recipients,
+        processed_count=job.processed_count,
+        sent_count=job.sent_count,
+        deferred_count=job.deferred_count,
+        last_error=job.last_error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        **broadcast_service.progress(job),
+    )
+
+
+def _get_job(db: Session, job_id: UUID4) -> BroadcastJob:
+    job = broadcast_service.get(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Broadcast not found",
+        )
+    return job
+
+
+@router.post("", response_model=BroadcastJobResponse, status_code=status.HTTP_201_CREATED)
+def create_broadcast(
+    request: BroadcastCreateRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Send an email template to every verified user.
+
+    The template is rendered once with the given variables and sample
+    recipient values before the job is created. Requires admin privileges.
+    """
+    if request.template not in TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Unknown email template",
+        )
+    try:
+        email_templates.render(db, request.template, **{**sample_context(request.template), **request.context})
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Template could not be rendered: {e}",
+        )
+
+    job = broadcast_service.create(db, request.template, request.context, current_user.id)
+    return _job_response(job)
+
+
+@router.get("", response_model=List[BroadcastJobResponse])
+def list_broadcasts(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    List recent broadcasts with their progress.
+
+    Requires admin privileges.
+    """
+    return [_job_response(job) for job in broadcast_service.list_jobs(db, limit)]
+
+
+@router.get("/{job_id}", response_model=BroadcastJobResponse)
+def get_broadcast(
+    job_id: UUID4,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get progress and throughput of a broadcast.
+
+    Requires admin privileges.
+    """
+    return _job_response(_get_job(db, job_id))
+
+
+def _change_status(db: Session, job_id: UUID4, allowed_from: tuple, new_status: str) -> BroadcastJobResponse:
+    job = _get_job(db, job_id)
+    if job.status not in allowed_from:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Cannot change a {job.status} broadcast to {new_status}",
+        )
+    return _job_response(broadcast_service.set_status(db, job, new_status))
+
+
+@router.post("/{job_id}/pause", response_model=BroadcastJobResponse)
+def pause_broadcast(
+    job_id: UUID4,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Pause a broadcast after the chunk in progress.
+
+    Requires admin privileges.
+    """
+    return _change_status(db, job_id, ("pending", "running"), "paused")
+
+
+@router.post("/{job_id}/resume", response_model=BroadcastJobResponse)
+def resume_broadcast(
+    job_id: UUID4,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Resume a paused broadcast from its last checkpoint.
+
+    Requires admin privileges.
+    """
+    return _change_status(db, job_id, ("paused",), "running")
+
+
+@router.post("/{job_id}/cancel", response_model=BroadcastJobResponse)
+def cancel_broadcast(
+    job_id: UUID4,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Cancel a broadcast. Messages already sent are not recalled.
+
+    Requires admin privileges.
+    """
+    return _change_status(db, job_id, ("pending", "running", "paused"), "cancelled")
@@ -0,0 +1,33 @@
+"""
+Admin request profile API endpoints.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.profiling import load_request_profile
+from app.api.deps import Principal, require_admin
+
+router = APIRouter()
+
+
+@router.get("/{profile_id}", response_class=PlainTextResponse)
+def get_profile(
+    profile_id: str,
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get a stored request profile in folded stack format.
+
+    Profiles are recorded by adding ?_profile=1 to an admin request; the
+    response's X-Profile-Id header holds the id. The output can be rendered
+    with flamegraph.pl or loaded into speedscope.
+
+    Requires admin privileges.
+    """
+    profile = load_request_profile(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found",
+        )
+    return PlainTextResponse(profile)
@@ -1,19 +1,34 @@
 """
 Admin system settings API endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.breached_passwords import breached_passwords
+from app.core.config import settings as app_settings
 from app.core.database import get_db
-from app.models.user import User
 from app.schemas.admin import (
     SystemSettingsResponse,
     SystemSettingsUpdateRequest,
     AuthSettingsResponse,
     AuthSettingsUpdateRequest,
+    EmailTemplateResponse,
+    EmailTemplateUpdateRequest,
+    EmailTemplatePreviewResponse,
 )
 from app.services.admin_service import admin_service
-from app.api.deps import require_admin
+from app.services.broadcast import broadcast_service
+from app.services.email_templates import (
+    SETTINGS_PREFIX,
+    TEMPLATES,
+    email_templates,
+    sample_context,
+    validate_override,
+)
+from app.api.deps import Principal, require_admin
 
 router = APIRouter()
 
@@ -21,7 +36,7 @@ router = APIRouter()
 @router.get("/browser-guide", response_model=SystemSettingsResponse)
 def get_browser_guide(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get browser guide settings.
@@ -43,7 +58,7 @@ def get_browser_guide(
 def update_browser_guide(
     request: SystemSettingsUpdateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Update browser guide settings.
@@ -63,7 +78,7 @@ def update_browser_guide(
 @router.get("/terms", response_model=SystemSettingsResponse)
 def get_terms(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get terms of service settings.
@@ -82,13 +97,16 @@ def get_terms(
 @router.put("/terms", response_model=SystemSettingsResponse)
 def update_terms(
     request: SystemSettingsUpdateRequest,
+    response: Response,
+    notify_users: bool = Query(False, description="Email every verified user about the change"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Update terms of service settings.
 
-    Requires admin privileges.
+    With notify_users=true, starts a broadcast of the terms_updated email
+    (its id is returned in the X-Broadcast-Id header). Requires admin privileges.
     """
     setting = admin_service.update_system_setting(
         db,
@@ -97,13 +115,21 @@ def update_terms(
         current_user.id,
         request.version,
     )
+    if notify_users:
+        job = broadcast_service.create(
+            db,
+            "terms_updated",
+            {"terms_url": f"{app_settings.frontend_url}/terms", "version": request.version or ""},
+            current_user.id,
+        )
+        response.headers["X-Broadcast-Id"] = str(job.id)
     return SystemSettingsResponse.model_validate(setting)
 
 
 @router.get("/maintenance", response_model=SystemSettingsResponse)
 def get_maintenance(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get maintenance mode settings.
@@ -128,7 +154,7 @@ def get_maintenance(
 def update_maintenance(
     request: SystemSettingsUpdateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Update maintenance mode settings.
@@ -148,7 +174,7 @@ def update_maintenance(
 @router.get("/auth", response_model=AuthSettingsResponse)
 def get_auth_settings(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get authentication settings.
@@ -166,7 +192,7 @@ def get_auth_settings(
 def update_auth_settings(
     request: AuthSettingsUpdateRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Update authentication settings.
@@ -187,6 +213,13 @@ def update_auth_settings(
             detail="Password minimum length must be at least 6 characters",
         )
 
+    # The breached password check needs the filter file
+    if request.password_check_breached and not breached_passwords.loaded:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Breached password filter is not loaded (set BREACHED_PASSWORDS_FILE)",
+        )
+
     # Build settings dictionary
     settings_dict = {
         "mode": request.mode,
@@ -196,6 +229,7 @@ def update_auth_settings(
         "password_require_lowercase": request.password_require_lowercase,
         "password_require_number": request.password_require_number,
         "password_require_special": request.password_require_special,
+        "password_check_breached": request.password_check_breached,
     }
 
     # Update settings
@@ -204,3 +238,117 @@ def update_auth_settings(
     )
 
     return AuthSettingsResponse(**settings_dict)
+
+
+def _email_template_response(db: Session, name: str) -> EmailTemplateResponse:
+    sources = email_templates.default_sources(name)
+    override = email_templates.get_override(db, name)
+    if override:
+        sources.update({part: source for part, source in json.loads(override.value).items() if source})
+    return EmailTemplateResponse(
+        name=name,
+        variables=list(TEMPLATES[name]),
+        overridden=override is not None,
+        updated_at=override.updated_at if override else None,
+        **sources,
+    )
+
+
+def _check_template_name(name: str) -> None:
+    if name not in TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Email template not found",
+        )
+
+
+@router.get("/email-templates", response_model=List[EmailTemplateResponse])
+def list_email_templates(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    List email templates with their current sources.
+
+    Requires admin privileges.
+    """
+    return [_email_template_response(db, name) for name in email_templates.list_templates()]
+
+
+@router.get("/email-templates/{name}", response_model=EmailTemplateResponse)
+def get_email_template(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get an email template (its override, or the default sources).
+
+    Requires admin privileges.
+    """
+    _check_template_name(name)
+    return _email_template_response(db, name)
+
+
+@router.put("/email-templates/{name}", response_model=EmailTemplateResponse)
+def update_email_template(
+    name: str,
+    request: EmailTemplateUpdateRequest,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Override an email template. Parts left empty use the default.
+
+    The override is compiled and rendered with sample values before it is
+    saved. Requires admin privileges.
+    """
+    _check_template_name(name)
+    override = request.model_dump(exclude_none=True)
+    error = validate_override(name, override)
+    if error:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid email template: {error}",
+        )
+
+    admin_service.update_setting(db, SETTINGS_PREFIX + name, override, current_user.id)
+    email_templates.invalidate(name)
+    return _email_template_response(db, name)
+
+
+@router.delete("/email-templates/{name}", response_model=EmailTemplateResponse)
+def reset_email_template(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Remove the override of an email template and return the default.
+
+    Requires admin privileges.
+    """
+    _check_template_name(name)
+    override = email_templates.get_override(db, name)
+    if override:
+        db.delete(override)
+        db.commit()
+    email_templates.invalidate(name)
+    return _email_template_response(db, name)
+
+
+@router.post("/email-templates/{name}/preview", response_model=EmailTemplatePreviewResponse)
+def preview_email_template(
+    name: str,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Render an email template with sample values.
+
+    Requires admin privileges.
+    """
+    _check_template_name(name)
+    email_templates.invalidate(name)
+    message = email_templates.render(db, name, **sample_context(name))
+    return EmailTemplatePreviewResponse(subject=message.subject, text=message.text, html=message.html)
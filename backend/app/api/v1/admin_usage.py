@@ -2,18 +2,21 @@
 Admin usage statistics API endpoints.
 """
 from typing import List
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.models.user import User
+from app.core.responses import PydanticResponse
 from app.schemas.admin import (
+    LoginAnomalyResponse,
+    LoginNetworkResponse,
     UsageSummaryResponse,
     UsageStatsResponse,
     UserListResponse,
 )
 from app.services.admin_service import admin_service
-from app.api.deps import require_admin
+from app.services.login_networks import PREFIX_LENGTHS, SORT_KEYS, login_networks
+from app.api.deps import Principal, require_admin
 
 router = APIRouter()
 
@@ -21,7 +24,7 @@ router = APIRouter()
 @router.get("/summary", response_model=UsageSummaryResponse)
 def get_usage_summary(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get usage summary statistics.
@@ -29,14 +32,14 @@ def get_usage_summary(
     Requires admin privileges.
     """
     summary = admin_service.get_usage_summary(db)
-    return UsageSummaryResponse(**summary)
+    return PydanticResponse(UsageSummaryResponse(**summary))
 
 
 @router.get("/stats", response_model=List[UsageStatsResponse])
 def get_usage_stats(
     days: int = Query(default=30, ge=1, le=365),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get usage statistics for the last N days.
@@ -47,7 +50,10 @@ def get_usage_stats(
     Requires admin privileges.
     """
     stats = admin_service.get_usage_stats(db, days)
-    return [UsageStatsResponse.model_validate(stat) for stat in stats]
+    return PydanticResponse(
+        [UsageStatsResponse.model_validate(stat) for stat in stats],
+        List[UsageStatsResponse],
+    )
 
 
 @router.get("/users", response_model=UserListResponse)
@@ -55,7 +61,7 @@ def get_users(
     page: int = Query(default=1, ge=1),
     limit: int = Query(default=20, ge=1, le=100),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get paginated list of users.
@@ -67,4 +73,65 @@ def get_users(
     Requires admin privileges.
     """
     result = admin_service.get_users_paginated(db, page, limit)
-    return UserListResponse(**result)
+    return PydanticResponse(UserListResponse(**result))
+
+
+@router.get("/login-anomalies", response_model=List[LoginAnomalyResponse])
+def get_login_anomalies(
+    limit: int = Query(default=50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get the most recent logins flagged by the anomaly detector.
+
+    Args:
+        limit: Maximum number of entries (default: 50, max: 200)
+
+    Requires admin privileges.
+    """
+    anomalies = admin_service.get_login_anomalies(db, limit)
+    return PydanticResponse(
+        [LoginAnomalyResponse(**anomaly) for anomaly in anomalies],
+        List[LoginAnomalyResponse],
+    )
+
+
+@router.get("/login-networks", response_model=List[LoginNetworkResponse])
+def get_login_networks(
+    prefix_length: int = Query(default=24, description="16 or 24 (IPv4), 48 (IPv6)"),
+    hours: int = Query(default=1, ge=1, le=168),
+    limit: int = Query(default=20, ge=1, le=200),
+    sort: str = Query(default="attempts", description="Sort by: attempts, logins, failures"),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get the networks with the most login attempts in the last N hours.
+
+    Counts successful logins and failed password checks handled by this
+    worker process since it started, up to LOGIN_NETWORKS_WINDOW_HOURS.
+
+    Args:
+        prefix_length: Network size (default: 24)
+        hours: Window in hours (default: 1)
+        limit: Number of networks (default: 20, max: 200)
+        sort: Order (default: attempts)
+
+    Requires admin privileges.
+    """
+    if prefix_length not in PREFIX_LENGTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"prefix_length must be one of {sorted(PREFIX_LENGTHS)}",
+        )
+    if sort not in SORT_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"sort must be one of {list(SORT_KEYS)}",
+        )
+
+    networks = login_networks.top(prefix_length, hours, limit, sort)
+    return PydanticResponse(
+        [LoginNetworkResponse(**network) for network in networks],
+        List[LoginNetworkResponse],
+    )
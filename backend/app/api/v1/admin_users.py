@@ -1,22 +1,25 @@
 """
 Admin user management API endpoints.
 """
-from typing import List
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from pydantic import UUID4
 
 from app.core.database import get_db
+from app.core.responses import PydanticResponse
 from app.models.user import User
 from app.schemas.admin import (
     AdminUserResponse,
     AdminUserAddRequest,
+    LoginHistoryListResponse,
     UserDetailResponse,
     UserDetailListResponse,
     UpdateUserStatusRequest,
 )
 from app.services.admin_service import admin_service
-from app.api.deps import require_admin
+from app.api.deps import Principal, require_admin
 
 router = APIRouter()
 
@@ -24,7 +27,7 @@ router = APIRouter()
 @router.get("/admins", response_model=List[AdminUserResponse])
 def get_admin_users(
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get list of admin users.
@@ -32,17 +35,20 @@ def get_admin_users(
     Requires admin privileges.
     """
     admin_users = admin_service.get_admin_users(db)
-    return [
-        AdminUserResponse(**{**admin_user, "isSelf": admin_user["email"] == current_user.email})
-        for admin_user in admin_users
-    ]
+    return PydanticResponse(
+        [
+            AdminUserResponse(**{**admin_user, "isSelf": admin_user["email"] == current_user.email})
+            for admin_user in admin_users
+        ],
+        List[AdminUserResponse],
+    )
 
 
 @router.post("/admins", response_model=AdminUserResponse)
 def add_admin_user(
     request: AdminUserAddRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Add a new admin user.
@@ -58,9 +64,9 @@ def add_admin_user(
 
 @router.delete("/admins/{admin_user_id}")
 def remove_admin_user(
-    admin_user_id: UUID4,
+    admin_user_id: UUID,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Remove admin privileges from a user.
@@ -82,7 +88,7 @@ def get_user_details(
     plan: str = Query("all", description="Filter by plan: all, free, monthly, yearly"),
     search: str = Query("", description="Search by name or email"),
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Get detailed user list with plan and status information.
@@ -133,21 +139,21 @@ def get_user_details(
     # Calculate total pages
     pages = (total + limit - 1) // limit
 
-    return UserDetailListResponse(
+    return PydanticResponse(UserDetailListResponse(
         users=user_details,
         total=total,
         page=page,
         limit=limit,
         pages=pages,
-    )
+    ))
 
 
 @router.put("/users/{user_id}/status")
 def update_user_status(
-    user_id: UUID4,
+    user_id: UUID,
     request: UpdateUserStatusRequest,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin),
+    current_user: Principal = Depends(require_admin),
 ):
     """
     Update user status (active/suspended).
@@ -177,3 +183,67 @@ def update_user_status(
     # This is a placeholder for Phase 11 full implementation.
 
     return {"message": f"User status updated to {request.status} (simplified version)"}
+
+
+@router.get("/users/{user_id}/logins", response_model=LoginHistoryListResponse)
+def get_user_logins(
+    user_id: UUID,
+    since: Optional[datetime] = Query(None, description="Logins at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Logins before this time (UTC)"),
+    ip: Optional[str] = Query(None, description="Only logins from this IP address"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get a user's login history, newest first.
+
+    Args:
+        user_id: User ID
+        since: Start of the time range
+        until: End of the time range
+        ip: IP address filter
+        cursor: Page cursor
+        limit: Page size (default: 50, max: 200)
+
+    Requires admin privileges.
+    """
+    if db.get(User, user_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+
+    result = admin_service.get_login_history(
+        db, user_id=user_id, since=since, until=until, ip_address=ip, cursor=cursor, limit=limit
+    )
+    return PydanticResponse(LoginHistoryListResponse(**result))
+
+
+@router.get("/logins", response_model=LoginHistoryListResponse)
+def get_logins(
+    since: Optional[datetime] = Query(None, description="Logins at or after this time (UTC)"),
+    until: Optional[datetime] = Query(None, description="Logins before this time (UTC)"),
+    ip: Optional[str] = Query(None, description="Only logins from this IP address"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(require_admin),
+):
+    """
+    Get the login history of all users, newest first.
+
+    Args:
+        since: Start of the time range
+        until: End of the time range
+        ip: IP address filter
+        cursor: Page cursor
+        limit: Page size (default: 50, max: 200)
+
+    Requires admin privileges.
+    """
+    result = admin_service.get_login_history(
+        db, since=since, until=until, ip_address=ip, cursor=cursor, limit=limit
+    )
+    return PydanticResponse(LoginHistoryListResponse(**result))
@@ -1,14 +1,16 @@
 """
 Authentication API endpoints.
 """
+import uuid
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.core.security import create_access_token
+from app.core.responses import PydanticResponse
 from app.core.config import settings
-from app.models.user import User
+from app.models.user import User, uuid7
 from app.schemas.auth import (
     GoogleLoginRequest,
     RegisterRequest,
@@ -19,6 +21,8 @@ from app.schemas.auth import (
     ForgotPasswordRequest,
     ResetPasswordRequest,
     ChangePasswordRequest,
+    RefreshTokenRequest,
+    LogoutRequest,
     AuthSettingsResponse,
     TokenResponse,
     UserResponse,
@@ -27,8 +31,15 @@ from app.schemas.auth import (
 from app.services.auth_service import auth_service
 from app.services.email_service import email_service
 from app.services.admin_service import admin_service
-from app.core.rate_limit import rate_limiter
-from app.api.deps import get_current_user
+from app.services.login_networks import login_networks
+from app.services.one_time_tokens import (
+    PURPOSE_EMAIL_VERIFICATION,
+    PURPOSE_PASSWORD_RESET,
+    one_time_tokens,
+)
+from app.services.session_service import session_service
+from app.core.rate_limit import account_throttle, rate_limiter
+from app.api.deps import get_current_user, get_optional_token_payload, get_token_payload
 
 router = APIRouter()
 
@@ -57,7 +68,7 @@ def get_auth_settings(db: Session = Depends(get_db)):
 
 
 @router.post("/register", response_model=RegisterResponse)
-async def register(
+def register(
     request: RegisterRequest,
     http_request: Request,
     db: Session = Depends(get_db),
@@ -109,27 +120,26 @@ async def register(
     # Hash password
     hashed_password = auth_service.hash_password(request.password)
 
-    # Generate verification token
-    verification_token = auth_service.generate_verification_token()
-
     # Create user
     # In debug mode, skip email verification
     email_verified = settings.debug
     user = User(
+        id=uuid7(),
         email=request.email,
         name=request.name,
         hashed_password=hashed_password,
         auth_provider="email",
         email_verified=email_verified,
-        email_verification_token=verification_token if not email_verified else None,
         is_admin=request.email in settings.admin_emails_list,
     )
     db.add(user)
-    db.commit()
 
-    # Send verification email only if not in debug mode
+    # Queue verification email only if not in debug mode
     if not settings.debug:
-        await email_service.send_verification_email(request.email, verification_token)
+        db.flush()
+        verification_token = one_time_tokens.issue(db, user.id, PURPOSE_EMAIL_VERIFICATION)
+        email_service.queue_verification_email(db, request.email, verification_token)
+    db.commit()
 
     return RegisterResponse(
         message="登録が完了しました。メールに送信された確認リンクをクリックしてください。",
@@ -141,6 +151,7 @@ async def register(
 def login_with_email(
     login_request: LoginRequest,
     http_request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     """
@@ -149,6 +160,7 @@ def login_with_email(
     Args:
         login_request: Login request with email and password
         http_request: HTTP request object
+        background_tasks: Tasks run after the response is sent
         db: Database session
 
     Returns:
@@ -165,9 +177,15 @@ def login_with_email(
             detail="メール・パスワード認証は現在無効です"
         )
 
+    # Reject accounts under attack before spending a lookup and a bcrypt verification
+    account_throttle.check(login_request.email)
+
     # Find user by email
     user = db.query(User).filter(User.email == login_request.email).first()
+    ip_address = http_request.client.host if http_request.client else None
     if not user or not user.hashed_password:
+        account_throttle.record_failure(login_request.email)
+        login_networks.observe(ip_address, failed=True)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="メールアドレスまたはパスワードが正しくありません"
@@ -175,6 +193,8 @@ def login_with_email(
 
     # Verify password
     if not auth_service.verify_password(login_request.password, user.hashed_password):
+        account_throttle.record_failure(login_request.email)
+        login_networks.observe(ip_address, failed=True)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="メールアドレスまたはパスワードが正しくありません"
@@ -187,24 +207,32 @@ def login_with_email(
             detail="メールアドレスが未確認です。確認メールを確認してください。"
         )
 
+    # Upgrade a hash made with another bcrypt cost once the response is sent
+    if auth_service.needs_rehash(user.hashed_password):
+        background_tasks.add_task(
+            auth_service.rehash_password, user.id, login_request.password, user.hashed_password
+        )
+
     # Update last login time
     user.last_login_at = datetime.utcnow()
     db.commit()
     db.refresh(user)
 
     # Record login history
-    ip_address = http_request.client.host if http_request.client else None
     admin_service.record_login(db, user.id, ip_address)
 
     # Reset rate limit on successful login
     if http_request.client:
         rate_limiter.reset_login_attempts(http_request.client.host)
+    account_throttle.reset(login_request.email)
 
-    # Create JWT token
-    access_token = create_access_token(data={"sub": user.email})
+    # Start a session: short-lived access token plus refresh token
+    tokens = session_service.issue(db, user)
 
     return TokenResponse(
-        access_token=access_token,
+        access_token=tokens.access_token,
+        refresh_token=tokens.refresh_token,
+        expires_in=tokens.expires_in,
         user=UserResponse.model_validate(user),
     )
 
@@ -224,11 +252,21 @@ def verify_email(
     Returns:
         Success message
     """
-    user = db.query(User).filter(
-        User.email_verification_token == request.token
-    ).first()
+    record = one_time_tokens.find(db, request.token, PURPOSE_EMAIL_VERIFICATION)
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="無効な確認トークンです"
+        )
 
-    if not user:
+    if one_time_tokens.is_expired(record):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="確認トークンの有効期限が切れています。確認メールを再送信してください。"
+        )
+
+    user = db.get(User, record.user_id)
+    if not user or not one_time_tokens.redeem(db, record):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="無効な確認トークンです"
@@ -236,14 +274,13 @@ def verify_email(
 
     # Mark email as verified
     user.email_verified = True
-    user.email_verification_token = None
     db.commit()
 
     return {"message": "メールアドレスが確認されました。ログインできます。"}
 
 
 @router.post("/resend-verification")
-async def resend_verification(
+def resend_verification(
     request: ResendVerificationRequest,
     db: Session = Depends(get_db),
 ):
@@ -269,19 +306,18 @@ async def resend_verification(
             detail="このメールアドレスは既に確認済みです"
         )
 
-    # Generate new verification token
-    verification_token = auth_service.generate_verification_token()
-    user.email_verification_token = verification_token
-    db.commit()
+    # Generate new verification token (earlier links stop working)
+    verification_token = one_time_tokens.issue(db, user.id, PURPOSE_EMAIL_VERIFICATION)
 
-    # Send verification email
-    await email_service.send_verification_email(request.email, verification_token)
+    # Queue verification email with the token update
+    email_service.queue_verification_email(db, request.email, verification_token)
+    db.commit()
 
     return {"message": "確認メールを再送信しました"}
 
 
 @router.post("/forgot-password")
-async def forgot_password(
+def forgot_password(
     request: ForgotPasswordRequest,
     db: Session = Depends(get_db),
 ):
@@ -301,14 +337,12 @@ async def forgot_password(
         # Don't reveal if email exists
         return {"message": "パスワードリセットメールを送信しました"}
 
-    # Generate password reset token
-    reset_token, expires = auth_service.generate_password_reset_token()
-    user.password_reset_token = reset_token
-    user.password_reset_expires = expires
-    db.commit()
+    # Generate password reset token (earlier links stop working)
+    reset_token = one_time_tokens.issue(db, user.id, PURPOSE_PASSWORD_RESET)
 
-    # Send password reset email
-    await email_service.send_password_reset_email(request.email, reset_token)
+    # Queue password reset email with the token update
+    email_service.queue_password_reset_email(db, request.email, reset_token)
+    db.commit()
 
     return {"message": "パスワードリセットメールを送信しました"}
 
@@ -328,10 +362,8 @@ def reset_password(
     Returns:
         Success message
     """
-    user = db.query(User).filter(
-        User.password_reset_token == request.token
-    ).first()
-
+    record = one_time_tokens.find(db, request.token, PURPOSE_PASSWORD_RESET)
+    user = db.get(User, record.user_id) if record else None
     if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -339,7 +371,7 @@ def reset_password(
         )
 
     # Check if token expired
-    if user.password_reset_expires and user.password_reset_expires < datetime.utcnow():
+    if one_time_tokens.is_expired(record):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="リセットトークンの有効期限が切れています"
@@ -359,12 +391,18 @@ def reset_password(
             detail=error_msg
         )
 
-    # Hash new password
+    # Use up the token, then hash new password
+    if not one_time_tokens.redeem(db, record):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="無効なリセットトークンです"
+        )
     user.hashed_password = auth_service.hash_password(request.new_password)
-    user.password_reset_token = None
-    user.password_reset_expires = None
     db.commit()
 
+    # Sign out every session that may have used the old password
+    session_service.revoke_user_sessions(db, user.id)
+
     return {"message": "パスワードがリセットされました"}
 
 
@@ -372,14 +410,18 @@ def reset_password(
 def change_password(
     request: ChangePasswordRequest,
     current_user: User = Depends(get_current_user),
+    payload: Dict[str, Any] = Depends(get_token_payload),
     db: Session = Depends(get_db),
 ):
     """
     Change password for authenticated user.
 
+    Other sessions of the user are signed out.
+
     Args:
         request: Change password request with current and new password
         current_user: Current authenticated user
+        payload: Access token claims (the current session is kept)
         db: Database session
 
     Returns:
@@ -418,6 +460,11 @@ def change_password(
     current_user.hashed_password = auth_service.hash_password(request.new_password)
     db.commit()
 
+    session_id = payload.get("sid")
+    session_service.revoke_user_sessions(
+        db, current_user.id, keep_family_id=uuid.UUID(session_id) if session_id else None
+    )
+
     return {"message": "パスワードが変更されました"}
 
 
@@ -469,15 +516,87 @@ def login_with_google(
     ip_address = http_request.client.host if http_request.client else None
     admin_service.record_login(db, user.id, ip_address)
 
-    # Create JWT token
-    access_token = create_access_token(data={"sub": user.email})
+    # Start a session: short-lived access token plus refresh token
+    tokens = session_service.issue(db, user)
 
     return TokenResponse(
-        access_token=access_token,
+        access_token=tokens.access_token,
+        refresh_token=tokens.refresh_token,
+        expires_in=tokens.expires_in,
         user=UserResponse.model_validate(user),
     )
 
 
+@router.post("/refresh", response_model=TokenResponse)
+def refresh_token(
+    request: RefreshTokenRequest,
+    db: Session = Depends(get_db),
+):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    Each refresh token works once; reusing one ends its session.
+
+    Args:
+        request: Refresh request with the refresh token
+        db: Database session
+
+    Returns:
+        New JWT access token, refresh token and user information
+    """
+    user, tokens = session_service.refresh(db, request.refresh_token)
+
+    return TokenResponse(
+        access_token=tokens.access_token,
+        refresh_token=tokens.refresh_token,
+        expires_in=tokens.expires_in,
+        user=UserResponse.model_validate(user),
+    )
+
+
+@router.post("/logout")
+def logout(
+    request: Optional[LogoutRequest] = None,
+    payload: Optional[Dict[str, Any]] = Depends(get_optional_token_payload),
+    db: Session = Depends(get_db),
+):
+    """
+    End the current session.
+
+    The session is identified by the refresh token in the body, so logging
+    out works after the access token has expired, or else by the access
+    token. The session's access tokens are rejected from now on and its
+    refresh token stops working.
+
+    Args:
+        request: Logout request with the refresh token (optional)
+        payload: Access token claims, if a valid access token was sent
+        db: Database session
+
+    Returns:
+        Success message
+
+    Raises:
+        HTTPException: If neither a known refresh token nor a valid access token was sent
+    """
+    if request is not None and request.refresh_token:
+        if session_service.revoke_refresh_session(db, request.refresh_token) is not None:
+            return {"message": "ログアウトしました"}
+    if payload is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    # Tokens issued before sessions have nothing to revoke and simply expire
+    session_id = payload.get("sid")
+    if session_id:
+        session_service.revoke_session(db, uuid.UUID(session_id))
+
+    return {"message": "ログアウトしました"}
+
+
 @router.get("/me", response_model=UserResponse)
 def get_current_user_info(
     current_user: User = Depends(get_current_user),
@@ -491,7 +610,7 @@ def get_current_user_info(
     Returns:
         User information
     """
-    return UserResponse.model_validate(current_user)
+    return PydanticResponse(UserResponse.model_validate(current_user))
 
 
 @router.post("/verify", response_model=VerifyTokenResponse)
@@ -507,7 +626,7 @@ def verify_token(
     Returns:
         User information if token is valid
     """
-    return VerifyTokenResponse(user=UserResponse.model_validate(current_user))
+    return PydanticResponse(VerifyTokenResponse(user=UserResponse.model_validate(current_user)))
 
 
 @router.post("/accept-terms", response_model=UserResponse)
@@ -1,19 +1,39 @@
 """
 API v1 router configuration.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.v1 import auth, admin_usage, admin_settings, admin_users, test
+from app.api.deps import profile_request
+from app.api.v1 import (
+    auth,
+    admin_broadcasts,
+    admin_profiles,
+    admin_usage,
+    admin_settings,
+    admin_users,
+    test,
+)
 
 api_router = APIRouter()
 
 # Include authentication routes
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 
-# Include admin routes
-api_router.include_router(admin_usage.router, prefix="/admin/usage", tags=["Admin - Usage"])
-api_router.include_router(admin_settings.router, prefix="/admin/settings", tags=["Admin - Settings"])
-api_router.include_router(admin_users.router, prefix="/admin", tags=["Admin - Users"])
+# Include admin routes (admins can profile any of them with ?_profile=1)
+admin_dependencies = [Depends(profile_request)]
+api_router.include_router(
+    admin_usage.router, prefix="/admin/usage", tags=["Admin - Usage"], dependencies=admin_dependencies
+)
+api_router.include_router(
+    admin_settings.router, prefix="/admin/settings", tags=["Admin - Settings"], dependencies=admin_dependencies
+)
+api_router.include_router(
+    admin_users.router, prefix="/admin", tags=["Admin - Users"], dependencies=admin_dependencies
+)
+api_router.include_router(
+    admin_broadcasts.router, prefix="/admin/broadcasts", tags=["Admin - Broadcasts"], dependencies=admin_dependencies
+)
+api_router.include_router(admin_profiles.router, prefix="/admin/profiles", tags=["Admin - Profiles"])
 
 # Include test routes (development only)
 api_router.include_router(test.router, prefix="/test", tags=["Test"])
@@ -4,15 +4,42 @@
 警告: このエンドポイントは開発環境専用です。
 本番環境では絶対に使用しないでください。
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 from app.api import deps
+from app.models.one_time_token import OneTimeToken
 from app.models.user import User
 from app.core.config import settings
-from app.core.security import create_access_token
+from app.services.one_time_tokens import (
+    PURPOSE_EMAIL_VERIFICATION,
+    PURPOSE_PASSWORD_RESET,
+    one_time_tokens,
+)
+from app.services.session_service import session_service
 
 router = APIRouter()
 
+# Googleの代わりにIDトークンを署名するローカル鍵（プロセスごとに生成）
+_local_google = None
+
+
+def _require_debug() -> None:
+    if not settings.debug:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint is only available in development mode"
+        )
+
+
+def _local_google_certs():
+    # requestsのimportを起動時に行わないよう遅延import
+    from app.core.google_certs import LocalGoogleCerts
+
+    global _local_google
+    if _local_google is None:
+        _local_google = LocalGoogleCerts()
+    return _local_google
+
 
 @router.get("/verify-token/{email}")
 def get_verification_token(
@@ -23,7 +50,8 @@ def get_verification_token(
     E2Eテスト用: メール検証トークンを取得
 
     開発環境専用のエンドポイントです。
-    指定されたメールアドレスのユーザーの検証トークンを返します。
+    トークンはハッシュのみ保存されるため、指定されたメールアドレスのユーザーに
+    新しい検証トークンを発行して返します（以前のトークンは無効になります）。
     """
     # 本番環境では使用不可
     if not settings.debug:
@@ -39,13 +67,16 @@ def get_verification_token(
             detail="User not found"
         )
 
-    if not user.email_verification_token:
+    if user.email_verified:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No verification token found for this user"
         )
 
-    return {"token": user.email_verification_token}
+    token = one_time_tokens.issue(db, user.id, PURPOSE_EMAIL_VERIFICATION)
+    db.commit()
+
+    return {"token": token}
 
 
 @router.get("/reset-token/{email}")
@@ -57,7 +88,8 @@ def get_reset_token(
     E2Eテスト用: パスワードリセットトークンを取得
 
     開発環境専用のエンドポイントです。
-    指定されたメールアドレスのユーザーのリセットトークンを返します。
+    パスワードリセットを要求済みのユーザーに新しいリセットトークンを発行して
+    返します（以前のトークンは無効になります）。
     """
     # 本番環境では使用不可
     if not settings.debug:
@@ -73,13 +105,19 @@ def get_reset_token(
             detail="User not found"
         )
 
-    if not user.password_reset_token:
+    requested = db.query(OneTimeToken).filter(
+        OneTimeToken.user_id == user.id, OneTimeToken.purpose == PURPOSE_PASSWORD_RESET
+    ).first()
+    if not requested:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No reset token found for this user"
         )
 
-    return {"token": user.password_reset_token}
+    token = one_time_tokens.issue(db, user.id, PURPOSE_PASSWORD_RESET)
+    db.commit()
+
+    return {"token": token}
 
 
 @router.post("/mock-google-login")
@@ -125,7 +163,42 @@ def mock_google_login(
         db.commit()
         db.refresh(user)
 
-    # JWTトークンを生成
-    access_token = create_access_token(data={"sub": user.email})
+    # セッションを開始してJWTトークンを生成
+    tokens = session_service.issue(db, user)
+
+    return {"token": tokens.access_token, "refresh_token": tokens.refresh_token}
+
+
+@router.get("/google-certs")
+def get_google_certs(response: Response):
+    """
+    E2Eテスト用: GoogleのJWKSの代替
+
+    開発環境専用のエンドポイントです。
+    GOOGLE_CERTS_URL にこのURLを設定すると、/test/google-id-token で発行した
+    IDトークンで実際の /auth/google/login を通せます。
+    """
+    _require_debug()
+    response.headers["Cache-Control"] = "public, max-age=3600"
+    return _local_google_certs().jwks()
+
+
+@router.post("/google-id-token")
+def issue_google_id_token(request: dict):
+    """
+    E2Eテスト用: Googleの代わりにIDトークンを発行
+
+    開発環境専用のエンドポイントです。
+    /test/google-certs で公開している鍵で署名したIDトークンを返します。
+    """
+    _require_debug()
+
+    email = request.get("email")
+    if not email:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email is required"
+        )
 
-    return {"token": access_token}
+    token = _local_google_certs().id_token(email, name=request.get("name", ""))
+    return {"token": token}
@@ -0,0 +1,95 @@
+"""
+bcrypt cost factor calibration.
+
+Each bcrypt cost step doubles the hashing time, so the right cost depends on
+the CPU the API runs on. calibrate() measures this machine and picks the
+highest cost whose hash still takes no longer than a target time; the result
+goes into BCRYPT_ROUNDS so every process hashes with the same cost (hashes
+with another cost are upgraded on the next successful login).
+"""
+import statistics
+import time
+from typing import List, Optional, Tuple
+
+import bcrypt
+
+# Below this, hashes are too cheap to withstand offline guessing (OWASP minimum)
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+_SAMPLE_PASSWORD = b"calibration-Passw0rd"
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Return the cost factor of a bcrypt hash ("$2b$12$..." -> 12).
+
+    Args:
+        hashed_password: Stored bcrypt hash
+
+    Returns:
+        Cost factor, or None if the string is not a bcrypt hash
+    """
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def hash_time(rounds: int, samples: int = 3) -> float:
+    """
+    Measure how long one hash takes at a cost factor.
+
+    Args:
+        rounds: bcrypt cost factor
+        samples: Number of timed hashes (the median is returned)
+
+    Returns:
+        Seconds per hash
+    """
+    salt = bcrypt.gensalt(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        bcrypt.hashpw(_SAMPLE_PASSWORD, salt)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def cost_curve(min_rounds: int = MIN_ROUNDS, max_rounds: int = MAX_ROUNDS, samples: int = 3) -> List[Tuple[int, float]]:
+    """
+    Measure hash time for every cost factor in a range.
+
+    Args:
+        min_rounds: First cost factor
+        max_rounds: Last cost factor (inclusive)
+        samples: Timed hashes per cost factor
+
+    Returns:
+        (cost factor, seconds per hash) pairs
+    """
+    return [(rounds, hash_time(rounds, samples)) for rounds in range(min_rounds, max_rounds + 1)]
+
+
+def calibrate(target_seconds: float, samples: int = 3) -> int:
+    """
+    Pick the highest cost factor whose hash takes at most target_seconds on this machine.
+
+    Only costs up to the answer plus one are measured: the time of the next
+    cost is predicted by doubling, so the expensive ones are never run.
+
+    Args:
+        target_seconds: Acceptable time per hash (and per login)
+        samples: Timed hashes per measured cost factor
+
+    Returns:
+        Cost factor between MIN_ROUNDS and MAX_ROUNDS
+    """
+    rounds = MIN_ROUNDS
+    elapsed = hash_time(rounds, samples)
+    while rounds < MAX_ROUNDS and elapsed * 2 <= target_seconds:
+        rounds += 1
+        elapsed = hash_time(rounds, samples)
+    if elapsed > target_seconds and rounds > MIN_ROUNDS:
+        rounds -= 1
+    return rounds
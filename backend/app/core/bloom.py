@@ -0,0 +1,90 @@
+"""
+Bloom filter: compact probabilistic set membership.
+
+Membership tests never give false negatives; a positive answer is wrong with
+probability about ``error_rate`` once ``capacity`` items were added, so
+callers confirm positives against an exact source.
+"""
+import hashlib
+import math
+from typing import Iterable, Iterator, Optional, Union
+
+Buffer = Union[bytearray, memoryview]
+
+
+def optimal_size(capacity: int, error_rate: float) -> tuple:
+    """
+    Return (bit count, hash count) for a filter holding ``capacity`` items.
+
+    Args:
+        capacity: Expected number of items
+        error_rate: Target false positive probability
+
+    Returns:
+        Tuple of the number of bits and the number of hash functions
+    """
+    capacity = max(1, capacity)
+    bits = math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """Bloom filter over a bit buffer, using double hashing of one BLAKE2b digest."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        buffer: Optional[Buffer] = None,
+        num_bits: Optional[int] = None,
+        num_hashes: Optional[int] = None,
+    ):
+        """
+        Create an empty filter, or wrap an existing bit buffer.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive probability
+            buffer: Existing bits (e.g. a memoryview of an mmap) instead of a new bytearray
+            num_bits: Bit count of ``buffer`` (defaults to the optimal size)
+            num_hashes: Hash count used to build ``buffer`` (defaults to the optimal count)
+        """
+        bits, hashes = optimal_size(capacity, error_rate)
+        self.capacity = capacity
+        self.num_bits = num_bits or bits
+        self.num_hashes = num_hashes or hashes
+        self.count = 0
+        self.bits = buffer if buffer is not None else bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item: Union[str, bytes]) -> Iterator[int]:
+        if isinstance(item, str):
+            item = item.encode()
+        digest = hashlib.blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        num_bits = self.num_bits
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % num_bits
+
+    def add(self, item: Union[str, bytes]) -> None:
+        """Add an item."""
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def update(self, items: Iterable[Union[str, bytes]]) -> None:
+        """Add several items."""
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item: Union[str, bytes]) -> bool:
+        bits = self.bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self) -> int:
+        return self.count
@@ -0,0 +1,123 @@
+"""
+Offline check against known breached passwords.
+
+The breached password list is compiled into a Bloom filter file by
+scripts/build_breached_password_filter.py: a fixed header followed by the
+filter bits. Items are the SHA-1 digests of the passwords, so lists published
+as hashes (e.g. Have I Been Pwned's "HASH:COUNT" files) and plain text lists
+produce the same filter.
+
+Each worker memory-maps the file read-only at startup. The pages live in the
+OS page cache once, however many workers map them, and a lookup touches only
+a handful of bytes (microseconds, no network). A positive answer is wrong with
+the error rate the file was built with, so a few uncommon passwords are
+rejected although they were never breached.
+"""
+import hashlib
+import logging
+import mmap
+import struct
+from typing import Optional, Union
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Magic, bit count, hash count, item count
+HEADER = struct.Struct("<8sQIQ")
+MAGIC = b"PWBLOOM1"
+
+
+def password_key(password: Union[str, bytes]) -> bytes:
+    """Return the filter item for a password (its SHA-1 digest)."""
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+    return hashlib.sha1(password).digest()
+
+
+def write_filter(path: str, bloom: BloomFilter) -> None:
+    """
+    Write a filter in the file format read by BreachedPasswords.
+
+    Args:
+        path: Output file
+        bloom: Filter filled with password_key() items
+    """
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, bloom.num_bits, bloom.num_hashes, bloom.count))
+        f.write(bloom.bits)
+
+
+class BreachedPasswords:
+    """Memory-mapped breached password filter."""
+
+    def __init__(self):
+        self._mmap: Optional[mmap.mmap] = None
+        self._bloom: Optional[BloomFilter] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a filter file is mapped."""
+        return self._bloom is not None
+
+    def load(self, path: Optional[str] = None) -> None:
+        """
+        Map a filter file, replacing the current one.
+
+        Args:
+            path: Filter file (defaults to BREACHED_PASSWORDS_FILE)
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a filter written by write_filter()
+        """
+        path = path or settings.breached_passwords_file
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(mapped) < HEADER.size:
+            mapped.close()
+            raise ValueError(f"{path} is not a breached password filter")
+        magic, num_bits, num_hashes, count = HEADER.unpack_from(mapped)
+        if magic != MAGIC or len(mapped) < HEADER.size + (num_bits + 7) // 8:
+            mapped.close()
+            raise ValueError(f"{path} is not a breached password filter")
+
+        bloom = BloomFilter(
+            capacity=count,
+            buffer=memoryview(mapped)[HEADER.size:],
+            num_bits=num_bits,
+            num_hashes=num_hashes,
+        )
+        bloom.count = count
+        # A previous mapping is unmapped once the last lookup using it is done (on GC)
+        self._bloom, self._mmap = bloom, mapped
+        logger.info(f"Loaded breached password filter {path} ({count} passwords, {len(mapped)} bytes)")
+
+    def load_configured(self) -> None:
+        """Map BREACHED_PASSWORDS_FILE if set; a missing or broken file is logged and the check stays off."""
+        if not settings.breached_passwords_file:
+            return
+        try:
+            self.load()
+        except (OSError, ValueError):
+            logger.exception("Failed to load the breached password filter")
+
+    def is_breached(self, password: str) -> bool:
+        """
+        Whether a password is on the breached list.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            True if the filter (probably) contains it; False if no filter is loaded
+        """
+        bloom = self._bloom
+        if bloom is None:
+            return False
+        return password_key(password) in bloom
+
+
+# Singleton instance
+breached_passwords = BreachedPasswords()
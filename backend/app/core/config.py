@@ -16,14 +16,67 @@ class Settings(BaseSettings):
 
     # Security
     secret_key: str = Field(..., alias="SECRET_KEY")
-    algorithm: str = Field(default="HS256", alias="ALGORITHM")
+    # Access token signing: "RS256"/"ES256" (rotated key pairs, published at
+    # /.well-known/jwks.json) or "HS256" (shared SECRET_KEY, no JWKS)
+    algorithm: str = Field(default="RS256", alias="ALGORITHM")
+    # Access tokens are short-lived; clients renew them with a refresh token
     access_token_expire_minutes: int = Field(
-        default=1440, alias="ACCESS_TOKEN_EXPIRE_MINUTES"
+        default=15, alias="ACCESS_TOKEN_EXPIRE_MINUTES"
     )
+    refresh_token_expire_days: int = Field(default=30, alias="REFRESH_TOKEN_EXPIRE_DAYS")
+    # How often each process picks up access tokens revoked by other processes
+    jwt_revocation_sync_seconds: float = Field(default=1.0, alias="JWT_REVOCATION_SYNC_SECONDS")
+    jwt_issuer: str = Field(default="markdown-editor-api", alias="JWT_ISSUER")
+    # Start signing with a new key pair this often
+    jwt_key_rotation_days: int = Field(default=30, alias="JWT_KEY_ROTATION_DAYS")
+    # Publish a new key in the JWKS this long before signing with it
+    jwt_key_publish_ahead_seconds: int = Field(default=3600, alias="JWT_KEY_PUBLISH_AHEAD_SECONDS")
+    # How long a process reuses its view of the signing keys
+    jwt_keys_cache_seconds: float = Field(default=300.0, alias="JWT_KEYS_CACHE_SECONDS")
+    # Keep accepting HS256 tokens signed with SECRET_KEY (issued before switching to key pairs);
+    # enable when switching and keep it on for the lifetime of those tokens (1440 minutes,
+    # the previous ACCESS_TOKEN_EXPIRE_MINUTES default), or signed-in users are logged out
+    jwt_accept_hs256: bool = Field(default=False, alias="JWT_ACCEPT_HS256")
+    # Lifetime of email verification and password reset links
+    email_verification_token_hours: int = Field(default=168, alias="EMAIL_VERIFICATION_TOKEN_HOURS")
+    password_reset_token_minutes: int = Field(default=60, alias="PASSWORD_RESET_TOKEN_MINUTES")
+    # Deletion of expired one-time and refresh tokens (rows per transaction)
+    token_sweep_interval_seconds: float = Field(default=3600.0, alias="TOKEN_SWEEP_INTERVAL_SECONDS")
+    token_sweep_batch_size: int = Field(default=1000, alias="TOKEN_SWEEP_BATCH_SIZE")
+    # bcrypt cost factor for password hashes (pick with benchmarks/bench_bcrypt.py --calibrate)
+    bcrypt_rounds: int = Field(default=12, ge=10, le=16, alias="BCRYPT_ROUNDS")
+    # Bloom filter of breached passwords (build with scripts/build_breached_password_filter.py;
+    # the check is switched on in the admin auth settings)
+    breached_passwords_file: str = Field(default="", alias="BREACHED_PASSWORDS_FILE")
+    # Per-IP login/registration attempt limits (disable only for load tests)
+    rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
+    # Per-account login lockout: free failures, then base * 2^n seconds up to the maximum
+    login_throttle_free_failures: int = Field(default=5, alias="LOGIN_THROTTLE_FREE_FAILURES")
+    login_throttle_base_seconds: float = Field(default=1.0, alias="LOGIN_THROTTLE_BASE_SECONDS")
+    login_throttle_max_seconds: float = Field(default=900.0, alias="LOGIN_THROTTLE_MAX_SECONDS")
+    # Accounts with failure counters kept per process (least recently failed are dropped)
+    login_throttle_max_accounts: int = Field(default=100_000, alias="LOGIN_THROTTLE_MAX_ACCOUNTS")
+    # Streaming login anomaly detection (thresholds are counts within the detector's windows)
+    login_anomaly_enabled: bool = Field(default=True, alias="LOGIN_ANOMALY_ENABLED")
+    login_anomaly_max_accounts_per_ip: int = Field(default=10, alias="LOGIN_ANOMALY_MAX_ACCOUNTS_PER_IP")
+    login_anomaly_max_logins_per_minute: int = Field(default=10, alias="LOGIN_ANOMALY_MAX_LOGINS_PER_MINUTE")
+    login_anomaly_max_ips_per_user: int = Field(default=5, alias="LOGIN_ANOMALY_MAX_IPS_PER_USER")
+    login_anomaly_max_keys: int = Field(default=100_000, alias="LOGIN_ANOMALY_MAX_KEYS")
+    # Login attempts per network kept for the admin view (trie nodes per 15-minute bucket)
+    login_networks_window_hours: int = Field(default=24, ge=1, alias="LOGIN_NETWORKS_WINDOW_HOURS")
+    login_networks_max_nodes: int = Field(default=5_000, alias="LOGIN_NETWORKS_MAX_NODES")
+    # IP to ASN table naming the networks (build with scripts/build_ip_asn_file.py)
+    ip_asn_file: str = Field(default="", alias="IP_ASN_FILE")
 
     # Google OAuth
     google_client_id: str = Field(default="", alias="GOOGLE_CLIENT_ID")
     google_client_secret: str = Field(default="", alias="GOOGLE_CLIENT_SECRET")
+    # JWKS with Google's ID token signing keys (point at /api/v1/test/google-certs for local tests)
+    google_certs_url: str = Field(
+        default="https://www.googleapis.com/oauth2/v3/certs", alias="GOOGLE_CERTS_URL"
+    )
+    # Refresh the cached keys in the background this long before they expire
+    google_certs_refresh_ahead_seconds: float = Field(default=300.0, alias="GOOGLE_CERTS_REFRESH_AHEAD_SECONDS")
 
     # Database
     database_url: str = Field(..., alias="DATABASE_URL")
@@ -51,10 +104,84 @@ class Settings(BaseSettings):
     smtp_from_email: str = Field(
         default="noreply@example.com", alias="SMTP_FROM_EMAIL"
     )
+    smtp_timeout_seconds: float = Field(default=30.0, alias="SMTP_TIMEOUT_SECONDS")
+    # Pooled SMTP sessions per process (0 = EMAIL_OUTBOX_CONCURRENCY)
+    smtp_pool_size: int = Field(default=0, alias="SMTP_POOL_SIZE")
+    # Close sessions idle for longer than this (keep below the server's idle timeout)
+    smtp_pool_idle_seconds: float = Field(default=30.0, alias="SMTP_POOL_IDLE_SECONDS")
+    smtp_max_messages_per_connection: int = Field(
+        default=100, alias="SMTP_MAX_MESSAGES_PER_CONNECTION"
+    )
+
+    # Email templates
+    # Product name shown in email templates
+    email_app_name: str = Field(default="Markdown Editor", alias="EMAIL_APP_NAME")
+    # How long a process reuses its view of email template overrides
+    email_template_cache_seconds: float = Field(default=30.0, alias="EMAIL_TEMPLATE_CACHE_SECONDS")
+
+    # Email outbox
+    # Run the delivery worker in this process (disable to deliver from other instances only)
+    email_outbox_worker_enabled: bool = Field(default=True, alias="EMAIL_OUTBOX_WORKER_ENABLED")
+    email_outbox_poll_seconds: float = Field(default=2.0, alias="EMAIL_OUTBOX_POLL_SECONDS")
+    email_outbox_batch_size: int = Field(default=20, alias="EMAIL_OUTBOX_BATCH_SIZE")
+    email_outbox_concurrency: int = Field(default=4, alias="EMAIL_OUTBOX_CONCURRENCY")
+    email_outbox_lease_seconds: int = Field(default=120, alias="EMAIL_OUTBOX_LEASE_SECONDS")
+    email_max_attempts: int = Field(default=6, alias="EMAIL_MAX_ATTEMPTS")
+    email_retry_base_seconds: float = Field(default=30.0, alias="EMAIL_RETRY_BASE_SECONDS")
+    email_retry_max_seconds: float = Field(default=3600.0, alias="EMAIL_RETRY_MAX_SECONDS")
+    # Readiness limits of the undelivered backlog (0 = report only)
+    email_outbox_max_backlog: int = Field(default=0, alias="EMAIL_OUTBOX_MAX_BACKLOG")
+    email_outbox_max_age_seconds: int = Field(default=0, alias="EMAIL_OUTBOX_MAX_AGE_SECONDS")
+
+    # Broadcast emails to all users
+    broadcast_worker_enabled: bool = Field(default=True, alias="BROADCAST_WORKER_ENABLED")
+    broadcast_poll_seconds: float = Field(default=5.0, alias="BROADCAST_POLL_SECONDS")
+    # Delivery rate per job (messages per second) and parallel SMTP sends
+    broadcast_rate_per_second: float = Field(default=10.0, alias="BROADCAST_RATE_PER_SECOND")
+    broadcast_concurrency: int = Field(default=4, alias="BROADCAST_CONCURRENCY")
+    # Recipients fetched, rendered and checkpointed together
+    broadcast_chunk_size: int = Field(default=500, alias="BROADCAST_CHUNK_SIZE")
+    broadcast_lease_seconds: int = Field(default=120, alias="BROADCAST_LEASE_SECONDS")
 
     # Monitoring
     sentry_dsn: str = Field(default="", alias="SENTRY_DSN")
     environment: str = Field(default="development", alias="ENVIRONMENT")
+    # Expose Prometheus metrics at /metrics
+    metrics_enabled: bool = Field(default=True, alias="METRICS_ENABLED")
+
+    # Per-request SQL statistics (Server-Timing header, N+1 detection)
+    query_stats_enabled: bool = Field(default=True, alias="QUERY_STATS_ENABLED")
+    db_slow_query_ms: float = Field(default=200.0, alias="DB_SLOW_QUERY_MS")
+    # Flag a request when one statement runs this many times
+    db_n_plus_one_threshold: int = Field(default=5, alias="DB_N_PLUS_ONE_THRESHOLD")
+
+    # Profiling
+    # Allow admins to profile individual requests (?_profile=1 or X-Profile: 1)
+    profiling_enabled: bool = Field(default=True, alias="PROFILING_ENABLED")
+    profile_dir: str = Field(default="", alias="PROFILE_DIR")  # "" = system temp directory
+    profile_request_interval_ms: float = Field(default=5.0, alias="PROFILE_REQUEST_INTERVAL_MS")
+    profile_continuous: bool = Field(default=False, alias="PROFILE_CONTINUOUS")
+    profile_continuous_hz: float = Field(default=10.0, alias="PROFILE_CONTINUOUS_HZ")
+    # Maximum share of wall time the continuous sampler may spend sampling
+    profile_max_overhead: float = Field(default=0.01, alias="PROFILE_MAX_OVERHEAD")
+    profile_flush_seconds: float = Field(default=60.0, alias="PROFILE_FLUSH_SECONDS")
+
+    # Health checks
+    health_db_probe_ttl_seconds: float = Field(default=5.0, alias="HEALTH_DB_PROBE_TTL_SECONDS")
+    health_max_pool_saturation: float = Field(default=0.9, alias="HEALTH_MAX_POOL_SATURATION")
+
+    # Startup
+    startup_mode: str = Field(default="standard", alias="STARTUP_MODE")  # "standard", "fast"
+    # Run migrations (under the migration lock) from start.py instead of a separate job
+    migrate_on_startup: bool = Field(default=False, alias="MIGRATE_ON_STARTUP")
+
+    # Server processes
+    server_mode: str = Field(default="single", alias="SERVER_MODE")  # "single", "multi"
+    web_concurrency: int = Field(default=0, alias="WEB_CONCURRENCY")  # 0 = one worker per CPU
+    worker_max_requests: int = Field(default=10000, alias="WORKER_MAX_REQUESTS")  # 0 = never recycle
+    worker_max_requests_jitter: int = Field(default=1000, alias="WORKER_MAX_REQUESTS_JITTER")
+    worker_max_rss_mb: int = Field(default=0, alias="WORKER_MAX_RSS_MB")  # 0 = no limit
+    worker_graceful_timeout: int = Field(default=30, alias="WORKER_GRACEFUL_TIMEOUT")
 
     class Config:
         env_file = ".env"
@@ -1,12 +1,15 @@
 """
 Database configuration and session management.
 """
+from datetime import datetime, timezone
+
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from typing import Generator
 
 from app.core.config import settings
+from app.core.query_stats import instrument_engine
 
 # Create SQLAlchemy engine
 engine = create_engine(
@@ -15,6 +18,9 @@ engine = create_engine(
     echo=settings.debug,  # Log SQL queries in debug mode
 )
 
+# Time every statement (slow query log, per-request query stats)
+instrument_engine(engine)
+
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -34,3 +40,15 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+def naive_utc(value: datetime) -> datetime:
+    """
+    Normalize a timestamp read from the database to naive UTC.
+
+    SQLite returns DateTime(timezone=True) columns without an offset and
+    PostgreSQL with one; the application compares against datetime.utcnow().
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
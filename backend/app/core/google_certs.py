@@ -0,0 +1,214 @@
+"""
+Cache of Google's ID token signing keys.
+
+Google signs ID tokens with a few rotating RSA keys published as a JWKS at
+GOOGLE_CERTS_URL, served with a Cache-Control max-age. Each process keeps the
+constructed keys in memory for that long, so verifying a Google login is a
+local signature check. Shortly before the keys expire
+(GOOGLE_CERTS_REFRESH_AHEAD_SECONDS) the next verification starts a refresh
+in a background thread and keeps using the current keys, so logins only wait
+for Google when the cache is cold or was not refreshed in time.
+
+LocalGoogleCerts is a stand-in for Google's side (a local key pair that signs
+ID tokens and publishes its JWKS) for tests and development.
+"""
+import logging
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Mapping, Optional
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from app.core.config import settings
+from app.core.http import HTTP_TIMEOUT, http_session
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+# Used when the response has no usable Cache-Control max-age
+DEFAULT_MAX_AGE_SECONDS = 3600.0
+
+# Minimum interval between fetches triggered by unknown kids (forged tokens must not hammer Google)
+UNKNOWN_KID_REFRESH_SECONDS = 30.0
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def cache_lifetime(headers: Mapping[str, str]) -> float:
+    """
+    Seconds a response may be cached according to its Cache-Control and Age headers.
+
+    Args:
+        headers: Response headers
+
+    Returns:
+        Remaining freshness lifetime in seconds
+    """
+    cache_control = headers.get("Cache-Control", "")
+    if "no-store" in cache_control.lower() or "no-cache" in cache_control.lower():
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if not match:
+        return DEFAULT_MAX_AGE_SECONDS
+    try:
+        age = float(headers.get("Age", 0))
+    except ValueError:
+        age = 0.0
+    return max(0.0, int(match.group(1)) - age)
+
+
+class GoogleCertCache:
+    """Per-process cache of Google's signing keys, refreshed ahead of expiry."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+        self._keys: Dict[str, Any] = {}
+        self._expires_at = 0.0
+        self._refresh_at = 0.0
+        self._refreshing = False
+        self._unknown_kid_refresh_at = 0.0
+
+    def load(self, jwks: Dict[str, Any], max_age: float) -> None:
+        """
+        Replace the cached keys.
+
+        Args:
+            jwks: JWKS document ({"keys": [...]})
+            max_age: Seconds the keys may be used
+        """
+        keys = {
+            key["kid"]: jwk.construct(key, algorithm=key.get("alg", "RS256"))
+            for key in jwks.get("keys", [])
+            if "kid" in key
+        }
+        now = time.monotonic()
+        ahead = min(settings.google_certs_refresh_ahead_seconds, max_age / 2)
+        with self._lock:
+            self._keys = keys
+            self._expires_at = now + max_age
+            self._refresh_at = now + max_age - ahead
+
+    def refresh(self) -> None:
+        """Fetch the keys from GOOGLE_CERTS_URL."""
+        response = http_session.get(settings.google_certs_url, timeout=HTTP_TIMEOUT)
+        response.raise_for_status()
+        self.load(response.json(), cache_lifetime(response.headers))
+
+    def refresh_in_background(self) -> None:
+        """Start a refresh in a background thread unless one is running."""
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="google-certs-refresh", daemon=True).start()
+
+    def _background_refresh(self) -> None:
+        try:
+            self.refresh()
+        except Exception:
+            logger.warning("Failed to refresh Google signing keys", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _refresh_now(self, expires_at: float) -> None:
+        # One thread fetches; the others wait for its result instead of fetching too
+        with self._fetch_lock:
+            if self._expires_at == expires_at:
+                self.refresh()
+
+    def key(self, kid: Optional[str]):
+        """
+        Return the key a Google ID token names in its kid header.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            The verification key, or None if Google does not publish it
+
+        Raises:
+            requests.RequestException: If the keys are not cached and cannot be fetched
+        """
+        now = time.monotonic()
+        expires_at = self._expires_at
+        if now >= expires_at:
+            self._refresh_now(expires_at)
+        elif now >= self._refresh_at:
+            self.refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is None and now >= self._unknown_kid_refresh_at:
+            # Google may have started signing with a new key before our copy expired
+            self._unknown_kid_refresh_at = now + UNKNOWN_KID_REFRESH_SECONDS
+            self._refresh_now(self._expires_at)
+            key = self._keys.get(kid)
+        return key
+
+
+class LocalGoogleCerts:
+    """Local stand-in for Google: signs ID tokens and publishes the matching JWKS."""
+
+    def __init__(self):
+        self.kid = uuid.uuid4().hex
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self._private_pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ).decode()
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        ).decode()
+        public_jwk = jwk.construct(public_pem, algorithm="RS256").to_dict()
+        self._public_jwk = {**public_jwk, "kid": self.kid, "use": "sig", "alg": "RS256"}
+
+    def jwks(self) -> Dict[str, Any]:
+        """Return the JWKS document Google would serve."""
+        return {"keys": [self._public_jwk]}
+
+    def id_token(
+        self,
+        email: str,
+        name: str = "",
+        subject: Optional[str] = None,
+        audience: Optional[str] = None,
+        lifetime: timedelta = timedelta(hours=1),
+    ) -> str:
+        """
+        Sign an ID token like the ones Google Sign-In returns.
+
+        Args:
+            email: Email claim
+            name: Name claim
+            subject: Google account ID ("sub"; derived from the email if omitted)
+            audience: OAuth client ID (defaults to GOOGLE_CLIENT_ID)
+            lifetime: Token validity
+
+        Returns:
+            Signed ID token
+        """
+        now = datetime.utcnow()
+        claims = {
+            "iss": GOOGLE_ISSUERS[1],
+            "aud": audience if audience is not None else settings.google_client_id,
+            "sub": subject or uuid.uuid5(uuid.NAMESPACE_URL, f"mailto:{email}").hex,
+            "email": email,
+            "email_verified": True,
+            "name": name,
+            "iat": now,
+            "exp": now + lifetime,
+        }
+        return jwt.encode(claims, self._private_pem, algorithm="RS256", headers={"kid": self.kid})
+
+
+# Singleton instance
+google_certs = GoogleCertCache()
@@ -0,0 +1,133 @@
+"""
+Readiness checks for load balancer health probes.
+
+Each check returns a dictionary with at least an "ok" key. Checks that touch
+a dependency (such as the database) are cached for a short TTL and
+single-flighted, so probes never pile onto the connection pool.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.schema import schema_gate
+
+CheckResult = Dict[str, Any]
+
+
+class CachedProbe:
+    """
+    Run a probe at most once per TTL.
+
+    While a probe is in flight, concurrent callers get the previous result
+    instead of waiting or starting another probe.
+    """
+
+    def __init__(self, probe: Callable[[], CheckResult], ttl: float):
+        self.probe = probe
+        self.ttl = ttl
+        self._result: Optional[CheckResult] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def __call__(self) -> CheckResult:
+        if self._result is not None and time.monotonic() - self._checked_at < self.ttl:
+            return self._result
+
+        if not self._lock.acquire(blocking=self._result is None):
+            return self._result
+        try:
+            if self._result is None or time.monotonic() - self._checked_at >= self.ttl:
+                self._result = self.probe()
+                self._checked_at = time.monotonic()
+            return self._result
+        finally:
+            self._lock.release()
+
+
+def check_schema() -> CheckResult:
+    """Database schema revision matches the code's migration head."""
+    return {
+        "ok": schema_gate.is_ready(),
+        "head": schema_gate.head,
+        "db_revision": schema_gate.db_revision,
+        "error": schema_gate.error,
+    }
+
+
+def probe_database() -> CheckResult:
+    """Database is reachable (uncached; registered behind a CachedProbe)."""
+    start = time.perf_counter()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        return {"ok": False, "error": str(e), "checked_at": time.time()}
+    return {
+        "ok": True,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        "checked_at": time.time(),
+    }
+
+
+def check_pool() -> CheckResult:
+    """Connection pool has free capacity."""
+    pool = engine.pool
+    if not hasattr(pool, "size") or not hasattr(pool, "checkedout"):
+        # e.g. SingletonThreadPool for in-memory SQLite
+        return {"ok": True, "type": type(pool).__name__}
+
+    # QueuePool does not expose max_overflow publicly
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    checked_out = pool.checkedout()
+    saturation = checked_out / capacity if capacity else 0.0
+    return {
+        "ok": saturation < settings.health_max_pool_saturation,
+        "size": pool.size(),
+        "checked_out": checked_out,
+        "overflow": pool.overflow(),
+        "capacity": capacity,
+        "saturation": round(saturation, 3),
+    }
+
+
+class ReadinessChecker:
+    """Registry of readiness checks."""
+
+    def __init__(self):
+        self._checks: Dict[str, Callable[[], CheckResult]] = {}
+
+    def register(self, name: str, check: Callable[[], CheckResult]) -> None:
+        """
+        Register a readiness check.
+
+        Args:
+            name: Name reported in the readiness response
+            check: Callable returning a dictionary with an "ok" key
+        """
+        self._checks[name] = check
+
+    def check(self) -> Tuple[bool, Dict[str, CheckResult]]:
+        """
+        Run every registered check.
+
+        Returns:
+            Tuple of (ready, results by check name)
+        """
+        results: Dict[str, CheckResult] = {}
+        for name, check in self._checks.items():
+            try:
+                results[name] = check()
+            except Exception as e:
+                results[name] = {"ok": False, "error": str(e)}
+        return all(result["ok"] for result in results.values()), results
+
+
+# Global readiness checker
+readiness = ReadinessChecker()
+readiness.register("schema", check_schema)
+readiness.register("database", CachedProbe(probe_database, settings.health_db_probe_ttl_seconds))
+readiness.register("pool", check_pool)
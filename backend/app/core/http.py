@@ -0,0 +1,28 @@
+"""
+Shared HTTP session for outbound requests.
+
+A requests.Session keeps connections (and their TLS sessions) to upstream
+services open in a pool, so a call to an already contacted host skips the TCP
+and TLS handshakes that a one-off request pays every time. The session is
+shared by all threads of the process.
+"""
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept open per host (one per concurrently requesting thread)
+HTTP_POOL_MAXSIZE = 10
+
+# Seconds to wait for connecting and for each read
+HTTP_TIMEOUT = 5.0
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+# Singleton instance
+http_session = _create_session()
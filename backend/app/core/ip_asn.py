@@ -0,0 +1,182 @@
+"""
+Offline IP to autonomous system (ASN) lookup.
+
+The table is compiled from a public IP-to-ASN range list by
+scripts/build_ip_asn_file.py into one file:
+
+- a header (magic, IPv4 range count, IPv6 range count, AS name count);
+- IPv4 ranges (first address, last address, ASN) sorted by first address,
+  addresses big-endian so byte order is numeric order;
+- the same for IPv6 with 16-byte addresses;
+- AS names: (ASN, offset, length) sorted by ASN, then the UTF-8 names.
+
+Each worker memory-maps the file read-only at startup and answers lookups
+with a binary search over the fixed-size records, without reading the file
+into memory.
+"""
+import logging
+import mmap
+import struct
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Magic, IPv4 range count, IPv6 range count, AS name count
+HEADER = struct.Struct("<8sIII")
+MAGIC = b"IPASN001"
+ADDRESS_BYTES = {4: 4, 6: 16}
+# First address, last address, ASN
+RANGES = {4: struct.Struct(">4s4sI"), 6: struct.Struct(">16s16sI")}
+# ASN, offset and length of the name
+NAME = struct.Struct("<III")
+
+Range = Tuple[int, int, int]
+
+
+def write_table(
+    path: str, ranges_v4: Sequence[Range], ranges_v6: Sequence[Range], names: Dict[int, str]
+) -> None:
+    """
+    Write a table in the file format read by IpAsnTable.
+
+    Args:
+        path: Output file
+        ranges_v4: Non-overlapping IPv4 ranges (integers), sorted by first address
+        ranges_v6: Non-overlapping IPv6 ranges (integers), sorted by first address
+        names: AS name per ASN
+    """
+    encoded = sorted((asn, name.encode("utf-8")) for asn, name in names.items())
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(ranges_v4), len(ranges_v6), len(encoded)))
+        for version, ranges in ((4, ranges_v4), (6, ranges_v6)):
+            size = ADDRESS_BYTES[version]
+            for first, last, asn in ranges:
+                f.write(RANGES[version].pack(first.to_bytes(size, "big"), last.to_bytes(size, "big"), asn))
+        offset = 0
+        for asn, name in encoded:
+            f.write(NAME.pack(asn, offset, len(name)))
+            offset += len(name)
+        for _, name in encoded:
+            f.write(name)
+
+
+class _Table:
+    """Sections of one mapped file."""
+
+    def __init__(self, mapped: mmap.mmap, path: str):
+        magic, count_v4, count_v6, name_count = HEADER.unpack_from(mapped)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an IP to ASN table")
+        self.mapped = mapped
+        self.counts = {4: count_v4, 6: count_v6}
+        self.offsets = {4: HEADER.size, 6: HEADER.size + count_v4 * RANGES[4].size}
+        self.names_offset = self.offsets[6] + count_v6 * RANGES[6].size
+        self.name_count = name_count
+        self.blob_offset = self.names_offset + name_count * NAME.size
+        if len(mapped) < self.blob_offset:
+            raise ValueError(f"{path} is truncated")
+
+    def asn(self, version: int, value: int) -> Optional[int]:
+        record = RANGES[version]
+        key = value.to_bytes(ADDRESS_BYTES[version], "big")
+        base = self.offsets[version]
+        # Last range starting at or before the address
+        lo, hi = 0, self.counts[version]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if record.unpack_from(self.mapped, base + mid * record.size)[0] <= key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == 0:
+            return None
+        _, last, asn = record.unpack_from(self.mapped, base + (lo - 1) * record.size)
+        return asn if key <= last else None
+
+    def name(self, asn: int) -> Optional[str]:
+        lo, hi = 0, self.name_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry, offset, length = NAME.unpack_from(self.mapped, self.names_offset + mid * NAME.size)
+            if entry == asn:
+                start = self.blob_offset + offset
+                return self.mapped[start:start + length].decode("utf-8", "replace")
+            if entry < asn:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+
+class IpAsnTable:
+    """Memory-mapped IP to ASN table."""
+
+    def __init__(self):
+        self._table: Optional[_Table] = None
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a table file is mapped."""
+        return self._table is not None
+
+    def load(self, path: Optional[str] = None) -> None:
+        """
+        Map a table file, replacing the current one.
+
+        Args:
+            path: Table file (defaults to IP_ASN_FILE)
+
+        Raises:
+            OSError: If the file cannot be read
+            ValueError: If the file is not a table written by write_table()
+        """
+        path = path or settings.ip_asn_file
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(mapped) < HEADER.size:
+                raise ValueError(f"{path} is not an IP to ASN table")
+            table = _Table(mapped, path)
+        except ValueError:
+            mapped.close()
+            raise
+        # A previous mapping is unmapped once the last lookup using it is done (on GC)
+        self._table = table
+        logger.info(
+            f"Loaded IP to ASN table {path} "
+            f"({table.counts[4]} IPv4 and {table.counts[6]} IPv6 ranges, {table.name_count} AS names)"
+        )
+
+    def load_configured(self) -> None:
+        """Map IP_ASN_FILE if set; a missing or broken file is logged and lookups return None."""
+        if not settings.ip_asn_file:
+            return
+        try:
+            self.load()
+        except (OSError, ValueError):
+            logger.exception("Failed to load the IP to ASN table")
+
+    def lookup(self, version: int, value: int) -> Optional[Tuple[int, Optional[str]]]:
+        """
+        Find the autonomous system announcing an address.
+
+        Args:
+            version: IP version (4 or 6)
+            value: Address as an integer (see app.core.ip_prefixes.parse_ip)
+
+        Returns:
+            (ASN, AS name) or None if the address is not in the table or no table is loaded
+        """
+        table = self._table
+        if table is None:
+            return None
+        asn = table.asn(version, value)
+        if asn is None:
+            return None
+        return asn, table.name(asn)
+
+
+# Singleton instance
+ip_asn = IpAsnTable()
@@ -0,0 +1,144 @@
+"""
+IP addresses as integers and a multibit radix trie of counts per prefix.
+
+Addresses are parsed once, when an event is counted, into (version, integer)
+with IPv4-mapped IPv6 addresses folded into IPv4. The trie consumes IPv4
+addresses one octet per level (/8, /16, /24) and IPv6 addresses 16 bits per
+level (/16, /32, /48), adding the event's counts to every node on the path,
+so the totals of any of those prefixes are read without scanning addresses.
+"""
+import heapq
+import ipaddress
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Bits consumed per level and depth of the trie, per IP version
+STRIDES = {4: 8, 6: 16}
+DEPTHS = {4: 3, 6: 3}
+ADDRESS_BITS = {4: 32, 6: 128}
+
+
+@lru_cache(maxsize=65_536)
+def parse_ip(address: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an address into (version, integer).
+
+    Args:
+        address: IPv4 or IPv6 address as text
+
+    Returns:
+        The version and integer value (IPv4-mapped IPv6 as IPv4), or None if it is not an IP address
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return None
+    if ip.version == 6 and ip.ipv4_mapped is not None:
+        ip = ip.ipv4_mapped
+    return ip.version, int(ip)
+
+
+def format_prefix(version: int, network: int, prefix_length: int) -> str:
+    """Return CIDR notation for a prefix, e.g. "203.0.113.0/24"."""
+    address = ipaddress.IPv4Address(network) if version == 4 else ipaddress.IPv6Address(network)
+    return f"{address}/{prefix_length}"
+
+
+def prefix_lengths(version: int) -> Sequence[int]:
+    """Prefix lengths the trie counts for an IP version."""
+    stride = STRIDES[version]
+    return tuple(stride * level for level in range(1, DEPTHS[version] + 1))
+
+
+class _Node:
+    __slots__ = ("counts", "children")
+
+    def __init__(self, measures: int):
+        self.counts = [0] * measures
+        # Created with the first child, most nodes (the longest prefixes) have none
+        self.children: Optional[Dict[int, "_Node"]] = None
+
+
+class PrefixTrie:
+    """
+    Counts per IP prefix, in a trie of at most max_nodes nodes.
+
+    Once the trie is full, events under a prefix that has no node yet are
+    counted at its nearest existing ancestor, so shorter prefixes keep exact
+    totals while the longest ones lose the newest networks.
+    """
+
+    def __init__(self, measures: int = 1, max_nodes: int = 100_000):
+        self.measures = measures
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self._roots = {4: _Node(measures), 6: _Node(measures)}
+
+    def add(self, version: int, value: int, measure: int = 0, amount: int = 1) -> None:
+        """
+        Count an event.
+
+        Args:
+            version: IP version (4 or 6)
+            value: Address as an integer (see parse_ip)
+            measure: Which count to increase (0 <= measure < measures)
+            amount: How much to increase it by
+        """
+        stride = STRIDES[version]
+        shift = ADDRESS_BITS[version]
+        mask = (1 << stride) - 1
+        node = self._roots[version]
+        node.counts[measure] += amount
+        for _ in range(DEPTHS[version]):
+            shift -= stride
+            chunk = (value >> shift) & mask
+            children = node.children
+            child = children.get(chunk) if children is not None else None
+            if child is None:
+                if self.nodes >= self.max_nodes:
+                    return
+                if children is None:
+                    children = node.children = {}
+                child = children[chunk] = _Node(self.measures)
+                self.nodes += 1
+            child.counts[measure] += amount
+            node = child
+
+    def total(self, version: int) -> List[int]:
+        """Counts of all events of an IP version."""
+        return list(self._roots[version].counts)
+
+    def prefixes(self, version: int, prefix_length: int) -> Iterator[Tuple[int, List[int]]]:
+        """
+        Yield the counted prefixes of one length.
+
+        Args:
+            version: IP version (4 or 6)
+            prefix_length: One of prefix_lengths(version)
+
+        Yields:
+            (network address as an integer, counts) per prefix
+        """
+        stride = STRIDES[version]
+        if prefix_length not in prefix_lengths(version):
+            raise ValueError(f"IPv{version} prefixes are counted per {prefix_lengths(version)} bits")
+        depth = prefix_length // stride
+        bits = ADDRESS_BITS[version]
+        level = [(0, self._roots[version])]
+        for _ in range(depth):
+            level = [
+                ((network << stride) | chunk, child)
+                for network, node in level
+                if node.children
+                for chunk, child in node.children.items()
+            ]
+        for network, node in level:
+            yield network << (bits - prefix_length), node.counts
+
+    def top(
+        self, version: int, prefix_length: int, n: int, measure: int = 0
+    ) -> List[Tuple[int, List[int]]]:
+        """Return the n prefixes of one length with the highest count of a measure."""
+        return heapq.nlargest(
+            n, self.prefixes(version, prefix_length), key=lambda item: item[1][measure]
+        )
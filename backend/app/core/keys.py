@@ -0,0 +1,258 @@
+"""
+Access token signing keys: generation, rotation and the in-memory key cache.
+
+Key pairs live in the signing_keys table so every worker signs with the same
+key and verifies tokens from any other. Each process keeps the constructed
+key objects in memory (parsing a PEM costs far more than a signature) and
+only re-reads the table every JWT_KEYS_CACHE_SECONDS, or when a token names a
+kid it has not seen yet.
+
+Rotation is lazy: whichever process refreshes first after JWT_KEY_ROTATION_DAYS
+creates the next key, which is published in the JWKS JWT_KEY_PUBLISH_AHEAD_SECONDS
+before it is used for signing, so verifiers caching the JWKS see it in time.
+A superseded key stays published until the last token it signed has expired.
+"""
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+
+from app.core.config import settings
+from app.core.database import SessionLocal, naive_utc
+from app.models.signing_key import SigningKey
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_ALGORITHMS = ("RS256", "ES256")
+
+# Minimum interval between reloads triggered by unknown kids (forged tokens must not hammer the database)
+UNKNOWN_KID_REFRESH_SECONDS = 30.0
+
+# Delete keys this long after they stopped being published
+RETIRED_KEY_RETENTION = timedelta(days=1)
+
+
+@dataclass
+class KeyEntry:
+    """A signing key with its constructed key objects."""
+
+    kid: str
+    algorithm: str
+    not_before: datetime
+    retire_at: Optional[datetime]  # When the last token it signed expires (None while active or pending)
+    signing_key: Any
+    verify_key: Any
+    public_jwk: Dict[str, Any]
+
+
+def _fernet() -> Fernet:
+    digest = hashlib.sha256(b"markdown-editor:signing-keys:" + settings.secret_key.encode()).digest()
+    return Fernet(base64.urlsafe_b64encode(digest))
+
+
+def _generate_private_key(algorithm: str):
+    if algorithm == "RS256":
+        return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    if algorithm == "ES256":
+        return ec.generate_private_key(ec.SECP256R1())
+    raise ValueError(f"Unsupported signing algorithm: {algorithm}")
+
+
+def token_lifetime() -> timedelta:
+    """How long tokens signed by a key remain valid after it was superseded."""
+    return timedelta(minutes=settings.access_token_expire_minutes)
+
+
+class KeyStore:
+    """Per-process cache of the signing keys, refreshed from the database."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, KeyEntry] = {}
+        self._active: Optional[KeyEntry] = None
+        self._next_change: Optional[datetime] = None  # A pending key starts signing
+        self._loaded_at = 0.0
+        self._unknown_kid_refresh_at = 0.0
+
+    def create_key(self, db, algorithm: str, not_before: datetime) -> SigningKey:
+        """
+        Generate a key pair and store it.
+
+        Args:
+            db: Database session
+            algorithm: "RS256" or "ES256"
+            not_before: When the key starts signing tokens
+
+        Returns:
+            The stored SigningKey row
+        """
+        private_key = _generate_private_key(algorithm)
+        kid = uuid.uuid4().hex
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+        public_jwk = {
+            **jwk.construct(public_pem, algorithm).to_dict(),
+            "kid": kid,
+            "use": "sig",
+        }
+        row = SigningKey(
+            kid=kid,
+            algorithm=algorithm,
+            private_key=_fernet().encrypt(pem).decode(),
+            public_jwk=json.dumps(public_jwk),
+            created_at=datetime.utcnow(),
+            not_before=not_before,
+        )
+        db.add(row)
+        db.commit()
+        logger.info(f"Created {algorithm} signing key {kid} (signs from {not_before.isoformat()})")
+        return row
+
+    def _rotate(self, db, rows: List[SigningKey], now: datetime) -> bool:
+        """Create the first or the next key when due. Returns True if a key was created."""
+        algorithm = settings.algorithm
+        if not rows:
+            self.create_key(db, algorithm, now)
+            return True
+
+        newest = rows[-1]
+        rotate_at = naive_utc(newest.not_before) + timedelta(days=settings.jwt_key_rotation_days)
+        publish_ahead = timedelta(seconds=settings.jwt_key_publish_ahead_seconds)
+        if newest.algorithm != algorithm:
+            # ALGORITHM changed: switch right away, the old key still verifies its tokens
+            self.create_key(db, algorithm, now)
+            return True
+        if now >= rotate_at - publish_ahead:
+            self.create_key(db, algorithm, max(now + publish_ahead, rotate_at))
+            return True
+        return False
+
+    def refresh(self) -> None:
+        """Reload the keys from the database, rotating and pruning them when due."""
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            rows = db.query(SigningKey).order_by(SigningKey.not_before, SigningKey.created_at).all()
+            if self._rotate(db, rows, now):
+                rows = db.query(SigningKey).order_by(SigningKey.not_before, SigningKey.created_at).all()
+
+            entries: Dict[str, KeyEntry] = {}
+            active = None
+            next_change = None
+            expired = []
+            for index, row in enumerate(rows):
+                not_before = naive_utc(row.not_before)
+                successor = rows[index + 1] if index + 1 < len(rows) else None
+                retire_at = None
+                if successor is not None and naive_utc(successor.not_before) <= now:
+                    retire_at = naive_utc(successor.not_before) + token_lifetime()
+                    if retire_at + RETIRED_KEY_RETENTION < now:
+                        expired.append(row)
+                        continue
+                if not_before > now and (next_change is None or not_before < next_change):
+                    next_change = not_before
+
+                entry = self._entries.get(row.kid)
+                if entry is None:
+                    public_jwk = json.loads(row.public_jwk)
+                    private_pem = _fernet().decrypt(row.private_key.encode())
+                    entry = KeyEntry(
+                        kid=row.kid,
+                        algorithm=row.algorithm,
+                        not_before=not_before,
+                        retire_at=retire_at,
+                        signing_key=jwk.construct(private_pem, row.algorithm),
+                        verify_key=jwk.construct(public_jwk, row.algorithm),
+                        public_jwk=public_jwk,
+                    )
+                else:
+                    entry.retire_at = retire_at
+                entries[row.kid] = entry
+                if not_before <= now:
+                    active = entry
+
+            if expired:
+                for row in expired:
+                    db.delete(row)
+                db.commit()
+                logger.info(f"Deleted {len(expired)} retired signing key(s)")
+        finally:
+            db.close()
+
+        with self._lock:
+            self._entries = entries
+            self._active = active
+            self._next_change = next_change
+            self._loaded_at = time.monotonic()
+
+    def _ensure_fresh(self) -> None:
+        stale = time.monotonic() - self._loaded_at >= settings.jwt_keys_cache_seconds
+        if stale or self._active is None or (
+            self._next_change is not None and datetime.utcnow() >= self._next_change
+        ):
+            self.refresh()
+
+    def signing_key(self) -> KeyEntry:
+        """Return the key to sign new tokens with."""
+        self._ensure_fresh()
+        return self._active
+
+    def verification_key(self, kid: str) -> Optional[KeyEntry]:
+        """
+        Return the key a token names in its kid header.
+
+        Args:
+            kid: Key ID from the token header
+
+        Returns:
+            The key, or None if it is unknown or retired
+        """
+        self._ensure_fresh()
+        entry = self._entries.get(kid)
+        if entry is None:
+            # Possibly created by another worker since the last reload
+            now = time.monotonic()
+            if now < self._unknown_kid_refresh_at:
+                return None
+            self._unknown_kid_refresh_at = now + UNKNOWN_KID_REFRESH_SECONDS
+            self.refresh()
+            entry = self._entries.get(kid)
+        if entry is None or (entry.retire_at is not None and entry.retire_at <= datetime.utcnow()):
+            return None
+        return entry
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Return the published public keys (pending, active and not yet retired)."""
+        if settings.algorithm not in SUPPORTED_ALGORITHMS:
+            return {"keys": []}
+        self._ensure_fresh()
+        now = datetime.utcnow()
+        return {
+            "keys": [
+                entry.public_jwk
+                for entry in self._entries.values()
+                if entry.retire_at is None or entry.retire_at > now
+            ]
+        }
+
+
+# Singleton instance
+key_store = KeyStore()
@@ -0,0 +1,181 @@
+"""
+Prometheus metrics.
+
+Every worker process records into its own metric values without any
+cross-process coordination. In multi-process mode (PROMETHEUS_MULTIPROC_DIR
+set, see start.py) each process writes to its own memory-mapped files and
+/metrics aggregates all of them at scrape time.
+"""
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    REGISTRY,
+    generate_latest,
+)
+
+from app.core.worker_stats import read_rss_bytes
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+# Latency buckets in seconds, from sub-millisecond to slow requests
+LATENCY_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+# HTTP
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    multiprocess_mode="livesum",
+)
+
+# Database queries
+db_query_duration_seconds = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request by route template",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100),
+)
+db_n_plus_one_total = Counter(
+    "db_n_plus_one_total",
+    "Requests that repeated a statement often enough to look like an N+1 pattern",
+    ["route"],
+)
+
+# Database connection pool
+db_pool_size = Gauge(
+    "db_pool_size", "Configured connection pool size", multiprocess_mode="livesum"
+)
+db_pool_checked_out = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", multiprocess_mode="livesum"
+)
+db_pool_overflow = Gauge(
+    "db_pool_overflow", "Connections open beyond the pool size", multiprocess_mode="livesum"
+)
+
+# Worker process
+worker_rss_bytes = Gauge(
+    "worker_resident_memory_bytes", "Resident memory of each worker", multiprocess_mode="liveall"
+)
+
+# Password hashing
+password_hash_duration_seconds = Histogram(
+    "password_hash_duration_seconds",
+    "bcrypt hash and verify duration",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 2.0),
+)
+
+# Email
+email_send_duration_seconds = Histogram(
+    "email_send_duration_seconds",
+    "Email delivery duration by outcome",
+    ["outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+emails_sent_total = Counter("emails_sent_total", "Emails sent by outcome", ["outcome"])
+email_outbox_depth = Gauge(
+    "email_outbox_depth", "Undelivered emails in the outbox", multiprocess_mode="livemax"
+)
+
+# Rate limiting
+rate_limit_rejections_total = Counter(
+    "rate_limit_rejections_total", "Requests rejected by a rate limiter", ["limiter"]
+)
+
+# Login anomaly detection
+login_anomalies_total = Counter(
+    "login_anomalies_total", "Logins flagged by the anomaly detector", ["kind"]
+)
+
+
+# Label for requests that did not match any route (404s, scanners), so
+# arbitrary paths cannot blow up the label cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_label(scope) -> str:
+    """Route template of a request (the router stores the matched route in the scope)."""
+    return getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+
+
+@contextmanager
+def observe_duration(histogram, **labels) -> Iterator[None]:
+    """Record the duration of a block in a histogram."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - start)
+
+
+_RESOURCE_UPDATE_INTERVAL = 1.0
+_resources_updated_at = 0.0
+
+
+def update_resource_gauges() -> None:
+    """Refresh pool and memory gauges (at most once per second per process)."""
+    global _resources_updated_at
+
+    now = time.monotonic()
+    if now - _resources_updated_at < _RESOURCE_UPDATE_INTERVAL:
+        return
+    _resources_updated_at = now
+
+    from app.core.database import engine
+
+    pool = engine.pool
+    if hasattr(pool, "size") and hasattr(pool, "checkedout"):
+        db_pool_size.set(pool.size())
+        db_pool_checked_out.set(pool.checkedout())
+        db_pool_overflow.set(max(pool.overflow(), 0))
+    worker_rss_bytes.set(read_rss_bytes())
+
+
+def render_metrics() -> bytes:
+    """Render all metrics (aggregated across workers) in text exposition format."""
+    update_resource_gauges()
+    if MULTIPROCESS:
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop live gauges of an exited worker (multi-process mode only)."""
+    if MULTIPROCESS:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
+__all__ = [
+    "CONTENT_TYPE_LATEST",
+    "render_metrics",
+    "mark_process_dead",
+    "observe_duration",
+    "route_label",
+    "update_resource_gauges",
+]
@@ -0,0 +1,29 @@
+"""
+Error tracking and monitoring setup.
+"""
+from app.core.config import settings
+
+
+def init_sentry() -> bool:
+    """
+    Initialize Sentry for production error tracking.
+
+    sentry_sdk is imported here rather than at module level so that
+    processes without a DSN (and fast startups) never pay for the import.
+
+    Returns:
+        True if Sentry was initialized, False if it is disabled
+    """
+    if settings.debug or not settings.sentry_dsn:
+        return False
+
+    import sentry_sdk
+    from sentry_sdk.integrations.fastapi import FastApiIntegration
+
+    sentry_sdk.init(
+        dsn=settings.sentry_dsn,
+        integrations=[FastApiIntegration()],
+        environment=settings.environment,
+        traces_sample_rate=0.1,
+    )
+    return True
@@ -0,0 +1,306 @@
+"""
+Sampling profiler.
+
+A background thread periodically captures the Python stacks of all other
+threads (sys._current_frames) and counts them as folded stacks
+("thread;outer;...;inner <count>"), the input format of flamegraph.pl,
+speedscope and similar tools. Nothing is instrumented, so the profiled code
+runs at full speed; the cost is the sampling itself, paid by the sampler
+thread while it holds the GIL.
+
+Two modes are provided:
+
+- Per-request profiles, triggered by admins (see app.api.deps.profile_request)
+  and stored as <profile id>.folded under PROFILE_DIR. Only threads that are
+  running the route's endpoint or one of its dependencies are sampled (on the
+  event loop or a threadpool worker), so background threads and other
+  endpoints stay out of the profile; concurrent calls of the same endpoint
+  are still counted together.
+- Continuous low-rate sampling (PROFILE_CONTINUOUS=true), aggregated per
+  worker process and periodically flushed to continuous-<pid>.folded. The
+  sampling interval backs off so the sampler never uses more than
+  PROFILE_MAX_OVERHEAD of wall time.
+"""
+import os
+import secrets
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Optional
+
+from app.core.config import settings
+
+# Leaf frames of threads that are idle (threadpool workers waiting for work,
+# the event loop waiting for I/O, inside uvloop's C loop, or joining a
+# thread). Samples ending in them are dropped.
+IDLE_FRAMES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("selectors.py", "select"),
+    ("runners.py", "run"),
+    ("thread.py", "_worker"),
+}
+
+PROFILE_ID_LENGTH = 16
+
+
+def get_profile_dir() -> Path:
+    """Directory where profiles are written (created on demand)."""
+    path = Path(
+        settings.profile_dir or os.path.join(tempfile.gettempdir(), "markdown-editor-profiles")
+    )
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _code_of(call: Any):
+    """Code object run when call is called (functions, methods and callable instances)."""
+    code = getattr(call, "__code__", None)
+    if code is None:
+        code = getattr(getattr(call, "__call__", None), "__code__", None)
+    return code
+
+
+def dependant_codes(dependant) -> FrozenSet:
+    """
+    Code objects of a FastAPI route's endpoint and all of its dependencies.
+
+    Args:
+        dependant: The route's dependant (APIRoute.dependant)
+
+    Returns:
+        Code objects whose frames mark a thread as working on the route
+    """
+    codes = set()
+    pending = [dependant]
+    while pending:
+        current = pending.pop()
+        code = _code_of(current.call)
+        if code is not None:
+            codes.add(code)
+        pending.extend(current.dependencies)
+    return frozenset(codes)
+
+
+class StackSampler:
+    """
+    Sample the stacks of other threads from a background thread.
+
+    With codes given, only threads whose stack contains a frame of one of
+    those code objects are sampled; otherwise all threads are. The sampling interval adapts to the measured cost of sampling: when one
+    sample takes longer than max_overhead of the interval, the interval is
+    stretched accordingly, so a process with many deep threads is sampled
+    less often instead of being slowed down.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        max_overhead: float = 0.01,
+        name: str = "stack-sampler",
+        codes: Optional[FrozenSet] = None,
+    ):
+        self.base_interval = interval
+        self.interval = interval
+        self.max_overhead = max_overhead
+        self.name = name
+        self.codes = codes
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.sampling_seconds = 0.0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "StackSampler":
+        """Start sampling in a daemon thread."""
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "StackSampler":
+        """Stop sampling and wait for the sampler thread to exit."""
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.stopped_at = time.monotonic()
+        return self
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self.sample(exclude=frozenset({own_id}))
+            cost = time.perf_counter() - start
+            self.sampling_seconds += cost
+            if self.max_overhead > 0:
+                self.interval = max(self.base_interval, cost / self.max_overhead)
+
+    def sample(self, exclude: frozenset = frozenset()) -> None:
+        """Capture one stack per (non-idle, matching) thread."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        frames = sys._current_frames()
+        collected = []
+        for thread_id, frame in frames.items():
+            if thread_id in exclude:
+                continue
+            code = frame.f_code
+            if (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES:
+                continue
+
+            labels = []
+            matched = self.codes is None
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                matched = matched or frame.f_code in self.codes
+                frame = frame.f_back
+            if not matched:
+                continue
+            labels.append(names.get(thread_id, str(thread_id)))
+            collected.append(";".join(reversed(labels)))
+        del frames
+
+        with self._lock:
+            self.stacks.update(collected)
+            self.samples += 1
+
+    def drain(self) -> Counter:
+        """Return the stacks collected so far and start a new aggregate."""
+        with self._lock:
+            stacks, self.stacks = self.stacks, Counter()
+        return stacks
+
+    def folded(self) -> str:
+        """Collected stacks in folded format, most frequent first."""
+        with self._lock:
+            items = self.stacks.most_common()
+        return "".join(f"{stack} {count}\n" for stack, count in items)
+
+    def stats(self) -> Dict[str, float]:
+        """Sample count, duration and measured sampler overhead."""
+        end = self.stopped_at or time.monotonic()
+        duration = end - (self.started_at or end)
+        return {
+            "samples": self.samples,
+            "duration_seconds": round(duration, 3),
+            "interval_ms": round(self.interval * 1000, 2),
+            "overhead": round(self.sampling_seconds / duration, 4) if duration else 0.0,
+        }
+
+
+def start_request_profile(codes: Optional[FrozenSet] = None) -> StackSampler:
+    """
+    Start a high-rate sampler for the duration of one request.
+
+    Args:
+        codes: Code objects of the request's endpoint and dependencies (see
+            dependant_codes); threads not running any of them are skipped
+    """
+    return StackSampler(
+        interval=settings.profile_request_interval_ms / 1000,
+        max_overhead=0,
+        name="request-profiler",
+        codes=codes,
+    ).start()
+
+
+def save_request_profile(sampler: StackSampler) -> str:
+    """
+    Stop a per-request sampler and write its profile.
+
+    Returns:
+        Profile id (file name without the .folded suffix)
+    """
+    sampler.stop()
+    profile_id = secrets.token_hex(PROFILE_ID_LENGTH // 2)
+    (get_profile_dir() / f"{profile_id}.folded").write_text(sampler.folded())
+    return profile_id
+
+
+def load_request_profile(profile_id: str) -> Optional[str]:
+    """Read a stored per-request profile, or None if it does not exist."""
+    if len(profile_id) != PROFILE_ID_LENGTH or not all(
+        c in "0123456789abcdef" for c in profile_id
+    ):
+        return None
+    path = get_profile_dir() / f"{profile_id}.folded"
+    return path.read_text() if path.exists() else None
+
+
+class ContinuousProfiler:
+    """
+    Low-rate sampler that periodically merges its stacks into a file.
+
+    Each worker process writes its own continuous-<pid>.folded; counts from
+    earlier flushes are kept, so the file is a running aggregate.
+    """
+
+    def __init__(self):
+        self.sampler: Optional[StackSampler] = None
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def path(self) -> Path:
+        return get_profile_dir() / f"continuous-{os.getpid()}.folded"
+
+    def start(self) -> None:
+        """Start sampling and the periodic flush (no-op if already running)."""
+        if self.sampler is not None:
+            return
+        self._stop.clear()
+        self.sampler = StackSampler(
+            interval=1 / settings.profile_continuous_hz,
+            max_overhead=settings.profile_max_overhead,
+            name="continuous-profiler",
+        ).start()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="continuous-profiler-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """Stop sampling and write the remaining stacks."""
+        if self.sampler is None:
+            return
+        self._stop.set()
+        self._flusher.join()
+        self.sampler.stop()
+        self.flush()
+        self.sampler = None
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(settings.profile_flush_seconds):
+            self.flush()
+
+    def flush(self) -> None:
+        """Merge the stacks collected since the last flush into the file."""
+        stacks = self.sampler.drain()
+        if not stacks:
+            return
+
+        path = self.path
+        if path.exists():
+            for line in path.read_text().splitlines():
+                stack, _, count = line.rpartition(" ")
+                if stack:
+                    stacks[stack] += int(count)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+        tmp.replace(path)
+
+
+# Global continuous profiler
+continuous_profiler = ContinuousProfiler()
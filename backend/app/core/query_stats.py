@@ -0,0 +1,134 @@
+"""
+SQL query instrumentation.
+
+Engine events count the statements and DB time of the current request
+(tracked in a context variable by QueryStatsMiddleware), log slow statements
+with the shapes of their bound parameters, and flag statements repeated
+within one request as likely N+1 patterns.
+"""
+import logging
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics import db_query_duration_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statements executed while handling one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """Statements executed at least threshold times, most frequent first."""
+        return [(s, n) for s, n in self.statements.most_common() if n >= threshold]
+
+
+# Stats of the request being handled. Sync endpoints run in threadpool threads
+# with a copy of the request's context, which still refers to the same
+# QueryStats object, so their queries are counted too.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def parameter_shape(parameters: Any) -> Any:
+    """
+    Describe bound parameters by type only, so slow-query logs leak no values.
+
+    Returns:
+        e.g. {"email_1": "str", "param_1": "int"}, or "100 x (...)" for executemany
+    """
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_times")
+    if not start_times:
+        return
+    elapsed = time.perf_counter() - start_times.pop()
+
+    db_query_duration_seconds.observe(elapsed)
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.db_slow_query_ms:
+        logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms): {' '.join(statement.split())} "
+            f"parameters={parameter_shape(parameters)}"
+        )
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach the query timing events to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, engine: Optional[Engine] = None) -> Iterator[List[str]]:
+    """
+    Fail when the enclosed block executes more than max_queries statements.
+
+    Intended for tests and scripts driving the app with TestClient; it counts
+    every statement executed on the engine, so run requests one at a time.
+
+    Args:
+        max_queries: Query budget of the block
+        engine: Engine to watch (defaults to the application engine)
+
+    Yields:
+        List of executed statements, filled in as the block runs
+
+    Raises:
+        AssertionError: If the budget is exceeded
+    """
+    if engine is None:
+        from app.core.database import engine
+
+    statements: List[str] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "after_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "after_cursor_execute", record)
+
+    if len(statements) > max_queries:
+        repeated = Counter(statements).most_common(3)
+        details = "\n".join(f"  {n} x {' '.join(s.split())[:200]}" for s, n in repeated)
+        raise AssertionError(
+            f"Executed {len(statements)} queries, budget is {max_queries}. "
+            f"Most frequent:\n{details}"
+        )
@@ -1,11 +1,17 @@
 """
 Rate limiting middleware for authentication endpoints.
 """
+import math
+import threading
+import time
 from datetime import datetime, timedelta
-from collections import defaultdict
-from typing import Dict, List
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional
 from fastapi import HTTPException, status, Request
 
+from app.core.config import settings
+from app.core.metrics import rate_limit_rejections_total
+
 
 class RateLimiter:
     """In-memory rate limiter for authentication attempts."""
@@ -36,6 +42,7 @@ class RateLimiter:
         ip_address = request.client.host if request.client else "unknown"
         self._check_rate_limit(
             self.login_attempts,
+            "login",
             ip_address,
             max_attempts,
             time_window_minutes,
@@ -62,6 +69,7 @@ class RateLimiter:
         ip_address = request.client.host if request.client else "unknown"
         self._check_rate_limit(
             self.registration_attempts,
+            "registration",
             ip_address,
             max_attempts,
             time_window_minutes,
@@ -71,6 +79,7 @@ class RateLimiter:
     def _check_rate_limit(
         self,
         attempts_dict: Dict[str, List[datetime]],
+        limiter_name: str,
         ip_address: str,
         max_attempts: int,
         time_window_minutes: int,
@@ -81,6 +90,7 @@ class RateLimiter:
 
         Args:
             attempts_dict: Dictionary to store attempts
+            limiter_name: Limiter label for the rejection metric
             ip_address: Client IP address
             max_attempts: Maximum number of attempts allowed
             time_window_minutes: Time window in minutes
@@ -89,6 +99,9 @@ class RateLimiter:
         Raises:
             HTTPException: If rate limit is exceeded
         """
+        if not settings.rate_limit_enabled:
+            return
+
         now = datetime.utcnow()
         cutoff_time = now - timedelta(minutes=time_window_minutes)
 
@@ -100,6 +113,7 @@ class RateLimiter:
 
         # Check if limit exceeded
         if len(attempts_dict[ip_address]) >= max_attempts:
+            rate_limit_rejections_total.labels(limiter=limiter_name).inc()
             raise HTTPException(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 detail=error_message
@@ -114,5 +128,101 @@ class RateLimiter:
             del self.login_attempts[ip_address]
 
 
+class AccountThrottle:
+    """
+    Per-account login throttle with exponential lockout.
+
+    The IP limiter does not slow down credential stuffing spread over many
+    addresses, so failed logins are also counted per email. After
+    LOGIN_THROTTLE_FREE_FAILURES failures the account is locked for
+    LOGIN_THROTTLE_BASE_SECONDS, doubling with every further failure up to
+    LOGIN_THROTTLE_MAX_SECONDS. A locked account is rejected before the user
+    lookup and the bcrypt verification, so an attack costs no CPU beyond the
+    check. Counters are forgotten after LOGIN_THROTTLE_MAX_SECONDS without
+    failures or on a successful login.
+
+    Counters live in an LRU of at most LOGIN_THROTTLE_MAX_ACCOUNTS entries
+    (a few hundred bytes each), so spraying random emails evicts the oldest
+    counters instead of growing memory.
+    """
+
+    def __init__(self, max_accounts: Optional[int] = None):
+        self.max_accounts = max_accounts or settings.login_throttle_max_accounts
+        # {email: [failures, last failure (monotonic), locked until (monotonic)]}
+        self._counters: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return email.strip().lower()
+
+    def lockout_seconds(self, failures: int) -> float:
+        """Lockout after the given number of consecutive failures (0 while still free)."""
+        excess = failures - settings.login_throttle_free_failures
+        if excess < 0:
+            return 0.0
+        return min(
+            settings.login_throttle_base_seconds * 2 ** min(excess, 32),
+            settings.login_throttle_max_seconds,
+        )
+
+    def check(self, email: str) -> None:
+        """
+        Reject a login attempt while the account is locked.
+
+        Args:
+            email: Email the client is logging in as
+
+        Raises:
+            HTTPException: 429 with Retry-After if the account is locked
+        """
+        if not settings.rate_limit_enabled:
+            return
+        counter = self._counters.get(self._key(email))
+        if counter is None:
+            return
+        remaining = counter[2] - time.monotonic()
+        if remaining > 0:
+            rate_limit_rejections_total.labels(limiter="login_account").inc()
+            retry_after = math.ceil(remaining)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"このアカウントへのログイン試行が多すぎます。{retry_after}秒後に再試行してください。",
+                headers={"Retry-After": str(retry_after)},
+            )
+
+    def record_failure(self, email: str) -> None:
+        """
+        Count a failed login (unknown email or wrong password).
+
+        Args:
+            email: Email the client tried to log in as
+        """
+        if not settings.rate_limit_enabled:
+            return
+        key = self._key(email)
+        now = time.monotonic()
+        with self._lock:
+            counter = self._counters.get(key)
+            if counter is None or now - counter[1] > settings.login_throttle_max_seconds:
+                counter = [0, now, 0.0]
+                self._counters[key] = counter
+            else:
+                self._counters.move_to_end(key)
+            counter[0] += 1
+            counter[1] = now
+            lockout = self.lockout_seconds(int(counter[0]))
+            if lockout:
+                counter[2] = now + lockout
+            while len(self._counters) > self.max_accounts:
+                self._counters.popitem(last=False)
+
+    def reset(self, email: str) -> None:
+        """Forget the failures of an account after a successful login."""
+        with self._lock:
+            self._counters.pop(self._key(email), None)
+
+
 # Global rate limiter instance
 rate_limiter = RateLimiter()
+account_throttle = AccountThrottle()
@@ -0,0 +1,62 @@
+"""
+Fast JSON response classes and cached Pydantic serializers.
+"""
+from functools import lru_cache
+from typing import Any, Callable, Optional, Mapping
+
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+# Default response class for the application (orjson-backed)
+DefaultResponse = ORJSONResponse
+
+
+@lru_cache(maxsize=None)
+def get_serializer(response_type: Any) -> Callable[[Any], bytes]:
+    """
+    Get a cached JSON serializer for a response type.
+
+    The TypeAdapter (and its compiled core schema) is built once per type,
+    so repeated calls only pay for the serialization itself.
+
+    Args:
+        response_type: Pydantic model or typing construct (e.g. List[Model])
+
+    Returns:
+        Function that dumps a value of that type straight to JSON bytes
+    """
+    adapter = TypeAdapter(response_type)
+
+    def serialize(content: Any) -> bytes:
+        return adapter.dump_json(content, by_alias=True)
+
+    return serialize
+
+
+class PydanticResponse(Response):
+    """
+    JSON response rendered directly from Pydantic models.
+
+    Returning this from an endpoint bypasses FastAPI's response_model
+    re-validation and jsonable_encoder pass; the content is dumped to
+    bytes in a single step by a cached TypeAdapter serializer. Keep
+    response_model on the route so the OpenAPI schema stays the same.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content: Any,
+        response_type: Optional[Any] = None,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> None:
+        self.response_type = response_type if response_type is not None else type(content)
+        super().__init__(content, status_code, headers, self.media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return get_serializer(self.response_type)(content)
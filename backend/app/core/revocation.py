@@ -0,0 +1,191 @@
+"""
+Access token revocation list (jti denylist).
+
+Revoked access tokens are stored in the revoked_tokens table until they
+expire. Every process mirrors the table in memory: a Bloom filter answers the
+common case ("not revoked") from a few bits, and an exact jti -> expiry map
+confirms its positives. Checking a token therefore never touches the
+database. A background task in each process pulls rows revoked by other
+processes every JWT_REVOCATION_SYNC_SECONDS; revocations made by the process
+itself apply immediately.
+"""
+import asyncio
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.database import SessionLocal, naive_utc
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+INITIAL_CAPACITY = 10_000
+FALSE_POSITIVE_RATE = 0.001
+
+# Re-read rows committed this long before the last sync (commit order and clock skew between processes)
+SYNC_OVERLAP = timedelta(seconds=30)
+
+# How often expired entries are dropped from memory and the table
+PRUNE_INTERVAL_SECONDS = 600.0
+
+
+class RevocationList:
+    """In-memory mirror of the revoked_tokens table."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._exact: Dict[str, datetime] = {}
+        self._bloom = BloomFilter(INITIAL_CAPACITY, FALSE_POSITIVE_RATE)
+        self._synced_at: Optional[datetime] = None
+        self._synced_monotonic = 0.0
+        self._pruned_monotonic = 0.0
+
+    def is_revoked(self, jti: str) -> bool:
+        """
+        Check whether an access token was revoked.
+
+        Args:
+            jti: Token ID ("jti" claim)
+
+        Returns:
+            True if the token must be rejected
+        """
+        if self._synced_at is None or (
+            time.monotonic() - self._synced_monotonic > 10 * settings.jwt_revocation_sync_seconds
+        ):
+            # Not loaded yet, or the sync task is not running in this process
+            self.sync()
+        return jti in self._bloom and jti in self._exact
+
+    def _remember(self, entries: Iterable[Tuple[str, datetime]]) -> None:
+        with self._lock:
+            for jti, expires_at in entries:
+                if jti in self._exact:
+                    continue
+                self._exact[jti] = expires_at
+                self._bloom.add(jti)
+            if len(self._exact) > self._bloom.capacity:
+                self._rebuild(self._bloom.capacity * 2)
+
+    def _rebuild(self, capacity: int) -> None:
+        """Replace the Bloom filter (it cannot forget entries). Caller holds the lock."""
+        bloom = BloomFilter(capacity, FALSE_POSITIVE_RATE)
+        bloom.update(self._exact)
+        self._bloom = bloom
+
+    def revoke(self, db: Session, entries: Iterable[Tuple[str, datetime]]) -> int:
+        """
+        Revoke access tokens and commit the session.
+
+        Args:
+            db: Database session (pending changes of the caller are committed too)
+            entries: (jti, token expiry) pairs
+
+        Returns:
+            Number of tokens newly revoked
+        """
+        now = datetime.utcnow()
+        pending = {jti: expires_at for jti, expires_at in entries if jti and expires_at > now}
+        if pending:
+            existing = {
+                jti for (jti,) in db.query(RevokedToken.jti).filter(RevokedToken.jti.in_(list(pending)))
+            }
+            for jti, expires_at in pending.items():
+                if jti not in existing:
+                    db.add(RevokedToken(jti=jti, expires_at=expires_at, created_at=now))
+        db.commit()
+        self._remember(pending.items())
+        return len(pending)
+
+    def sync(self) -> int:
+        """
+        Load tokens revoked since the last sync (all unexpired ones the first time).
+
+        Returns:
+            Number of rows read
+        """
+        started = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            query = db.query(RevokedToken.jti, RevokedToken.expires_at).filter(
+                RevokedToken.expires_at > started
+            )
+            if self._synced_at is not None:
+                query = query.filter(RevokedToken.created_at >= self._synced_at - SYNC_OVERLAP)
+            rows = query.all()
+
+            if time.monotonic() - self._pruned_monotonic >= PRUNE_INTERVAL_SECONDS:
+                self._prune(db, started)
+        finally:
+            db.close()
+
+        self._remember((jti, naive_utc(expires_at)) for jti, expires_at in rows)
+        self._synced_at = started
+        self._synced_monotonic = time.monotonic()
+        return len(rows)
+
+    def _prune(self, db: Session, now: datetime) -> None:
+        """Forget expired tokens in memory and delete their rows."""
+        self._pruned_monotonic = time.monotonic()
+        with self._lock:
+            expired = [jti for jti, expires_at in self._exact.items() if expires_at <= now]
+            if expired:
+                for jti in expired:
+                    del self._exact[jti]
+                self._rebuild(max(INITIAL_CAPACITY, self._bloom.capacity))
+        deleted = (
+            db.query(RevokedToken)
+            .filter(RevokedToken.expires_at <= now)
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        if deleted:
+            logger.info(f"Deleted {deleted} expired revoked token(s)")
+
+    def stats(self) -> Dict[str, int]:
+        """Entries held in memory and the Bloom filter size."""
+        return {"revoked": len(self._exact), "bloom_bits": self._bloom.num_bits}
+
+
+class RevocationSyncWorker:
+    """Background task keeping this process's revocation list current."""
+
+    def __init__(self, revocations: RevocationList):
+        self.revocations = revocations
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="revocation-sync")
+
+    async def stop(self) -> None:
+        """Stop the worker."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.revocations.sync)
+            except Exception:
+                logger.exception("Revocation list sync failed")
+            await asyncio.sleep(settings.jwt_revocation_sync_seconds)
+
+
+# Singleton instances
+revocation_list = RevocationList()
+revocation_sync_worker = RevocationSyncWorker(revocation_list)
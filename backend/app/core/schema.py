@@ -0,0 +1,294 @@
+"""
+Database schema revision checks.
+
+Compares the Alembic revision recorded in the database with the head
+revision of the migration scripts shipped with the code, without loading
+Alembic's script machinery unless a migration actually has to run.
+"""
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+ALEMBIC_INI = BACKEND_DIR / "alembic.ini"
+VERSIONS_DIR = BACKEND_DIR / "alembic" / "versions"
+
+_REVISION_RE = re.compile(r"^revision(?:\s*:\s*str)?\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+_DOWN_REVISION_RE = re.compile(r"^down_revision(?:\s*:[^=]+)?\s*=\s*(.+)$", re.MULTILINE)
+
+# Advisory lock key shared by every process that runs migrations
+MIGRATION_LOCK_KEY = zlib.crc32(b"markdown-editor:alembic-migrations")
+
+
+@lru_cache(maxsize=1)
+def get_code_head() -> Optional[str]:
+    """
+    Get the head revision of the migration scripts.
+
+    The revision graph is read with a regex scan of the version files, which
+    is much cheaper than importing every migration through Alembic.
+
+    Returns:
+        Head revision ID, or None if there are no migrations
+    """
+    revisions: Set[str] = set()
+    parents: Set[str] = set()
+
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        revision = _REVISION_RE.search(source)
+        if not revision:
+            continue
+        revisions.add(revision.group(1))
+        down_revision = _DOWN_REVISION_RE.search(source)
+        if down_revision:
+            parents.update(re.findall(r"['\"]([^'\"]+)['\"]", down_revision.group(1)))
+
+    heads = revisions - parents
+    if len(heads) > 1:
+        raise RuntimeError(f"Multiple migration heads found: {sorted(heads)}")
+    return heads.pop() if heads else None
+
+
+def get_db_revision(engine=None) -> Optional[str]:
+    """
+    Get the revision currently recorded in the database.
+
+    Args:
+        engine: SQLAlchemy engine (defaults to the application engine)
+
+    Returns:
+        Revision ID, or None if the database has not been migrated yet
+    """
+    from sqlalchemy import inspect, text
+
+    if engine is None:
+        from app.core.database import engine
+
+    with engine.connect() as conn:
+        if not inspect(conn).has_table("alembic_version"):
+            return None
+        return conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def _revision_cache_path() -> Path:
+    """Path of the local file remembering the last verified revision."""
+    from app.core.config import settings
+
+    digest = hashlib.sha256(settings.database_url.encode("utf-8")).hexdigest()[:16]
+    return Path(tempfile.gettempdir()) / f"markdown-editor-schema-{digest}.rev"
+
+
+def is_revision_cached(revision: str) -> bool:
+    """Check whether this host already verified the database is at revision."""
+    try:
+        return _revision_cache_path().read_text(encoding="utf-8").strip() == revision
+    except OSError:
+        return False
+
+
+def cache_revision(revision: str) -> None:
+    """Remember that the database has been verified to be at revision."""
+    path = _revision_cache_path()
+    try:
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(revision, encoding="utf-8")
+        tmp_path.replace(path)
+    except OSError as e:
+        logger.warning(f"Could not write schema revision cache {path}: {e}")
+
+
+def run_migrations(revision: str = "head") -> None:
+    """
+    Upgrade the database with Alembic.
+
+    Callers that may run concurrently should use migrate() instead, which
+    serializes upgrades with a database lock.
+
+    Args:
+        revision: Target revision (default: head)
+    """
+    from alembic.config import Config
+    from alembic.command import upgrade
+
+    alembic_cfg = Config(str(ALEMBIC_INI))
+    alembic_cfg.set_main_option("script_location", str(BACKEND_DIR / "alembic"))
+    upgrade(alembic_cfg, revision)
+
+
+@contextmanager
+def migration_lock(engine=None, timeout: float = 300.0) -> Iterator[None]:
+    """
+    Hold an exclusive, cross-process migration lock.
+
+    PostgreSQL uses a session-level advisory lock; SQLite uses an flock on a
+    file next to the database. Other dialects run unlocked.
+
+    Args:
+        engine: SQLAlchemy engine (defaults to the application engine)
+        timeout: Seconds to wait for the lock
+
+    Raises:
+        TimeoutError: If the lock could not be acquired in time
+    """
+    from sqlalchemy import text
+
+    if engine is None:
+        from app.core.database import engine
+
+    deadline = time.monotonic() + timeout
+
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            while not conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY}
+            ).scalar():
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("Timed out waiting for the migration lock")
+                time.sleep(1.0)
+            try:
+                yield
+            finally:
+                conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY}
+                )
+                conn.commit()
+        return
+
+    database = engine.url.database
+    if engine.dialect.name != "sqlite" or not database or database == ":memory:":
+        yield
+        return
+
+    import fcntl
+
+    with open(f"{database}.migrate.lock", "w") as lock_file:
+        while True:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError("Timed out waiting for the migration lock")
+                time.sleep(0.2)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def migrate(timeout: float = 300.0) -> str:
+    """
+    Upgrade the database to the code's head revision under the migration lock.
+
+    The revision is re-checked after the lock is acquired, so when several
+    processes race only the first one runs Alembic.
+
+    Args:
+        timeout: Seconds to wait for the migration lock
+
+    Returns:
+        "current" if nothing had to be done, "migrated" otherwise
+    """
+    head = get_code_head()
+    if head is None:
+        return "current"
+
+    with migration_lock(timeout=timeout):
+        if get_db_revision() == head:
+            cache_revision(head)
+            return "current"
+        logger.info(f"Upgrading database schema to {head}")
+        run_migrations(head)
+
+    cache_revision(head)
+    return "migrated"
+
+
+def check_schema() -> str:
+    """
+    Check whether the database schema is at the code's head revision.
+
+    Skips the database round trip entirely when this host has already
+    verified the current head.
+
+    Returns:
+        "cached" or "current" if the schema is up to date, "pending" otherwise
+    """
+    head = get_code_head()
+    if head is None:
+        return "current"
+    if is_revision_cached(head):
+        return "cached"
+
+    if get_db_revision() == head:
+        cache_revision(head)
+        return "current"
+    return "pending"
+
+
+class SchemaGate:
+    """
+    Readiness state tied to the database schema revision.
+
+    The gate stays closed until the database reports the code's head
+    revision. While closed, the database is re-checked at most once per
+    check_interval seconds so readiness probes never pile onto the pool;
+    once open it stays open for the life of the process.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self.db_revision: Optional[str] = None
+        self.error: Optional[str] = None
+        self._ready = False
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def head(self) -> Optional[str]:
+        """Head revision of the migration scripts shipped with this code."""
+        return get_code_head()
+
+    def mark_ready(self) -> None:
+        """Open the gate (the schema was verified by the caller)."""
+        with self._lock:
+            self.db_revision = self.head
+            self.error = None
+            self._ready = True
+
+    def is_ready(self) -> bool:
+        """Return True once the database schema matches the code's head."""
+        if self._ready:
+            return True
+
+        with self._lock:
+            if self._ready or time.monotonic() - self._checked_at < self.check_interval:
+                return self._ready
+            self._checked_at = time.monotonic()
+            try:
+                self.db_revision = get_db_revision()
+                self.error = None
+            except Exception as e:
+                self.error = str(e)
+                return False
+            if self.db_revision == self.head:
+                self._ready = True
+                if self.head:
+                    cache_revision(self.head)
+            return self._ready
+
+
+# Global schema readiness gate
+schema_gate = SchemaGate()
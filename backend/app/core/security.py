@@ -1,17 +1,22 @@
 """
 Security utilities for JWT token management.
 """
+import hashlib
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from jose import JWTError, jwt
 
 from app.core.config import settings
+from app.core.keys import SUPPORTED_ALGORITHMS, key_store
 
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
 
+    With an asymmetric ALGORITHM the token is signed with the current key pair
+    and names it in the "kid" header; with HS256 it is signed with SECRET_KEY.
+
     Args:
         data: Data to encode in the token
         expires_delta: Optional custom expiration time
@@ -21,22 +26,33 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
     """
     to_encode = data.copy()
 
+    now = datetime.utcnow()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expire = now + expires_delta
     else:
-        expire = datetime.utcnow() + timedelta(
+        expire = now + timedelta(
             minutes=settings.access_token_expire_minutes
         )
 
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
-    return encoded_jwt
+    to_encode.update({"exp": expire, "iat": now, "iss": settings.jwt_issuer})
+    if settings.algorithm in SUPPORTED_ALGORITHMS:
+        key = key_store.signing_key()
+        return jwt.encode(
+            to_encode, key.signing_key, algorithm=key.algorithm, headers={"kid": key.kid}
+        )
+    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
 def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
     """
     Decode and verify a JWT access token.
 
+    Tokens with a "kid" header are verified with that public key (only with
+    the key's own algorithm); tokens without one with SECRET_KEY, if the
+    algorithm is symmetric or HS256 tokens are still accepted. Key pair tokens
+    must name JWT_ISSUER as issuer; SECRET_KEY tokens issued before the "iss"
+    claim was added have none, so only a present issuer is checked there.
+
     Args:
         token: JWT token string
 
@@ -44,9 +60,39 @@ def decode_access_token(token: str) -> Optional[Dict[str, Any]]:
         Decoded token data if valid, None if invalid
     """
     try:
-        payload = jwt.decode(
-            token, settings.secret_key, algorithms=[settings.algorithm]
-        )
+        kid = jwt.get_unverified_header(token).get("kid")
+        if kid:
+            key = key_store.verification_key(kid)
+            if key is None:
+                return None
+            return jwt.decode(
+                token, key.verify_key, algorithms=[key.algorithm], issuer=settings.jwt_issuer
+            )
+        if settings.algorithm not in SUPPORTED_ALGORITHMS:
+            algorithm = settings.algorithm
+        elif settings.jwt_accept_hs256:
+            algorithm = "HS256"
+        else:
+            return None
+        payload = jwt.decode(token, settings.secret_key, algorithms=[algorithm])
+        if payload.get("iss", settings.jwt_issuer) != settings.jwt_issuer:
+            return None
         return payload
     except JWTError:
         return None
+
+
+def hash_token(token: str) -> str:
+    """
+    Hash an opaque token (refresh token, email link token) for storage.
+
+    The tokens are long random strings, so a plain SHA-256 is enough: a
+    leaked table cannot be turned back into usable tokens.
+
+    Args:
+        token: Token as given to the client
+
+    Returns:
+        SHA-256 hex digest
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,163 @@
+"""
+Multi-process server mode.
+
+Runs the application under a Gunicorn master with Uvicorn workers. The app
+is imported (preloaded) in the master before forking so workers share its
+memory pages; workers are recycled after a number of requests or when their
+RSS grows past a limit, and drain in-flight requests on SIGTERM.
+"""
+import math
+import os
+import signal
+from typing import Any, Optional
+
+from gunicorn.app.base import BaseApplication
+from uvicorn.workers import UvicornWorker
+
+from app.core.config import settings
+from app.core.worker_stats import read_rss_bytes, worker_stats
+
+
+def available_cpus() -> int:
+    """
+    Count the CPUs this process may actually use.
+
+    Takes the CPU affinity mask and, when running in a container, the cgroup
+    CPU quota into account, so a 2 vCPU container on a 64 core host counts
+    as 2.
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return max(1, cpus)
+
+
+def worker_count() -> int:
+    """Number of worker processes (WEB_CONCURRENCY, or one per available CPU)."""
+    if settings.web_concurrency > 0:
+        return settings.web_concurrency
+    return available_cpus()
+
+
+class RecyclingUvicornWorker(UvicornWorker):
+    """
+    Uvicorn worker that recycles itself when its RSS exceeds a limit.
+
+    The RSS check piggybacks on the worker heartbeat. Recycling sends
+    SIGTERM to the worker itself, which drains in-flight requests like a
+    normal graceful shutdown; the master then forks a replacement.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.config.timeout_graceful_shutdown = self.cfg.graceful_timeout
+        self._recycling = False
+
+    async def callback_notify(self) -> None:
+        await super().callback_notify()
+
+        limit_mb = settings.worker_max_rss_mb
+        if not limit_mb or self._recycling:
+            return
+
+        rss = read_rss_bytes()
+        if rss > limit_mb * 1024 * 1024:
+            self._recycling = True
+            self.log.info(
+                f"Worker {self.pid} RSS {rss // (1024 * 1024)} MB exceeds "
+                f"{limit_mb} MB, recycling"
+            )
+            os.kill(self.pid, signal.SIGTERM)
+
+
+def post_fork(server, worker) -> None:
+    """Gunicorn hook: reset per-process state inherited from the master."""
+    from app.core.database import engine
+
+    # Connections opened in the master (e.g. the schema check) must not be
+    # shared with the children; drop them without closing the sockets.
+    engine.dispose(close=False)
+    worker_stats.reset()
+
+
+def worker_exit(server, worker) -> None:
+    """Gunicorn hook: report worker stats and close its DB connections."""
+    from app.core.database import engine
+
+    stats = worker_stats.snapshot()
+    server.log.info(
+        f"Worker {stats['pid']} exiting after {stats['requests_total']} requests "
+        f"({stats['uptime_seconds']}s, RSS {stats['rss_bytes'] // (1024 * 1024)} MB)"
+    )
+    engine.dispose()
+
+
+def child_exit(server, worker) -> None:
+    """Gunicorn hook (master): drop the live metric gauges of an exited worker."""
+    from app.core.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
+
+
+class MultiWorkerServer(BaseApplication):
+    """Gunicorn application serving a preloaded ASGI app."""
+
+    def __init__(self, app: Any, port: int, timer: Optional[Any] = None):
+        self.application = app
+        self.port = port
+        self.timer = timer
+        super().__init__()
+
+    def load_config(self) -> None:
+        options = {
+            "bind": f"0.0.0.0:{self.port}",
+            "workers": worker_count(),
+            "worker_class": "app.core.server.RecyclingUvicornWorker",
+            "preload_app": True,
+            "max_requests": settings.worker_max_requests,
+            "max_requests_jitter": settings.worker_max_requests_jitter,
+            "graceful_timeout": settings.worker_graceful_timeout,
+            "timeout": max(30, settings.worker_graceful_timeout),
+            "keepalive": 5,
+            "accesslog": "-",
+            "errorlog": "-",
+            "post_fork": post_fork,
+            "worker_exit": worker_exit,
+            "child_exit": child_exit,
+            "when_ready": self.when_ready,
+        }
+        for key, value in options.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Any:
+        return self.application
+
+    def when_ready(self, server) -> None:
+        """Gunicorn hook: the master is bound and about to fork workers."""
+        server.log.info(f"Starting {self.cfg.workers} workers")
+        if self.timer is not None:
+            self.timer.mark("bind")
+            server.log.info(self.timer.report())
+
+
+def run_multi_worker(app: Any, port: int, timer: Optional[Any] = None) -> None:
+    """
+    Serve app with multiple worker processes.
+
+    Args:
+        app: Preloaded ASGI application
+        port: Port to bind
+        timer: Optional StartupTimer to report once the master is bound
+    """
+    MultiWorkerServer(app, port, timer).run()
@@ -0,0 +1,67 @@
+"""
+Startup timing for the server entry point.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+import uvicorn
+
+# Reuse uvicorn's error logger so the report shows up with its configured handlers
+logger = logging.getLogger("uvicorn.error")
+
+
+class StartupTimer:
+    """Record the duration of each startup phase."""
+
+    def __init__(self, start: Optional[float] = None):
+        # start is a time.perf_counter() value taken as early as possible
+        self.start = start if start is not None else time.perf_counter()
+        self.phases: List[Tuple[str, float]] = []
+        self._last = self.start
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a block of startup work as a named phase."""
+        self.mark(None)
+        yield
+        self.mark(name)
+
+    def mark(self, name: Optional[str]) -> None:
+        """
+        Close the current phase.
+
+        Args:
+            name: Phase name, or None to discard the time since the last mark
+        """
+        now = time.perf_counter()
+        if name is not None:
+            self.phases.append((name, now - self._last))
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        """Seconds elapsed since the timer started."""
+        return self._last - self.start
+
+    def report(self) -> str:
+        """Format the per-phase breakdown."""
+        lines = [f"Startup completed in {self.total * 1000:.0f} ms"]
+        for name, duration in self.phases:
+            lines.append(f"  {name:<16} {duration * 1000:>8.1f} ms")
+        return "\n".join(lines)
+
+
+class TimedServer(uvicorn.Server):
+    """Uvicorn server that reports startup timing once it accepts connections."""
+
+    def __init__(self, config: uvicorn.Config, timer: StartupTimer):
+        super().__init__(config)
+        self.timer = timer
+
+    async def startup(self, sockets=None) -> None:
+        self.timer.mark("server_startup")
+        await super().startup(sockets=sockets)
+        self.timer.mark("bind")
+        logger.info(self.timer.report())
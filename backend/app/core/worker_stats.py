@@ -0,0 +1,48 @@
+"""
+Per-process resource and request statistics.
+
+Kept free of server imports so the application can report stats without
+loading Gunicorn in single-process mode.
+"""
+import os
+import resource
+import time
+from typing import Any, Dict
+
+
+def read_rss_bytes() -> int:
+    """Current resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Peak RSS; reported in kilobytes on Linux, bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class WorkerStats:
+    """Request counters for the current worker process."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        """Start counting from zero (called in each worker after fork)."""
+        self.pid = os.getpid()
+        self.started_at = time.time()
+        self.requests_total = 0
+        self.requests_in_flight = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current stats of this worker."""
+        return {
+            "pid": self.pid,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "requests_total": self.requests_total,
+            "requests_in_flight": self.requests_in_flight,
+            "rss_bytes": read_rss_bytes(),
+        }
+
+
+# Stats of the current process
+worker_stats = WorkerStats()
@@ -1,39 +1,105 @@
 """
 Main FastAPI application.
 """
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from slowapi.errors import RateLimitExceeded
-import sentry_sdk
-from sentry_sdk.integrations.fastapi import FastApiIntegration
 
+from app.core.breached_passwords import breached_passwords
+from app.core.ip_asn import ip_asn
 from app.core.config import settings
+from app.core.health import CachedProbe, readiness
+from app.core.monitoring import init_sentry
+from app.core.profiling import continuous_profiler
+from app.core.responses import DefaultResponse
+from app.core.revocation import revocation_sync_worker
+from app.api import health, jwks, metrics
 from app.api.v1.router import api_router
-from app.middleware.security import SecurityHeadersMiddleware, limiter, _rate_limit_exceeded_handler
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiling import ProfilingMiddleware
+from app.middleware.query_stats import QueryStatsMiddleware
+from app.middleware.security import SecurityHeadersMiddleware, limiter, rate_limit_exceeded_handler
+from app.middleware.worker_stats import WorkerStatsMiddleware
+from app.services.broadcast import broadcast_worker
+from app.services.email_outbox import check_email_outbox, email_outbox_worker
+from app.services.login_anomalies import login_anomaly_writer
+from app.services.smtp_pool import close_smtp_pool
+from app.services.token_sweeper import token_sweeper
 
 # Initialize Sentry for production error tracking
-if not settings.debug and settings.sentry_dsn:
-    sentry_sdk.init(
-        dsn=settings.sentry_dsn,
-        integrations=[FastApiIntegration()],
-        environment=settings.environment,
-        traces_sample_rate=0.1,
-    )
+# (in fast startup mode, the lifespan initializes it off the startup path)
+if settings.startup_mode != "fast":
+    init_sentry()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop per-worker background services."""
+    if settings.startup_mode == "fast":
+        # Not needed to serve the first request; initialized in the background
+        # in each worker process
+        threading.Thread(target=init_sentry, name="sentry-init", daemon=True).start()
+    if settings.profile_continuous:
+        continuous_profiler.start()
+    breached_passwords.load_configured()
+    ip_asn.load_configured()
+    revocation_sync_worker.start()
+    token_sweeper.start()
+    login_anomaly_writer.start()
+    if settings.email_outbox_worker_enabled:
+        email_outbox_worker.start()
+    if settings.broadcast_worker_enabled:
+        broadcast_worker.start()
+    yield
+    await broadcast_worker.stop()
+    await email_outbox_worker.stop()
+    await login_anomaly_writer.stop()
+    await token_sweeper.stop()
+    await revocation_sync_worker.stop()
+    await asyncio.to_thread(close_smtp_pool)
+    continuous_profiler.stop()
+
+
+# Report the undelivered email backlog on /health/ready
+readiness.register(
+    "email_outbox", CachedProbe(check_email_outbox, settings.health_db_probe_ttl_seconds)
+)
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     debug=settings.debug,
     version="1.0.0",
+    default_response_class=DefaultResponse,
+    lifespan=lifespan,
 )
 
 # Add rate limiting
 app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
 # Add security headers middleware
 app.add_middleware(SecurityHeadersMiddleware)
 
+# Count requests handled by this worker process
+app.add_middleware(WorkerStatsMiddleware)
+
+# Record per-route latency histograms
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# Count SQL statements per request (Server-Timing header, N+1 detection)
+if settings.query_stats_enabled:
+    app.add_middleware(QueryStatsMiddleware)
+
+# Store per-request profiles requested by admins
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -41,11 +107,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Profile-Id", "Server-Timing", "X-Broadcast-Id"],
 )
 
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+# Include JWKS route (public keys of the access token signing keys)
+app.include_router(jwks.router, tags=["Authentication"])
+
+# Include health check routes
+app.include_router(health.router, prefix="/health", tags=["Health"])
+
+# Include Prometheus metrics route
+if settings.metrics_enabled:
+    app.include_router(metrics.router, tags=["Monitoring"])
+
 
 @app.get("/")
 def root():
@@ -55,9 +132,3 @@ def root():
         "version": "1.0.0",
         "docs": "/docs",
     }
-
-
-@app.get("/health")
-def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy"}
@@ -1,6 +1,17 @@
 """
 Middleware package.
 """
+from .metrics import MetricsMiddleware
+from .profiling import ProfilingMiddleware
+from .query_stats import QueryStatsMiddleware
 from .security import SecurityHeadersMiddleware, limiter
+from .worker_stats import WorkerStatsMiddleware
 
-__all__ = ["SecurityHeadersMiddleware", "limiter"]
+__all__ = [
+    "MetricsMiddleware",
+    "ProfilingMiddleware",
+    "QueryStatsMiddleware",
+    "SecurityHeadersMiddleware",
+    "WorkerStatsMiddleware",
+    "limiter",
+]
@@ -0,0 +1,47 @@
+"""
+Per-route request metrics.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import (
+    http_request_duration_seconds,
+    http_requests_in_flight,
+    route_label,
+    update_resource_gauges,
+)
+
+
+class MetricsMiddleware:
+    """Record latency by method, route template and status, and in-flight requests."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            http_request_duration_seconds.labels(
+                method=scope["method"],
+                route=route_label(scope),
+                status=str(status_code),
+            ).observe(time.perf_counter() - start)
+            # Keep per-worker gauges fresh even on workers that never serve /metrics
+            update_resource_gauges()
@@ -0,0 +1,45 @@
+"""
+Per-request profile collection.
+"""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.profiling import save_request_profile
+
+
+class ProfilingMiddleware:
+    """
+    Finish per-request profiles started by the profile_request dependency.
+
+    The sampler is stopped when the response starts, and the stored
+    profile's id is returned in the X-Profile-Id header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        def take_profiler():
+            return scope.get("state", {}).pop("profiler", None)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profiler = take_profiler()
+                if profiler is not None:
+                    profile_id = save_request_profile(profiler)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"x-profile-id", profile_id.encode("latin-1")),
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The request failed before a response was started
+            profiler = take_profiler()
+            if profiler is not None:
+                profiler.stop()
@@ -0,0 +1,64 @@
+"""
+Per-request SQL query statistics.
+"""
+import logging
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import db_n_plus_one_total, db_queries_per_request, route_label
+from app.core.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStatsMiddleware:
+    """
+    Count the SQL statements and DB time of each request.
+
+    Adds a Server-Timing header ("db;dur=<ms>;desc=\"<n> queries\""), records
+    the query count per route, and logs statements repeated often enough in
+    one request to look like an N+1 pattern.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.total_seconds * 1000:.1f};desc="{stats.count} queries"'
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_query_stats.reset(token)
+            self.report(scope, stats)
+
+    @staticmethod
+    def report(scope: Scope, stats: QueryStats) -> None:
+        """Record the request's query count and flag repeated statements."""
+        route = route_label(scope)
+        db_queries_per_request.labels(route=route).observe(stats.count)
+
+        repeated = stats.repeated(settings.db_n_plus_one_threshold)
+        if not repeated:
+            return
+        db_n_plus_one_total.labels(route=route).inc()
+        for statement, count in repeated:
+            logger.warning(
+                f"Possible N+1 in {scope['method']} {route}: statement executed "
+                f"{count} times: {' '.join(statement.split())[:500]}"
+            )
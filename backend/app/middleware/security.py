@@ -4,8 +4,11 @@ Security middleware for rate limiting and security headers.
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 from slowapi import Limiter, _rate_limit_exceeded_handler
+from slowapi.errors import RateLimitExceeded
 from slowapi.util import get_remote_address
 
+from app.core.metrics import rate_limit_rejections_total
+
 # Rate limiter: 100 requests per minute per IP
 limiter = Limiter(key_func=get_remote_address, default_limits=["100/minute"])
 
@@ -23,3 +26,9 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
 
         return response
+
+
+def rate_limit_exceeded_handler(request: Request, exc: RateLimitExceeded):
+    """Count the rejection, then respond like slowapi's default handler."""
+    rate_limit_rejections_total.labels(limiter="global").inc()
+    return _rate_limit_exceeded_handler(request, exc)
@@ -0,0 +1,25 @@
+"""
+Per-worker request counters.
+"""
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.worker_stats import worker_stats
+
+
+class WorkerStatsMiddleware:
+    """Count total and in-flight HTTP requests for the current worker process."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        worker_stats.requests_total += 1
+        worker_stats.requests_in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            worker_stats.requests_in_flight -= 1
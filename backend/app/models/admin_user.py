@@ -3,10 +3,9 @@ AdminUser database model.
 """
 from sqlalchemy import Column, ForeignKey, DateTime
 from sqlalchemy.sql import func
-import uuid
 
 from app.core.database import Base
-from app.models.user import GUID
+from app.models.user import GUID, uuid7
 
 
 class AdminUser(Base):
@@ -14,7 +13,7 @@ class AdminUser(Base):
 
     __tablename__ = "admin_users"
 
-    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = Column(GUID, primary_key=True, default=uuid7)
     user_id = Column(
         GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
@@ -0,0 +1,37 @@
+"""
+BroadcastJob database model.
+"""
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+from app.models.user import GUID
+
+
+class BroadcastJob(Base):
+    """Email sent to every user, delivered in checkpointed chunks by the broadcast worker."""
+
+    __tablename__ = "broadcast_jobs"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    template = Column(String, nullable=False)  # Email template name
+    context = Column(Text, nullable=False, default="{}")  # JSON template variables shared by all recipients
+    status = Column(String, default="pending", nullable=False, index=True)  # "pending", "running", "paused", "completed", "cancelled"
+    total_recipients = Column(Integer, default=0, nullable=False)
+    processed_count = Column(Integer, default=0, nullable=False)
+    sent_count = Column(Integer, default=0, nullable=False)
+    deferred_count = Column(Integer, default=0, nullable=False)  # Handed to the email outbox for retry
+    last_user_id = Column(GUID, nullable=True)  # Checkpoint: recipients are processed in users.id order
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease of the worker running it
+    active_seconds = Column(Float, default=0.0, nullable=False)  # Time spent delivering (for throughput)
+    last_error = Column(Text, nullable=True)
+    created_by_user_id = Column(
+        GUID, ForeignKey("users.id", ondelete="SET NULL"), nullable=True
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self):
+        return f"<BroadcastJob(template={self.template}, status={self.status}, processed={self.processed_count}/{self.total_recipients})>"
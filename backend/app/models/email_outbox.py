@@ -0,0 +1,36 @@
+"""
+EmailOutbox database model.
+"""
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+from app.models.user import GUID
+
+
+class EmailOutbox(Base):
+    """Queued outgoing email, delivered by the outbox worker."""
+
+    __tablename__ = "email_outbox"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)  # Plain-text part
+    html_body = Column(Text, nullable=True)  # Optional HTML alternative
+    kind = Column(String, nullable=True)  # "verification", "password_reset"
+    status = Column(String, default="pending", nullable=False)  # "pending", "sending", "sent", "failed"
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(DateTime(timezone=True), nullable=True)  # Lease of the worker sending it
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<EmailOutbox(to_email={self.to_email}, status={self.status}, attempts={self.attempts})>"
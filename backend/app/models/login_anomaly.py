@@ -0,0 +1,29 @@
+"""
+LoginAnomaly database model.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+from app.models.user import GUID
+
+
+class LoginAnomaly(Base):
+    """Login flagged by the streaming anomaly detector."""
+
+    __tablename__ = "login_anomalies"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    kind = Column(String(32), nullable=False)  # ip_many_accounts, login_frequency, user_many_ips
+    user_id = Column(
+        GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    ip_address = Column(String, nullable=True)
+    observed = Column(Integer, nullable=False)  # Count in the window that crossed the threshold
+    detected_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+    def __repr__(self):
+        return f"<LoginAnomaly(kind={self.kind}, user_id={self.user_id}, ip_address={self.ip_address})>"
@@ -1,12 +1,11 @@
 """
 LoginHistory database model.
 """
-from sqlalchemy import Column, ForeignKey, DateTime, String
+from sqlalchemy import Column, ForeignKey, DateTime, Index, String
 from sqlalchemy.sql import func
-import uuid
 
 from app.core.database import Base
-from app.models.user import GUID
+from app.models.user import GUID, uuid7
 
 
 class LoginHistory(Base):
@@ -14,14 +13,18 @@ class LoginHistory(Base):
 
     __tablename__ = "login_history"
 
-    id = Column(GUID, primary_key=True, default=uuid.uuid4)
-    user_id = Column(
-        GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
-    )
+    id = Column(GUID, primary_key=True, default=uuid7)
+    user_id = Column(GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     logged_in_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
     )
     ip_address = Column(String, nullable=True)
 
+    # Newest-first pages of one user's or one IP's logins are a single index range scan
+    __table_args__ = (
+        Index("ix_login_history_user_id_logged_in_at", user_id, logged_in_at.desc(), id.desc()),
+        Index("ix_login_history_ip_address_logged_in_at", ip_address, logged_in_at.desc(), id.desc()),
+    )
+
     def __repr__(self):
         return f"<LoginHistory(user_id={self.user_id}, logged_in_at={self.logged_in_at})>"
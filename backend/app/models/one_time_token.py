@@ -0,0 +1,25 @@
+"""
+OneTimeToken database model.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+from app.models.user import GUID
+
+
+class OneTimeToken(Base):
+    """Single-use token sent by email (verification and password reset links)."""
+
+    __tablename__ = "one_time_tokens"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    token_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 hex; the token itself is never stored
+    purpose = Column(String, nullable=False)  # "email_verification", "password_reset"
+    user_id = Column(GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<OneTimeToken(purpose={self.purpose}, user_id={self.user_id}, expires_at={self.expires_at})>"
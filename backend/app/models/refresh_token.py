@@ -0,0 +1,30 @@
+"""
+RefreshToken database model.
+"""
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.sql import func
+import uuid
+
+from app.core.database import Base
+from app.models.user import GUID
+
+
+class RefreshToken(Base):
+    """Single-use refresh token; each use replaces it with a new one in the same family."""
+
+    __tablename__ = "refresh_tokens"
+
+    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    user_id = Column(GUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    token_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 hex of the token
+    family_id = Column(GUID, nullable=False, index=True)  # One login session ("sid" claim)
+    access_jti = Column(String(32), nullable=True)  # Access token issued together with it
+    access_expires_at = Column(DateTime(timezone=True), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    used_at = Column(DateTime(timezone=True), nullable=True)  # Exchanged for a new token
+    reused_at = Column(DateTime(timezone=True), nullable=True)  # Exchanged once more by a concurrent refresh
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    def __repr__(self):
+        return f"<RefreshToken(user_id={self.user_id}, family_id={self.family_id}, used={self.used_at is not None})>"
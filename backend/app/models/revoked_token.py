@@ -0,0 +1,20 @@
+"""
+RevokedToken database model.
+"""
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class RevokedToken(Base):
+    """Access token (by jti) rejected until it expires."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)  # Row can go once the token expired
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)  # Sync cursor
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti}, expires_at={self.expires_at})>"
@@ -0,0 +1,23 @@
+"""
+SigningKey database model.
+"""
+from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class SigningKey(Base):
+    """Key pair for signing access tokens; the public half is published in the JWKS."""
+
+    __tablename__ = "signing_keys"
+
+    kid = Column(String(32), primary_key=True)  # "kid" header of tokens signed with this key
+    algorithm = Column(String, nullable=False)  # "RS256" or "ES256"
+    private_key = Column(Text, nullable=False)  # PEM, encrypted with a key derived from SECRET_KEY
+    public_jwk = Column(Text, nullable=False)  # JSON public JWK
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    not_before = Column(DateTime(timezone=True), nullable=False, index=True)  # Signs tokens from this time
+
+    def __repr__(self):
+        return f"<SigningKey(kid={self.kid}, algorithm={self.algorithm}, not_before={self.not_before})>"
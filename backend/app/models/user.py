@@ -4,16 +4,54 @@ User database model.
 from sqlalchemy import Column, String, Boolean, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
-from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy.types import TypeDecorator, CHAR, LargeBinary
+import os
+import threading
+import time
 import uuid
 
 from app.core.database import Base
 
+_uuid7_lock = threading.Lock()
+_uuid7_last = 0
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (version 7, RFC 9562).
+
+    The first 48 bits are the Unix time in milliseconds and the next 12 bits
+    a fraction of the millisecond, so keys generated later sort later and
+    inserts land at the right edge of the primary key index instead of a
+    random page. Within a process the 60-bit timestamp is strictly
+    increasing; the remaining 62 bits are random.
+    """
+    global _uuid7_last
+    nanoseconds = time.time_ns()
+    timestamp = (nanoseconds // 1_000_000) << 12 | (nanoseconds % 1_000_000) * 4096 // 1_000_000
+    with _uuid7_lock:
+        if timestamp <= _uuid7_last:
+            timestamp = _uuid7_last + 1
+        _uuid7_last = timestamp
+    random_bits = int.from_bytes(os.urandom(8), "big") & 0x3FFF_FFFF_FFFF_FFFF
+    value = (
+        (timestamp >> 12) << 80
+        | 0x7 << 76
+        | (timestamp & 0xFFF) << 64
+        | 0b10 << 62
+        | random_bits
+    )
+    return uuid.UUID(int=value)
+
 
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
 
-    Uses PostgreSQL's UUID type, otherwise uses CHAR(36), storing as stringified hex values.
+    Uses PostgreSQL's UUID type, the 16 raw bytes as a BLOB on SQLite, and
+    CHAR(36) stringified hex values elsewhere. Migrations before
+    f4a2c8d61b3e created CHAR(36) columns on every database; that migration
+    converts them on SQLite and PostgreSQL only. Both byte and text order
+    match UUID order, so ORDER BY and range comparisons on these columns
+    agree across databases.
     """
 
     impl = CHAR
@@ -22,6 +60,8 @@ class GUID(TypeDecorator):
     def load_dialect_impl(self, dialect):
         if dialect.name == "postgresql":
             return dialect.type_descriptor(UUID(as_uuid=True))
+        elif dialect.name == "sqlite":
+            return dialect.type_descriptor(LargeBinary())
         else:
             return dialect.type_descriptor(CHAR(36))
 
@@ -30,18 +70,21 @@ class GUID(TypeDecorator):
             return value
         elif dialect.name == "postgresql":
             return value
-        else:
-            if isinstance(value, uuid.UUID):
-                return str(value)
-            return str(uuid.UUID(value))
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(value)
+        if dialect.name == "sqlite":
+            return value.bytes
+        return str(value)
 
     def process_result_value(self, value, dialect):
         if value is None:
             return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        elif isinstance(value, uuid.UUID):
             return value
+        elif isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        else:
+            return uuid.UUID(value)
 
 
 class User(Base):
@@ -49,16 +92,13 @@ class User(Base):
 
     __tablename__ = "users"
 
-    id = Column(GUID, primary_key=True, default=uuid.uuid4)
+    id = Column(GUID, primary_key=True, default=uuid7)
     email = Column(String, unique=True, nullable=False, index=True)
     name = Column(String, nullable=False)
     google_id = Column(String, unique=True, nullable=True, index=True)  # Now nullable for email auth
     hashed_password = Column(String, nullable=True)  # For email/password authentication
     auth_provider = Column(String, default="email", nullable=False)  # "email", "google", "both"
     email_verified = Column(Boolean, default=False, nullable=False)  # Email verification status
-    email_verification_token = Column(String, nullable=True)  # Token for email verification
-    password_reset_token = Column(String, nullable=True)  # Token for password reset
-    password_reset_expires = Column(DateTime(timezone=True), nullable=True)  # Reset token expiration
     is_admin = Column(Boolean, default=False, nullable=False)
     terms_accepted = Column(Boolean, default=False, nullable=False)  # Terms of service acceptance
     terms_accepted_at = Column(DateTime(timezone=True), nullable=True)  # Terms acceptance timestamp
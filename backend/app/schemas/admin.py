@@ -3,7 +3,8 @@ Pydantic schemas for admin endpoints.
 """
 from datetime import datetime, date
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, UUID4, Field
+from uuid import UUID
+from pydantic import BaseModel, Field
 
 
 # Usage Stats Schemas
@@ -29,6 +30,28 @@ class UsageSummaryResponse(BaseModel):
     total_logins_today: int
 
 
+class LoginAnomalyResponse(BaseModel):
+    """Response schema for a login flagged by the anomaly detector."""
+
+    id: UUID
+    kind: str  # "ip_many_accounts", "login_frequency", "user_many_ips"
+    user_id: UUID
+    email: str
+    ip_address: Optional[str] = None
+    observed: int
+    detected_at: datetime
+
+
+class LoginNetworkResponse(BaseModel):
+    """Response schema for login attempts from one network."""
+
+    prefix: str  # e.g. "203.0.113.0/24"
+    logins: int
+    failures: int
+    asn: Optional[int] = None
+    as_name: Optional[str] = None
+
+
 # System Settings Schemas
 class SystemSettingsResponse(BaseModel):
     """Response schema for system settings."""
@@ -59,6 +82,7 @@ class AuthSettingsResponse(BaseModel):
     password_require_lowercase: bool
     password_require_number: bool
     password_require_special: bool
+    password_check_breached: bool = False
 
 
 class AuthSettingsUpdateRequest(BaseModel):
@@ -71,13 +95,70 @@ class AuthSettingsUpdateRequest(BaseModel):
     password_require_lowercase: Optional[bool] = True
     password_require_number: Optional[bool] = True
     password_require_special: Optional[bool] = False
+    password_check_breached: Optional[bool] = False
+
+
+# Email Template Schemas
+class EmailTemplateResponse(BaseModel):
+    """Response schema for an email template (override or default sources)."""
+
+    name: str
+    variables: List[str]
+    subject: str
+    text: str
+    html: str
+    overridden: bool
+    updated_at: Optional[datetime] = None
+
+
+class EmailTemplateUpdateRequest(BaseModel):
+    """Request schema for overriding an email template (omitted parts use the default)."""
+
+    subject: Optional[str] = None
+    text: Optional[str] = None
+    html: Optional[str] = None
+
+
+class EmailTemplatePreviewResponse(BaseModel):
+    """Response schema for a template rendered with sample values."""
+
+    subject: str
+    text: str
+    html: str
+
+
+# Broadcast Schemas
+class BroadcastCreateRequest(BaseModel):
+    """Request schema for starting a broadcast to all users."""
+
+    template: str
+    context: Dict[str, str] = Field(default_factory=dict)  # Variables shared by all recipients
+
+
+class BroadcastJobResponse(BaseModel):
+    """Response schema for a broadcast job and its progress."""
+
+    id: UUID
+    template: str
+    status: str  # "pending", "running", "paused", "completed", "cancelled"
+    total_recipients: int
+    processed_count: int
+    sent_count: int
+    deferred_count: int
+    percent: float
+    throughput_per_second: float
+    eta_seconds: Optional[int] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
 
 
 # User Management Schemas
 class UserListItem(BaseModel):
     """Response schema for user list item."""
 
-    id: UUID4
+    id: UUID
     email: str
     name: str
     is_admin: bool
@@ -102,8 +183,8 @@ class UserListResponse(BaseModel):
 class AdminUserResponse(BaseModel):
     """Response schema for admin user."""
 
-    id: UUID4
-    user_id: UUID4
+    id: UUID
+    user_id: UUID
     email: str
     name: str
     added_at: datetime
@@ -121,8 +202,9 @@ class AdminUserAddRequest(BaseModel):
 class LoginHistoryResponse(BaseModel):
     """Response schema for login history."""
 
-    id: UUID4
-    user_id: UUID4
+    id: UUID
+    user_id: UUID
+    email: Optional[str] = None
     logged_in_at: datetime
     ip_address: Optional[str] = None
 
@@ -130,11 +212,18 @@ class LoginHistoryResponse(BaseModel):
         from_attributes = True
 
 
+class LoginHistoryListResponse(BaseModel):
+    """Response schema for a keyset page of login history."""
+
+    logins: List[LoginHistoryResponse]
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
+
+
 # User Detail Schemas (for Phase 11 simplified version)
 class UserDetailResponse(BaseModel):
     """Response schema for user detail with plan and status."""
 
-    id: UUID4
+    id: UUID
     email: str
     name: str
     is_admin: bool
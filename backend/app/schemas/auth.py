@@ -3,7 +3,8 @@ Pydantic schemas for authentication endpoints.
 """
 from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, EmailStr, UUID4, Field, validator
+from uuid import UUID
+from pydantic import BaseModel, EmailStr, Field, validator
 
 
 class GoogleLoginRequest(BaseModel):
@@ -66,6 +67,18 @@ class ChangePasswordRequest(BaseModel):
     new_password: str = Field(..., min_length=8)
 
 
+class RefreshTokenRequest(BaseModel):
+    """Request schema for exchanging a refresh token."""
+
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Request schema for logout (the refresh token identifies the session)."""
+
+    refresh_token: Optional[str] = None
+
+
 class AuthSettingsResponse(BaseModel):
     """Response schema for authentication settings."""
 
@@ -77,7 +90,7 @@ class AuthSettingsResponse(BaseModel):
 class UserResponse(BaseModel):
     """Response schema for user data."""
 
-    id: UUID4
+    id: UUID
     email: EmailStr
     name: str
     google_id: Optional[str] = None  # Now nullable
@@ -97,7 +110,9 @@ class TokenResponse(BaseModel):
     """Response schema for authentication token."""
 
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
+    expires_in: int  # Access token lifetime in seconds
     user: UserResponse
 
 
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import SessionLocal
-from app.models.user import User
+from app.models.user import User, uuid7
 from app.models.admin_user import AdminUser
 
 
@@ -55,7 +55,7 @@ def create_test_admin(db: Session) -> None:
             print("User exists but is not an admin. Promoting to admin...")
             existing_user.is_admin = True
             admin_user = AdminUser(
-                id=uuid.uuid4(),
+                id=uuid7(),
                 user_id=existing_user.id,
                 added_by_user_id=None,  # No creator for initial setup
             )
@@ -66,7 +66,7 @@ def create_test_admin(db: Session) -> None:
 
     # Create new test admin user
     test_user = User(
-        id=uuid.uuid4(),
+        id=uuid7(),
         email=test_email,
         name="Test Admin",
         google_id=f"test-google-id-{uuid.uuid4()}",
@@ -78,7 +78,7 @@ def create_test_admin(db: Session) -> None:
 
     # Create admin user record
     admin_user = AdminUser(
-        id=uuid.uuid4(),
+        id=uuid7(),
         user_id=test_user.id,
         added_by_user_id=None,  # No creator for initial setup
     )
@@ -119,7 +119,7 @@ def add_admin_user_by_email(db: Session, email: str) -> None:
     # Promote user to admin
     user.is_admin = True
     admin_user = AdminUser(
-        id=uuid.uuid4(),
+        id=uuid7(),
         user_id=user.id,
         added_by_user_id=None,  # No creator for initial setup
     )
@@ -0,0 +1,67 @@
+"""
+Database migration job.
+
+Upgrades the database to the migration head under a cross-process lock
+(a PostgreSQL advisory lock, or a file lock for SQLite), so it is safe to
+run from several deploy jobs or instances at once. Run it before rolling
+out a new revision of the API; instances report not ready on /health/ready
+until the schema matches their code.
+
+Usage:
+    python -m app.scripts.migrate
+    python -m app.scripts.migrate --check
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from app.core.schema import get_code_head, get_db_revision, migrate
+
+
+def main() -> int:
+    """Run the migration job and return the process exit code."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Upgrade the database schema to head")
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report whether the schema is at head (exit code 1 if not)",
+    )
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds to wait for the migration lock (default: 300)",
+    )
+    args = parser.parse_args()
+
+    head = get_code_head()
+    db_revision = get_db_revision()
+    print(f"Code head:   {head}")
+    print(f"DB revision: {db_revision}")
+
+    if args.check:
+        if db_revision == head:
+            print("Schema is up to date")
+            return 0
+        print("Schema is behind the code")
+        return 1
+
+    try:
+        status = migrate(timeout=args.lock_timeout)
+    except Exception as e:
+        print(f"ERROR: Migration failed: {e}", file=sys.stderr)
+        return 1
+
+    if status == "migrated":
+        print(f"Database upgraded to {head}")
+    else:
+        print("Schema is up to date, nothing to do")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
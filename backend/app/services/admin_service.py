@@ -3,18 +3,41 @@ Admin service for managing system settings, statistics, and users.
 """
 from datetime import datetime, date, timedelta
 from zoneinfo import ZoneInfo
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from typing import List, Optional, Dict, Any, Tuple
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import func, desc, or_
 from fastapi import HTTPException, status
+import base64
 import uuid
 import json
 
-from app.models.user import User
+from app.core.database import naive_utc
+from app.models.user import User, uuid7
 from app.models.admin_user import AdminUser
 from app.models.system_settings import SystemSettings
 from app.models.usage_stats import UsageStats
+from app.models.login_anomaly import LoginAnomaly
 from app.models.login_history import LoginHistory
+from app.services.login_anomalies import login_anomaly_detector
+from app.services.login_networks import login_networks
+from app.services.session_service import session_service
+
+
+def _encode_login_cursor(logged_in_at: datetime, login_id: uuid.UUID) -> str:
+    raw = f"{naive_utc(logged_in_at).isoformat()}|{login_id.hex}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_login_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        logged_in_at, login_id = raw.split("|")
+        return datetime.fromisoformat(logged_in_at), uuid.UUID(login_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
 
 
 class AdminService:
@@ -35,6 +58,7 @@ class AdminService:
         "password_require_lowercase": True,
         "password_require_number": True,
         "password_require_special": False,
+        "password_check_breached": False,
     }
 
     @staticmethod
@@ -119,6 +143,110 @@ class AdminService:
             "pages": pages,
         }
 
+    @staticmethod
+    def get_login_anomalies(db: Session, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Get the most recent flagged logins.
+
+        Args:
+            db: Database session
+            limit: Maximum number of entries
+
+        Returns:
+            List of flagged logins with the user's email, newest first
+        """
+        rows = (
+            db.query(LoginAnomaly, User.email)
+            .join(User, User.id == LoginAnomaly.user_id)
+            .order_by(desc(LoginAnomaly.detected_at))
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "id": anomaly.id,
+                "kind": anomaly.kind,
+                "user_id": anomaly.user_id,
+                "email": email,
+                "ip_address": anomaly.ip_address,
+                "observed": anomaly.observed,
+                "detected_at": anomaly.detected_at,
+            }
+            for anomaly, email in rows
+        ]
+
+    @staticmethod
+    def get_login_history(
+        db: Session,
+        user_id: Optional[uuid.UUID] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        ip_address: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        Get login history newest first, one keyset page at a time.
+
+        Pages continue from the last row of the previous page (the cursor)
+        instead of skipping rows with OFFSET, so every page is a bounded range
+        scan of the (user_id or ip_address, logged_in_at DESC, id DESC)
+        indexes no matter how deep it is.
+
+        Args:
+            db: Database session
+            user_id: Only this user's logins
+            since: Only logins at or after this time (UTC)
+            until: Only logins before this time (UTC)
+            ip_address: Only logins from this IP
+            cursor: next_cursor of the previous page
+            limit: Page size
+
+        Returns:
+            Dictionary with the logins (with the user's email) and next_cursor (None on the last page)
+
+        Raises:
+            HTTPException: If the cursor is malformed
+        """
+        query = db.query(LoginHistory, User.email).join(User, User.id == LoginHistory.user_id)
+        if user_id is not None:
+            query = query.filter(LoginHistory.user_id == user_id)
+        if ip_address:
+            query = query.filter(LoginHistory.ip_address == ip_address)
+        if since is not None:
+            query = query.filter(LoginHistory.logged_in_at >= naive_utc(since))
+        if until is not None:
+            query = query.filter(LoginHistory.logged_in_at < naive_utc(until))
+        if cursor:
+            after_at, after_id = _decode_login_cursor(cursor)
+            query = query.filter(
+                LoginHistory.logged_in_at <= after_at,
+                or_(LoginHistory.logged_in_at < after_at, LoginHistory.id < after_id),
+            )
+
+        rows = (
+            query.order_by(desc(LoginHistory.logged_in_at), desc(LoginHistory.id))
+            .limit(limit + 1)
+            .all()
+        )
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        logins = [
+            {
+                "id": login.id,
+                "user_id": login.user_id,
+                "email": email,
+                "logged_in_at": login.logged_in_at,
+                "ip_address": login.ip_address,
+            }
+            for login, email in rows
+        ]
+        next_cursor = None
+        if has_more:
+            last = rows[-1][0]
+            next_cursor = _encode_login_cursor(last.logged_in_at, last.id)
+        return {"logins": logins, "next_cursor": next_cursor}
+
     @staticmethod
     def get_system_setting(db: Session, key: str) -> Optional[SystemSettings]:
         """
@@ -182,17 +310,16 @@ class AdminService:
         Returns:
             List of admin user dictionaries
         """
+        added_by = aliased(User)
         admin_users = (
-            db.query(AdminUser, User)
+            db.query(AdminUser, User, added_by.email)
             .join(User, AdminUser.user_id == User.id)
+            .outerjoin(added_by, AdminUser.added_by_user_id == added_by.id)
             .all()
         )
 
         result = []
-        for admin_user, user in admin_users:
-            added_by_user = None
-            if admin_user.added_by_user_id:
-                added_by_user = db.query(User).filter(User.id == admin_user.added_by_user_id).first()
+        for admin_user, user, added_by_email in admin_users:
 
             # Convert UTC to JST
             jst_added_at = admin_user.added_at.replace(tzinfo=ZoneInfo("UTC")).astimezone(ZoneInfo("Asia/Tokyo"))
@@ -203,7 +330,7 @@ class AdminService:
                 "email": user.email,
                 "name": user.name,
                 "added_at": jst_added_at,
-                "added_by_email": added_by_user.email if added_by_user else None,
+                "added_by_email": added_by_email,
             })
 
         return result
@@ -244,7 +371,7 @@ class AdminService:
 
         # Create admin_user record
         admin_user = AdminUser(
-            id=uuid.uuid4(),
+            id=uuid7(),
             user_id=user.id,
             added_by_user_id=added_by_user_id,
         )
@@ -252,6 +379,9 @@ class AdminService:
         db.commit()
         db.refresh(admin_user)
 
+        # Current access tokens say "not admin"; the next refresh picks up the change
+        session_service.revoke_access_tokens(db, user.id)
+
         added_by_user = db.query(User).filter(User.id == added_by_user_id).first()
 
         # Convert UTC to JST
@@ -294,6 +424,9 @@ class AdminService:
         db.delete(admin_user)
         db.commit()
 
+        # Demotion takes effect immediately, not when the access tokens expire
+        session_service.revoke_access_tokens(db, admin_user.user_id)
+
     @staticmethod
     def get_setting(db: Session, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -350,14 +483,19 @@ class AdminService:
         Returns:
             LoginHistory object
         """
+        # Timestamp set here (not by the server default) so no refresh query is needed
         login_history = LoginHistory(
-            id=uuid.uuid4(),
+            id=uuid7(),
             user_id=user_id,
             ip_address=ip_address,
+            logged_in_at=datetime.utcnow(),
         )
         db.add(login_history)
         db.commit()
-        db.refresh(login_history)
+
+        # In-memory only: flagged logins are stored later by the writer task
+        login_anomaly_detector.observe(user_id, ip_address)
+        login_networks.observe(ip_address)
         return login_history
 
 
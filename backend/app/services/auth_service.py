@@ -2,15 +2,21 @@
 Authentication service for Google OAuth and email/password authentication.
 """
 from typing import Optional, Dict, Any, Tuple
-from datetime import datetime, timedelta
-import secrets
+import logging
 import re
+import uuid
 import bcrypt
-from google.oauth2 import id_token
-from google.auth.transport import requests
 from fastapi import HTTPException, status
+from jose import JWTError, jwt
 
+from app.core.bcrypt_cost import hash_rounds
+from app.core.breached_passwords import breached_passwords
 from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import observe_duration, password_hash_duration_seconds
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
 
 
 class AuthService:
@@ -30,16 +36,24 @@ class AuthService:
         Raises:
             HTTPException: If token is invalid
         """
+        # Imported lazily: requests is only needed for Google logins
+        from app.core.google_certs import GOOGLE_ISSUERS, google_certs
+
         try:
-            # Verify the token
-            idinfo = id_token.verify_oauth2_token(
-                token, requests.Request(), settings.google_client_id
+            # Verify the signature with Google's cached keys, then audience, issuer and expiry
+            kid = jwt.get_unverified_header(token).get("kid")
+            key = google_certs.key(kid)
+            if key is None:
+                raise ValueError("Unknown signing key")
+            idinfo = jwt.decode(
+                token,
+                key,
+                algorithms=["RS256"],
+                audience=settings.google_client_id,
+                issuer=GOOGLE_ISSUERS,
+                options={"verify_at_hash": False},
             )
 
-            # Verify issuer
-            if idinfo["iss"] not in ["accounts.google.com", "https://accounts.google.com"]:
-                raise ValueError("Wrong issuer")
-
             # Extract user information
             return {
                 "google_id": idinfo["sub"],
@@ -47,7 +61,7 @@ class AuthService:
                 "name": idinfo.get("name", ""),
             }
 
-        except ValueError as e:
+        except (JWTError, ValueError) as e:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail=f"Invalid Google token: {str(e)}",
@@ -72,8 +86,9 @@ class AuthService:
         """
         # Encode password to bytes and hash with bcrypt
         password_bytes = password.encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password_bytes, salt)
+        salt = bcrypt.gensalt(rounds=settings.bcrypt_rounds)
+        with observe_duration(password_hash_duration_seconds, operation="hash"):
+            hashed = bcrypt.hashpw(password_bytes, salt)
         return hashed.decode('utf-8')
 
     @staticmethod
@@ -91,7 +106,53 @@ class AuthService:
         # Encode both the plain password and hashed password to bytes
         password_bytes = plain_password.encode('utf-8')
         hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        with observe_duration(password_hash_duration_seconds, operation="verify"):
+            return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+    @staticmethod
+    def needs_rehash(hashed_password: str) -> bool:
+        """
+        Whether a hash was made with a cost factor other than BCRYPT_ROUNDS.
+
+        Args:
+            hashed_password: Stored bcrypt hash
+
+        Returns:
+            True if the hash should be replaced on the next successful login
+        """
+        return hash_rounds(hashed_password) != settings.bcrypt_rounds
+
+    @staticmethod
+    def rehash_password(user_id: uuid.UUID, password: str, old_hash: str) -> bool:
+        """
+        Replace a user's password hash with one at the current cost factor.
+
+        Runs after the login response (it costs a full hash); the update only
+        applies while the stored hash is still old_hash, so a password change
+        made in the meantime is never overwritten.
+
+        Args:
+            user_id: User who just logged in
+            password: The verified plain text password
+            old_hash: Hash the password was verified against
+
+        Returns:
+            True if the hash was replaced
+        """
+        new_hash = AuthService.hash_password(password)
+        db = SessionLocal()
+        try:
+            updated = (
+                db.query(User)
+                .filter(User.id == user_id, User.hashed_password == old_hash)
+                .update({User.hashed_password: new_hash}, synchronize_session=False)
+            )
+            db.commit()
+        finally:
+            db.close()
+        if updated:
+            logger.info(f"Rehashed password of user {user_id} with cost {settings.bcrypt_rounds}")
+        return bool(updated)
 
     @staticmethod
     def validate_password_strength(password: str, settings_dict: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
@@ -111,6 +172,7 @@ class AuthService:
         require_lowercase = True
         require_number = True
         require_special = False
+        check_breached = False
 
         # Apply custom settings if provided
         if settings_dict:
@@ -119,6 +181,7 @@ class AuthService:
             require_lowercase = settings_dict.get("password_require_lowercase", require_lowercase)
             require_number = settings_dict.get("password_require_number", require_number)
             require_special = settings_dict.get("password_require_special", require_special)
+            check_breached = settings_dict.get("password_check_breached", check_breached)
 
         # Check minimum length
         if len(password) < min_length:
@@ -140,29 +203,11 @@ class AuthService:
         if require_special and not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
             return False, "パスワードには特殊文字を含める必要があります"
 
-        return True, ""
+        # Check against the breached password list (local Bloom filter, no network)
+        if check_breached and breached_passwords.is_breached(password):
+            return False, "このパスワードは過去に流出したことが確認されているため使用できません"
 
-    @staticmethod
-    def generate_verification_token() -> str:
-        """
-        Generate a secure random token for email verification.
-
-        Returns:
-            Random token string
-        """
-        return secrets.token_urlsafe(32)
-
-    @staticmethod
-    def generate_password_reset_token() -> Tuple[str, datetime]:
-        """
-        Generate a secure random token for password reset with expiration.
-
-        Returns:
-            Tuple of (token, expiration_datetime)
-        """
-        token = secrets.token_urlsafe(32)
-        expires = datetime.utcnow() + timedelta(hours=1)
-        return token, expires
+        return True, ""
 
 
 auth_service = AuthService()
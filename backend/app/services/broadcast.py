@@ -0,0 +1,429 @@
+"""
+Broadcast emails to every user.
+
+A broadcast is a row in broadcast_jobs. A background worker in every API
+process claims runnable jobs (a lease in locked_until keeps other workers
+off them) and delivers them in a worker thread:
+
+- recipients are read in users.id order, BROADCAST_CHUNK_SIZE rows at a time,
+  each chunk with its own short keyset query (WHERE id > last id), so no
+  cursor or transaction stays open for the hours a large broadcast takes;
+- each chunk is rendered from the compiled template in one pass;
+- messages are sent at most BROADCAST_RATE_PER_SECOND through
+  BROADCAST_CONCURRENCY threads over the pooled SMTP connections; failed
+  sends are handed to the email outbox, which retries them with backoff;
+- after each chunk the last user id and the counters are checkpointed, so a
+  paused, interrupted or crashed job resumes after the last checkpoint. A
+  crash can resend at most one chunk.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.broadcast_job import BroadcastJob
+from app.models.user import User
+from app.services.email_outbox import email_outbox
+from app.services.email_templates import email_templates
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+def _recipients_filter():
+    """Users who receive broadcasts."""
+    return User.email_verified.is_(True)
+
+
+def _claimable(now: datetime):
+    """Active jobs nobody holds a lease on."""
+    return and_(
+        BroadcastJob.status.in_(ACTIVE_STATUSES),
+        or_(BroadcastJob.locked_until.is_(None), BroadcastJob.locked_until < now),
+    )
+
+
+def lease_seconds() -> float:
+    """Lease long enough to deliver two chunks at the configured rate."""
+    return max(
+        settings.broadcast_lease_seconds,
+        2 * settings.broadcast_chunk_size / settings.broadcast_rate_per_second,
+    )
+
+
+class TokenBucket:
+    """Thread-safe rate limiter: rate tokens per second, bursts of up to burst tokens."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.capacity = max(burst, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, stop: Optional[threading.Event] = None) -> bool:
+        """
+        Take one token, waiting until one is available.
+
+        Returns:
+            False if stop was set while waiting
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if stop is not None:
+                if stop.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+
+
+class BroadcastService:
+    """Service for creating and controlling broadcast jobs."""
+
+    @staticmethod
+    def create(
+        db: Session, template: str, context: Dict[str, Any], user_id=None
+    ) -> BroadcastJob:
+        """
+        Create a broadcast job (delivered by the broadcast worker).
+
+        Args:
+            db: Database session
+            template: Email template name
+            context: Template variables shared by all recipients
+            user_id: Admin who started the broadcast
+
+        Returns:
+            The pending job
+        """
+        total = db.query(func.count(User.id)).filter(_recipients_filter()).scalar() or 0
+        job = BroadcastJob(
+            template=template,
+            context=json.dumps(context, ensure_ascii=False),
+            status="pending",
+            total_recipients=total,
+            processed_count=0,
+            sent_count=0,
+            deferred_count=0,
+            active_seconds=0.0,
+            created_by_user_id=user_id,
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        broadcast_worker.notify()
+        return job
+
+    @staticmethod
+    def get(db: Session, job_id) -> Optional[BroadcastJob]:
+        return db.query(BroadcastJob).filter(BroadcastJob.id == job_id).first()
+
+    @staticmethod
+    def list_jobs(db: Session, limit: int = 20) -> List[BroadcastJob]:
+        return db.query(BroadcastJob).order_by(BroadcastJob.created_at.desc()).limit(limit).all()
+
+    @staticmethod
+    def set_status(db: Session, job: BroadcastJob, new_status: str) -> BroadcastJob:
+        """
+        Pause, resume or cancel a job.
+
+        A worker delivering the job notices at its next checkpoint and
+        releases it; resuming makes it claimable again.
+        """
+        job.status = new_status
+        if new_status == "cancelled":
+            job.finished_at = datetime.utcnow()
+        db.commit()
+        db.refresh(job)
+        if new_status in ACTIVE_STATUSES:
+            broadcast_worker.notify()
+        return job
+
+    @staticmethod
+    def progress(job: BroadcastJob) -> Dict[str, Any]:
+        """
+        Progress figures of a job.
+
+        Returns:
+            Dictionary with percent done, delivery throughput (messages per
+            second while running) and estimated seconds remaining
+        """
+        total = job.total_recipients or 0
+        processed = job.processed_count or 0
+        throughput = processed / job.active_seconds if job.active_seconds else 0.0
+        remaining = max(total - processed, 0)
+        return {
+            "percent": round(100.0 * processed / total, 1) if total else 100.0,
+            "throughput_per_second": round(throughput, 2),
+            "eta_seconds": round(remaining / throughput) if throughput and job.status in ACTIVE_STATUSES else None,
+        }
+
+    @staticmethod
+    def claim() -> Optional[Any]:
+        """
+        Lease one runnable job.
+
+        Returns:
+            Job id, or None if there is nothing to run
+        """
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            job_id = (
+                db.query(BroadcastJob.id)
+                .filter(_claimable(now))
+                .order_by(BroadcastJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+                .scalar()
+            )
+            if job_id is None:
+                db.rollback()
+                return None
+            # Re-check in the UPDATE for databases without SKIP LOCKED
+            claimed = db.execute(
+                update(BroadcastJob)
+                .where(BroadcastJob.id == job_id, _claimable(now))
+                .values(
+                    status="running",
+                    locked_until=now + timedelta(seconds=lease_seconds()),
+                    started_at=func.coalesce(BroadcastJob.started_at, now),
+                )
+                .returning(BroadcastJob.id)
+            ).scalar()
+            db.commit()
+            return claimed
+        finally:
+            db.close()
+
+
+broadcast_service = BroadcastService()
+
+
+class BroadcastRunner:
+    """Delivers one claimed job until it finishes, is paused/cancelled, or stop is set."""
+
+    def __init__(self, job_id, stop: threading.Event, sender=None):
+        self.job_id = job_id
+        self.stop = stop
+        self.sender = sender
+        # Let every delivery thread start at once, then hold the average rate
+        self.bucket = TokenBucket(settings.broadcast_rate_per_second, settings.broadcast_concurrency)
+
+    def run(self) -> None:
+        try:
+            db = SessionLocal()
+            try:
+                job = broadcast_service.get(db, self.job_id)
+                template = email_templates.get(db, job.template)
+                context = json.loads(job.context)
+                last_user_id = job.last_user_id
+            finally:
+                db.close()
+
+            finished = False
+            with ThreadPoolExecutor(settings.broadcast_concurrency) as executor:
+                while True:
+                    started = time.monotonic()
+                    chunk = self._next_chunk(last_user_id)
+                    if not chunk:
+                        finished = True
+                        break
+                    messages = template.render_many(
+                        {**context, "name": row.name, "email": row.email} for row in chunk
+                    )
+                    sent, deferred, last_id = self._deliver(executor, chunk, messages)
+                    status = self._checkpoint(last_id, sent, deferred, time.monotonic() - started)
+                    if last_id != chunk[-1].id or status != "running" or self.stop.is_set():
+                        break
+                    last_user_id = last_id
+
+            if finished:
+                self._finish()
+            else:
+                self._release()
+        except Exception as e:
+            logger.exception(f"Broadcast {self.job_id} failed; it will be resumed")
+            self._release(error=str(e))
+
+    @staticmethod
+    def _next_chunk(last_user_id) -> List[Any]:
+        """Next recipients after the checkpoint (id, email, name rows)."""
+        query = (
+            select(User.id, User.email, User.name)
+            .where(_recipients_filter())
+            .order_by(User.id)
+            .limit(settings.broadcast_chunk_size)
+        )
+        if last_user_id is not None:
+            query = query.where(User.id > last_user_id)
+        db = SessionLocal()
+        try:
+            return db.execute(query).all()
+        finally:
+            db.close()
+
+    def _deliver(self, executor: ThreadPoolExecutor, chunk, messages) -> Tuple[int, int, Any]:
+        """Send one chunk; returns (sent, deferred, id of the last recipient handled)."""
+        futures: List[Tuple[Any, Any, Future]] = []
+        for row, message in zip(chunk, messages):
+            if not self.bucket.acquire(self.stop):
+                break
+            futures.append((row, message, executor.submit(
+                self.sender, row.email, message.subject, message.text, message.html
+            )))
+
+        sent = 0
+        failed = []
+        for row, message, future in futures:
+            try:
+                future.result()
+                sent += 1
+            except Exception as e:
+                logger.warning(f"Broadcast {self.job_id} to {row.email} failed, queued for retry: {e}")
+                failed.append((row, message))
+
+        if failed:
+            db = SessionLocal()
+            try:
+                for row, message in failed:
+                    email_outbox.enqueue(
+                        db, row.email, message.subject, message.text,
+                        kind="broadcast", html_body=message.html,
+                    )
+                db.commit()
+            finally:
+                db.close()
+
+        last_id = futures[-1][0].id if futures else None
+        return sent, len(failed), last_id
+
+    def _checkpoint(self, last_id, sent: int, deferred: int, elapsed: float) -> str:
+        """Record progress and renew the lease; returns the job's current status."""
+        db = SessionLocal()
+        try:
+            values: Dict[str, Any] = {
+                "processed_count": BroadcastJob.processed_count + sent + deferred,
+                "sent_count": BroadcastJob.sent_count + sent,
+                "deferred_count": BroadcastJob.deferred_count + deferred,
+                "active_seconds": BroadcastJob.active_seconds + elapsed,
+                "locked_until": datetime.utcnow() + timedelta(seconds=lease_seconds()),
+            }
+            if last_id is not None:
+                values["last_user_id"] = last_id
+            db.execute(update(BroadcastJob).where(BroadcastJob.id == self.job_id).values(**values))
+            db.commit()
+            return db.query(BroadcastJob.status).filter(BroadcastJob.id == self.job_id).scalar()
+        finally:
+            db.close()
+
+    def _finish(self) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(BroadcastJob)
+                .where(BroadcastJob.id == self.job_id, BroadcastJob.status == "running")
+                .values(status="completed", finished_at=datetime.utcnow(), locked_until=None, last_error=None)
+            )
+            db.commit()
+        finally:
+            db.close()
+        logger.info(f"Broadcast {self.job_id} completed")
+
+    def _release(self, error: Optional[str] = None) -> None:
+        """Give up the lease (after an error, keep other workers off for a poll interval)."""
+        values: Dict[str, Any] = {"locked_until": None}
+        if error is not None:
+            values["last_error"] = error[:2000]
+            values["locked_until"] = datetime.utcnow() + timedelta(seconds=settings.broadcast_poll_seconds)
+        db = SessionLocal()
+        try:
+            db.execute(update(BroadcastJob).where(BroadcastJob.id == self.job_id).values(**values))
+            db.commit()
+        finally:
+            db.close()
+
+
+class BroadcastWorker:
+    """
+    Background task running broadcast jobs.
+
+    Runs on the event loop of each API process; a claimed job is delivered
+    in a worker thread so requests are never blocked.
+    """
+
+    def __init__(self, sender=None):
+        self.sender = sender
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if self._task is not None:
+            return
+        if self.sender is None:
+            from app.services.email_service import email_service
+
+            self.sender = email_service.send_email
+        self._stop.clear()
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="broadcast-worker")
+
+    async def stop(self) -> None:
+        """Stop after the messages in flight; the job resumes from its checkpoint elsewhere."""
+        if self._task is None:
+            return
+        self._stop.set()
+        self._wakeup.set()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def notify(self) -> None:
+        """Wake the worker up early (safe to call from any thread)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                job_id = await asyncio.to_thread(broadcast_service.claim)
+                if job_id is not None:
+                    runner = BroadcastRunner(job_id, self._stop, self.sender)
+                    await asyncio.to_thread(runner.run)
+                    continue
+            except Exception:
+                logger.exception("Broadcast worker iteration failed")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.broadcast_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+# Global broadcast worker (started by the application lifespan)
+broadcast_worker = BroadcastWorker()
@@ -0,0 +1,323 @@
+"""
+Persistent email outbox.
+
+Request handlers add messages to the email_outbox table in the same
+transaction as the change that triggers them, so an email is queued if and
+only if the change commits. A background worker in every API process claims
+due messages (a lease in locked_until keeps other workers off them), delivers
+them from a thread pool, and reschedules failures with exponential backoff.
+
+Bodies carry live token links (verification, password reset), so they are
+cleared as soon as a message is sent or given up on; the row keeps only the
+recipient, subject and delivery history.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import and_, event, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import email_outbox_depth
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+
+def _claimable(now: datetime):
+    """Due pending messages, and messages whose sending lease has expired."""
+    return or_(
+        and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+        and_(EmailOutbox.status == "sending", EmailOutbox.locked_until < now),
+    )
+
+
+# Values replacing the body of a message that will not be sent again
+_CLEARED_BODY = {"body": "", "html_body": None}
+
+
+class EmailOutboxService:
+    """Service for queueing and claiming outgoing emails."""
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        to_email: str,
+        subject: str,
+        body: str,
+        kind: Optional[str] = None,
+        html_body: Optional[str] = None,
+    ) -> EmailOutbox:
+        """
+        Add a message to the outbox (committed by the caller).
+
+        Args:
+            db: Database session of the triggering change
+            to_email: Recipient email address
+            subject: Email subject
+            body: Plain-text email body
+            kind: Message type for diagnostics
+            html_body: Optional HTML version of the body
+
+        Returns:
+            The pending outbox row
+        """
+        message = EmailOutbox(
+            to_email=to_email,
+            subject=subject,
+            body=body,
+            html_body=html_body,
+            kind=kind,
+            status="pending",
+            attempts=0,
+            next_attempt_at=datetime.utcnow(),
+        )
+        db.add(message)
+        # Deliver right after the caller commits instead of at the next poll
+        event.listen(db, "after_commit", lambda session: email_outbox_worker.notify(), once=True)
+        return message
+
+    @staticmethod
+    def claim_batch(limit: int) -> List[Dict[str, Any]]:
+        """
+        Lease up to limit due messages for delivery.
+
+        Returns:
+            Claimed messages as dictionaries (id, to_email, subject, body,
+            html_body, attempts)
+        """
+        now = datetime.utcnow()
+        db = SessionLocal()
+        try:
+            ids = [
+                row.id
+                for row in db.query(EmailOutbox.id)
+                .filter(_claimable(now))
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ]
+            if not ids:
+                db.rollback()
+                return []
+
+            # Re-check the condition in the UPDATE so concurrent workers on
+            # databases without SKIP LOCKED never claim the same message
+            rows = db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(ids), _claimable(now))
+                .values(
+                    status="sending",
+                    attempts=EmailOutbox.attempts + 1,
+                    locked_until=now + timedelta(seconds=settings.email_outbox_lease_seconds),
+                )
+                .returning(
+                    EmailOutbox.id,
+                    EmailOutbox.to_email,
+                    EmailOutbox.subject,
+                    EmailOutbox.body,
+                    EmailOutbox.html_body,
+                    EmailOutbox.attempts,
+                )
+            ).all()
+            db.commit()
+            return [dict(row._mapping) for row in rows]
+        finally:
+            db.close()
+
+    @staticmethod
+    def mark_sent(message_id) -> None:
+        """Record a successful delivery and clear the body."""
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id == message_id)
+                .values(
+                    status="sent",
+                    sent_at=datetime.utcnow(),
+                    locked_until=None,
+                    last_error=None,
+                    **_CLEARED_BODY,
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        """Backoff before the next attempt: base * 2^(attempts-1), capped, with ±20% jitter."""
+        delay = min(
+            settings.email_retry_max_seconds,
+            settings.email_retry_base_seconds * 2 ** max(attempts - 1, 0),
+        )
+        return delay * random.uniform(0.8, 1.2)
+
+    @staticmethod
+    def mark_failed(message_id, attempts: int, error: str) -> None:
+        """Schedule a retry, or give up (and clear the body) after email_max_attempts."""
+        values: Dict[str, Any] = {"locked_until": None, "last_error": error[:2000]}
+        if attempts >= settings.email_max_attempts:
+            values["status"] = "failed"
+            values.update(_CLEARED_BODY)
+            logger.error(f"Giving up on email {message_id} after {attempts} attempts: {error}")
+        else:
+            values["status"] = "pending"
+            values["next_attempt_at"] = datetime.utcnow() + timedelta(
+                seconds=EmailOutboxService.retry_delay(attempts)
+            )
+
+        db = SessionLocal()
+        try:
+            db.execute(update(EmailOutbox).where(EmailOutbox.id == message_id).values(**values))
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def backlog(db: Session) -> Dict[str, Any]:
+        """
+        Count undelivered messages.
+
+        Returns:
+            Dictionary with the number of pending/sending messages and the age
+            in seconds of the oldest one
+        """
+        count, oldest = (
+            db.query(func.count(EmailOutbox.id), func.min(EmailOutbox.created_at))
+            .filter(EmailOutbox.status.in_(("pending", "sending")))
+            .one()
+        )
+        if oldest is not None and oldest.tzinfo is not None:
+            oldest = oldest.replace(tzinfo=None) - oldest.utcoffset()
+        age = (datetime.utcnow() - oldest).total_seconds() if oldest else 0.0
+        return {"depth": count, "oldest_age_seconds": round(max(age, 0.0), 1)}
+
+
+email_outbox = EmailOutboxService()
+
+
+def check_email_outbox() -> Dict[str, Any]:
+    """Readiness check: outbox backlog is within the configured limits (0 = report only)."""
+    db = SessionLocal()
+    try:
+        backlog = email_outbox.backlog(db)
+    finally:
+        db.close()
+    ok = not (
+        (settings.email_outbox_max_backlog and backlog["depth"] > settings.email_outbox_max_backlog)
+        or (
+            settings.email_outbox_max_age_seconds
+            and backlog["oldest_age_seconds"] > settings.email_outbox_max_age_seconds
+        )
+    )
+    return {"ok": ok, **backlog}
+
+
+class EmailOutboxWorker:
+    """
+    Background task delivering outbox messages.
+
+    Runs on the event loop of each API process; database access and SMTP
+    delivery happen in worker threads so requests are never blocked.
+    """
+
+    def __init__(self, sender: Optional[Callable[[str, str, str, Optional[str]], None]] = None):
+        self.sender = sender
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the worker on the running event loop."""
+        if self._task is not None:
+            return
+        if self.sender is None:
+            from app.services.email_service import email_service
+
+            self.sender = email_service.send_email
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="email-outbox-worker")
+
+    async def stop(self) -> None:
+        """Stop the worker (in-flight deliveries are retried after their lease expires)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._loop = None
+
+    def notify(self) -> None:
+        """Wake the worker up early (safe to call from any thread)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.run_once()
+            except Exception:
+                logger.exception("Email outbox worker iteration failed")
+                claimed = 0
+
+            # Keep draining while full batches come back
+            if claimed >= settings.email_outbox_batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.email_outbox_poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def run_once(self) -> int:
+        """
+        Claim and deliver one batch of due messages.
+
+        Returns:
+            Number of messages claimed
+        """
+        messages = await asyncio.to_thread(email_outbox.claim_batch, settings.email_outbox_batch_size)
+        semaphore = asyncio.Semaphore(settings.email_outbox_concurrency)
+
+        async def deliver(message: Dict[str, Any]) -> None:
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(
+                        self.sender,
+                        message["to_email"],
+                        message["subject"],
+                        message["body"],
+                        message["html_body"],
+                    )
+                except Exception as e:
+                    await asyncio.to_thread(
+                        email_outbox.mark_failed, message["id"], message["attempts"], str(e)
+                    )
+                else:
+                    await asyncio.to_thread(email_outbox.mark_sent, message["id"])
+
+        await asyncio.gather(*(deliver(message) for message in messages))
+        await asyncio.to_thread(self.update_depth)
+        return len(messages)
+
+    @staticmethod
+    def update_depth() -> None:
+        db = SessionLocal()
+        try:
+            email_outbox_depth.set(email_outbox.backlog(db)["depth"])
+        finally:
+            db.close()
+
+
+# Global outbox worker (started by the application lifespan)
+email_outbox_worker = EmailOutboxWorker()
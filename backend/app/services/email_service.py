@@ -1,88 +1,101 @@
 """
 Email service for sending verification and password reset emails.
+
+Message bodies come from the templates in app/templates/email (see
+app/services/email_templates.py).
+
+Emails are not sent from request handlers: queue_* methods add a row to the
+email outbox in the caller's transaction, and the outbox worker delivers it
+with send_email (see app/services/email_outbox.py).
 """
-import smtplib
+import time
+from typing import Optional
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional
 import logging
 
+from sqlalchemy.orm import Session
+
 from app.core.config import settings
+from app.core.metrics import email_send_duration_seconds, emails_sent_total
+from app.services.email_outbox import email_outbox
+from app.services.email_templates import email_templates
+from app.services.smtp_pool import get_smtp_pool
 
 logger = logging.getLogger(__name__)
 
 
+def format_lifetime(minutes: int) -> str:
+    """Link lifetime as shown in emails, e.g. "7日間", "1時間", "30分"."""
+    if minutes % (24 * 60) == 0:
+        return f"{minutes // (24 * 60)}日間"
+    if minutes % 60 == 0:
+        return f"{minutes // 60}時間"
+    return f"{minutes}分"
+
+
 class EmailService:
     """Service for sending emails."""
 
     @staticmethod
-    async def send_verification_email(email: str, token: str) -> bool:
+    def queue_verification_email(db: Session, email: str, token: str) -> None:
         """
-        Send email verification link to user.
+        Queue email verification link to user.
+
+        The message is added to the session and committed together with the
+        caller's user update.
 
         Args:
+            db: Database session
             email: User's email address
             token: Verification token
-
-        Returns:
-            True if email sent successfully, False otherwise
         """
-        verification_url = f"{settings.frontend_url}/verify-email?token={token}"
-
-        subject = "メールアドレスの確認 - Markdown Editor"
-        body = f"""
-        Markdown Editorへようこそ！
-
-        以下のリンクをクリックしてメールアドレスを確認してください:
-        {verification_url}
-
-        このリンクは24時間有効です。
-
-        このメールに心当たりがない場合は、無視してください。
-        """
-
-        return await EmailService._send_email(email, subject, body)
+        message = email_templates.render(
+            db, "verification",
+            verification_url=f"{settings.frontend_url}/verify-email?token={token}",
+            valid_for=format_lifetime(settings.email_verification_token_hours * 60),
+        )
+        email_outbox.enqueue(
+            db, email, message.subject, message.text, kind="verification", html_body=message.html
+        )
 
     @staticmethod
-    async def send_password_reset_email(email: str, token: str) -> bool:
+    def queue_password_reset_email(db: Session, email: str, token: str) -> None:
         """
-        Send password reset link to user.
+        Queue password reset link to user.
+
+        The message is added to the session and committed together with the
+        caller's user update.
 
         Args:
+            db: Database session
             email: User's email address
             token: Password reset token
-
-        Returns:
-            True if email sent successfully, False otherwise
-        """
-        reset_url = f"{settings.frontend_url}/reset-password/{token}"
-
-        subject = "パスワードリセット - Markdown Editor"
-        body = f"""
-        パスワードリセットのリクエストを受け付けました。
-
-        以下のリンクをクリックして新しいパスワードを設定してください:
-        {reset_url}
-
-        このリンクは1時間有効です。
-
-        このリクエストに心当たりがない場合は、無視してください。
         """
-
-        return await EmailService._send_email(email, subject, body)
+        message = email_templates.render(
+            db, "password_reset",
+            reset_url=f"{settings.frontend_url}/reset-password/{token}",
+            valid_for=format_lifetime(settings.password_reset_token_minutes),
+        )
+        email_outbox.enqueue(
+            db, email, message.subject, message.text, kind="password_reset", html_body=message.html
+        )
 
     @staticmethod
-    async def _send_email(to_email: str, subject: str, body: str) -> bool:
+    def send_email(to_email: str, subject: str, body: str, html_body: Optional[str] = None) -> None:
         """
-        Internal method to send email.
+        Deliver an email over SMTP (blocking; called from the outbox worker's threads).
+
+        Uses a pooled, already authenticated session (see app/services/smtp_pool.py).
 
         Args:
             to_email: Recipient email address
             subject: Email subject
-            body: Email body
+            body: Plain-text email body
+            html_body: Optional HTML alternative (sent as multipart/alternative)
 
-        Returns:
-            True if email sent successfully, False otherwise
+        Raises:
+            Exception: If delivery fails (the outbox schedules a retry)
         """
         # In development environment, just log the email
         if not settings.smtp_host:
@@ -90,29 +103,37 @@ class EmailService:
             logger.info(f"Subject: {subject}")
             logger.info(f"Body:\n{body}")
             logger.info("=" * 80)
-            return True
+            emails_sent_total.labels(outcome="logged").inc()
+            return
 
+        outcome = "failed"
+        start = time.perf_counter()
         try:
             # Create message
-            message = MIMEMultipart()
+            message = MIMEMultipart("alternative")
             message["From"] = settings.smtp_from_email
             message["To"] = to_email
             message["Subject"] = subject
-            message.attach(MIMEText(body, "plain"))
+            message.attach(MIMEText(body, "plain", "utf-8"))
+            if html_body:
+                # Clients show the last alternative they support
+                message.attach(MIMEText(html_body, "html", "utf-8"))
 
             # Send email
-            with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                if settings.smtp_user and settings.smtp_password:
-                    server.starttls()
-                    server.login(settings.smtp_user, settings.smtp_password)
-                server.send_message(message)
+            get_smtp_pool().send(settings.smtp_from_email, [to_email], message.as_bytes())
 
             logger.info(f"Email sent successfully to {to_email}")
-            return True
+            outcome = "sent"
 
         except Exception as e:
             logger.error(f"Failed to send email to {to_email}: {str(e)}")
-            return False
+            raise
+
+        finally:
+            email_send_duration_seconds.labels(outcome=outcome).observe(
+                time.perf_counter() - start
+            )
+            emails_sent_total.labels(outcome=outcome).inc()
 
 
 email_service = EmailService()
@@ -0,0 +1,271 @@
+"""
+Email templates.
+
+Each message type has a subject, a plain-text and an HTML template under
+app/templates/email ("<name>.subject.txt", "<name>.txt", "<name>.html").
+Templates are compiled once per process and reused; rendering a compiled
+template is a plain function call, so broadcasts can render thousands of
+messages without parsing anything again.
+
+Admins can override any part of a template through SystemSettings (key
+"email_template:<name>", JSON with "subject", "text" and/or "html"). Overrides
+are compiled once per SystemSettings.updated_at in a sandboxed environment
+(admins edit them, so they must not reach Python internals); the process that saves an
+override invalidates its cache immediately and other processes pick the
+change up within EMAIL_TEMPLATE_CACHE_SECONDS.
+"""
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    TemplateError,
+    select_autoescape,
+)
+from jinja2.sandbox import ImmutableSandboxedEnvironment, SecurityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.system_settings import SystemSettings
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "email"
+
+# Message types and the variables their templates receive (besides the
+# defaults), with sample values for validation and previews
+TEMPLATES: Dict[str, Dict[str, str]] = {
+    "verification": {"verification_url": "https://example.com/verify-email?token=sample", "valid_for": "7日間"},
+    "password_reset": {"reset_url": "https://example.com/reset-password/sample", "valid_for": "1時間"},
+    "terms_updated": {"name": "山田 太郎", "terms_url": "https://example.com/terms", "version": "2.0"},
+}
+
+PARTS = ("subject", "text", "html")
+_SUFFIXES = {"subject": ".subject.txt", "text": ".txt", "html": ".html"}
+
+SETTINGS_PREFIX = "email_template:"
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    """A rendered message ready to be queued."""
+
+    subject: str
+    text: str
+    html: str
+
+
+class CompiledEmailTemplate:
+    """Compiled subject, text and HTML templates of one message type."""
+
+    def __init__(self, name: str, subject: Template, text: Template, html: Template):
+        self.name = name
+        self.subject = subject
+        self.text = text
+        self.html = html
+
+    def render(self, **context: Any) -> RenderedEmail:
+        """Render all parts with the default context plus the given variables."""
+        context = {**default_context(), **context}
+        subject = " ".join(self.subject.render(context).split())
+        return RenderedEmail(
+            subject=subject,
+            text=self.text.render(context).strip() + "\n",
+            html=self.html.render(subject=subject, **context),
+        )
+
+    def render_many(self, contexts: Iterable[Dict[str, Any]]) -> Iterator[RenderedEmail]:
+        """Render one message per context (for broadcasts)."""
+        for context in contexts:
+            yield self.render(**context)
+
+
+def default_context() -> Dict[str, Any]:
+    """Variables available in every template."""
+    return {"app_name": settings.email_app_name, "frontend_url": settings.frontend_url}
+
+
+def _create_environment(autoescape) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=autoescape,
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        # Templates ship with the code; never stat the files again
+        auto_reload=False,
+        cache_size=-1,
+    )
+
+
+def _create_sandbox(autoescape: bool) -> ImmutableSandboxedEnvironment:
+    # The loader lets HTML overrides extend base.html (and only reads TEMPLATE_DIR)
+    return ImmutableSandboxedEnvironment(
+        loader=FileSystemLoader(str(TEMPLATE_DIR)),
+        autoescape=autoescape,
+        undefined=StrictUndefined,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+class EmailTemplateService:
+    """Loads, compiles and caches email templates and their overrides."""
+
+    def __init__(self):
+        # Escape variables in .html files
+        self._env = _create_environment(select_autoescape(("html",), default_for_string=False))
+        # Overrides are admin input: compiled in sandboxes, the HTML part
+        # (which has no file name) always escaping
+        self._override_env = _create_sandbox(False)
+        self._override_html_env = _create_sandbox(True)
+        self._lock = threading.Lock()
+        self._defaults: Dict[str, CompiledEmailTemplate] = {}
+        # name -> (updated_at of the override, compiled template)
+        self._overrides: Dict[str, Tuple[Any, CompiledEmailTemplate]] = {}
+        # name -> (monotonic time checked, updated_at or None when not overridden)
+        self._checked: Dict[str, Tuple[float, Any]] = {}
+
+    @staticmethod
+    def _check_name(name: str) -> None:
+        if name not in TEMPLATES:
+            raise KeyError(f"Unknown email template: {name}")
+
+    def default_sources(self, name: str) -> Dict[str, str]:
+        """Template sources shipped with the application."""
+        self._check_name(name)
+        return {
+            part: (TEMPLATE_DIR / f"{name}{suffix}").read_text(encoding="utf-8")
+            for part, suffix in _SUFFIXES.items()
+        }
+
+    def _default(self, name: str) -> CompiledEmailTemplate:
+        compiled = self._defaults.get(name)
+        if compiled is None:
+            compiled = CompiledEmailTemplate(
+                name, *(self._env.get_template(f"{name}{_SUFFIXES[part]}") for part in PARTS)
+            )
+            with self._lock:
+                self._defaults[name] = compiled
+        return compiled
+
+    def compile_override(self, name: str, override: Dict[str, str]) -> CompiledEmailTemplate:
+        """
+        Compile an override; parts it leaves out fall back to the defaults.
+
+        Raises:
+            KeyError: If the template name is unknown
+            jinja2.TemplateError: If a part does not compile
+        """
+        self._check_name(name)
+        default = self._default(name)
+        return CompiledEmailTemplate(
+            name,
+            self._override_env.from_string(override["subject"]) if override.get("subject") else default.subject,
+            self._override_env.from_string(override["text"]) if override.get("text") else default.text,
+            self._override_html_env.from_string(override["html"]) if override.get("html") else default.html,
+        )
+
+    def get(self, db: Session, name: str) -> CompiledEmailTemplate:
+        """
+        Compiled template for a message type, with its override if any.
+
+        Looks the override up at most once per EMAIL_TEMPLATE_CACHE_SECONDS.
+
+        Raises:
+            KeyError: If the template name is unknown
+        """
+        self._check_name(name)
+        now = time.monotonic()
+        checked = self._checked.get(name)
+        if checked is not None and now - checked[0] < settings.email_template_cache_seconds:
+            cached = self._overrides.get(name)
+            if checked[1] is None:
+                return self._default(name)
+            if cached is not None:
+                return cached[1]
+
+        row = (
+            db.query(SystemSettings.value, SystemSettings.updated_at)
+            .filter(SystemSettings.key == SETTINGS_PREFIX + name)
+            .first()
+        )
+        if row is None:
+            with self._lock:
+                self._overrides.pop(name, None)
+                self._checked[name] = (now, None)
+            return self._default(name)
+
+        cached = self._overrides.get(name)
+        if cached is not None and cached[0] == row.updated_at:
+            compiled = cached[1]
+        else:
+            try:
+                compiled = self.compile_override(name, json.loads(row.value))
+            except (TemplateError, ValueError, TypeError) as e:
+                # Saved overrides are validated; never stop sending because of one
+                logger.error(f"Invalid override of email template {name}, using default: {e}")
+                compiled = self._default(name)
+        with self._lock:
+            self._overrides[name] = (row.updated_at, compiled)
+            self._checked[name] = (now, row.updated_at)
+        return compiled
+
+    def render(self, db: Session, name: str, **context: Any) -> RenderedEmail:
+        """Render one message."""
+        return self.get(db, name).render(**context)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop cached overrides (all of them when name is None)."""
+        with self._lock:
+            if name is None:
+                self._overrides.clear()
+                self._checked.clear()
+            else:
+                self._overrides.pop(name, None)
+                self._checked.pop(name, None)
+
+    @staticmethod
+    def get_override(db: Session, name: str) -> Optional[SystemSettings]:
+        """SystemSettings row holding the override of a template, if any."""
+        return db.query(SystemSettings).filter(SystemSettings.key == SETTINGS_PREFIX + name).first()
+
+    @staticmethod
+    def list_templates() -> List[str]:
+        return list(TEMPLATES)
+
+
+def sample_context(name: str) -> Dict[str, str]:
+    """Sample values for the variables of a template (validation and previews)."""
+    return dict(TEMPLATES[name])
+
+
+def validate_override(name: str, override: Dict[str, str]) -> Optional[str]:
+    """
+    Check that an override compiles and renders with sample values.
+
+    Rendering happens in the sandbox, so an override reaching for unsafe
+    attributes is rejected here (jinja2.sandbox.SecurityError) instead of
+    being saved.
+
+    Returns:
+        Error message, or None if the override is valid
+    """
+    try:
+        email_templates.compile_override(name, override).render(**sample_context(name))
+    except SecurityError as e:
+        return f"SecurityError: {e}"
+    except TemplateError as e:
+        return f"{type(e).__name__}: {e}"
+    return None
+
+
+email_templates = EmailTemplateService()
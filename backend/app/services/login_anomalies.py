@@ -0,0 +1,279 @@
+"""
+Streaming detection of suspicious logins.
+
+Every recorded login is fed to the detector, which keeps sliding windows in
+memory and flags:
+
+- ip_many_accounts: one IP logged into more than LOGIN_ANOMALY_MAX_ACCOUNTS_PER_IP
+  distinct accounts within IP_WINDOW (credential stuffing that succeeded);
+- login_frequency: one account logged in more than
+  LOGIN_ANOMALY_MAX_LOGINS_PER_MINUTE times within a minute (scripted use);
+- user_many_ips: one account logged in from more than
+  LOGIN_ANOMALY_MAX_IPS_PER_USER distinct IPs within USER_IP_WINDOW
+  (a shared or stolen account).
+
+Observing a login is a few dictionary and deque operations, with no query.
+An alert is logged and counted in login_anomalies_total right away, then
+queued; the writer task stores queued alerts in login_anomalies in batches.
+A key alerts at most once per window. Windows are per process, like the rate
+limiters, and each structure holds at most LOGIN_ANOMALY_MAX_KEYS keys
+(least recently seen are dropped).
+"""
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Deque, Hashable, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import login_anomalies_total
+from app.models.login_anomaly import LoginAnomaly
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+KIND_IP_MANY_ACCOUNTS = "ip_many_accounts"
+KIND_LOGIN_FREQUENCY = "login_frequency"
+KIND_USER_MANY_IPS = "user_many_ips"
+
+IP_WINDOW_SECONDS = 600.0
+FREQUENCY_WINDOW_SECONDS = 60.0
+USER_IP_WINDOW_SECONDS = 3600.0
+
+# Events kept per key; enough to see any threshold crossed, bounded for runaway keys
+MAX_EVENTS_PER_KEY = 1000
+
+# Alerts waiting for the writer; older ones are dropped if the database is unavailable for long
+MAX_PENDING = 10_000
+
+FLUSH_INTERVAL_SECONDS = 5.0
+
+
+@dataclass
+class LoginAlert:
+    """A flagged login waiting to be stored."""
+
+    kind: str
+    user_id: uuid.UUID
+    ip_address: Optional[str]
+    observed: int
+    detected_at: datetime
+
+
+class _Window:
+    """Events of one key within the window, with a count per distinct value."""
+
+    __slots__ = ("events", "values", "alerted_until")
+
+    def __init__(self):
+        self.events: Deque[Tuple[float, Hashable]] = deque()
+        self.values: Counter = Counter()
+        self.alerted_until = 0.0
+
+
+class SlidingWindows:
+    """Per-key sliding windows in an LRU of at most max_keys keys."""
+
+    def __init__(self, window_seconds: float, max_keys: int):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self._windows: "OrderedDict[Hashable, _Window]" = OrderedDict()
+
+    def add(self, key: Hashable, value: Hashable, now: float) -> _Window:
+        """
+        Record an event and drop the ones that left the window.
+
+        Args:
+            key: What is counted per (an IP, a user)
+            value: What is counted (the other side of the login)
+            now: Monotonic time of the event
+
+        Returns:
+            The key's window (len(events) events, len(values) distinct values)
+        """
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _Window()
+            if len(self._windows) > self.max_keys:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(key)
+
+        window.events.append((now, value))
+        window.values[value] += 1
+        cutoff = now - self.window_seconds
+        events = window.events
+        while events and (events[0][0] <= cutoff or len(events) > MAX_EVENTS_PER_KEY):
+            _, old = events.popleft()
+            window.values[old] -= 1
+            if not window.values[old]:
+                del window.values[old]
+        return window
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+
+class LoginAnomalyDetector:
+    """Consumes login events and flags suspicious patterns."""
+
+    def __init__(self):
+        max_keys = settings.login_anomaly_max_keys
+        self._lock = threading.Lock()
+        self._accounts_per_ip = SlidingWindows(IP_WINDOW_SECONDS, max_keys)
+        self._logins_per_user = SlidingWindows(FREQUENCY_WINDOW_SECONDS, max_keys)
+        self._ips_per_user = SlidingWindows(USER_IP_WINDOW_SECONDS, max_keys)
+        self._pending: Deque[LoginAlert] = deque(maxlen=MAX_PENDING)
+
+    def observe(self, user_id: uuid.UUID, ip_address: Optional[str], now: Optional[float] = None) -> List[LoginAlert]:
+        """
+        Feed one login to the detector.
+
+        Args:
+            user_id: User who logged in
+            ip_address: Client IP, if known
+            now: Monotonic time of the login (defaults to now)
+
+        Returns:
+            Alerts raised by this login (already logged, counted and queued)
+        """
+        if not settings.login_anomaly_enabled:
+            return []
+        now = time.monotonic() if now is None else now
+        checks = [
+            (KIND_LOGIN_FREQUENCY, self._logins_per_user, user_id, None, settings.login_anomaly_max_logins_per_minute),
+        ]
+        if ip_address:
+            checks += [
+                (KIND_IP_MANY_ACCOUNTS, self._accounts_per_ip, ip_address, user_id, settings.login_anomaly_max_accounts_per_ip),
+                (KIND_USER_MANY_IPS, self._ips_per_user, user_id, ip_address, settings.login_anomaly_max_ips_per_user),
+            ]
+
+        alerts = []
+        with self._lock:
+            for kind, windows, key, value, threshold in checks:
+                window = windows.add(key, value, now)
+                observed = len(window.events) if value is None else len(window.values)
+                if observed > threshold and now >= window.alerted_until:
+                    window.alerted_until = now + windows.window_seconds
+                    alerts.append(LoginAlert(kind, user_id, ip_address, observed, datetime.utcnow()))
+            self._pending.extend(alerts)
+
+        for alert in alerts:
+            login_anomalies_total.labels(kind=alert.kind).inc()
+            logger.warning(
+                f"Login anomaly {alert.kind}: user {alert.user_id} from {alert.ip_address} "
+                f"({alert.observed} in window)"
+            )
+        return alerts
+
+    def flush(self) -> int:
+        """
+        Store the queued alerts.
+
+        Returns:
+            Number of alerts stored
+        """
+        with self._lock:
+            alerts = list(self._pending)
+            self._pending.clear()
+        if not alerts:
+            return 0
+
+        db = SessionLocal()
+        try:
+            stored = alerts
+            while stored:
+                try:
+                    self._store(db, stored)
+                    break
+                except IntegrityError:
+                    # A flagged user was deleted in the meantime; retrying
+                    # their alerts would fail forever, so keep only the others
+                    db.rollback()
+                    user_ids = {alert.user_id for alert in stored}
+                    existing = {
+                        user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids))
+                    }
+                    kept = [alert for alert in stored if alert.user_id in existing]
+                    if len(kept) == len(stored):
+                        raise
+                    logger.warning(f"Dropped {len(stored) - len(kept)} login anomalies of deleted users")
+                    stored = kept
+        except IntegrityError:
+            db.rollback()
+            logger.exception(f"Dropped {len(stored)} login anomalies that could not be stored")
+            return 0
+        except Exception:
+            db.rollback()
+            with self._lock:
+                # Retry on the next flush (if the queue fills up meanwhile, the newest alerts are dropped)
+                self._pending.extendleft(reversed(alerts))
+            raise
+        finally:
+            db.close()
+        return len(stored)
+
+    @staticmethod
+    def _store(db: Session, alerts: List[LoginAlert]) -> None:
+        db.add_all([
+            LoginAnomaly(
+                kind=alert.kind,
+                user_id=alert.user_id,
+                ip_address=alert.ip_address,
+                observed=alert.observed,
+                detected_at=alert.detected_at,
+            )
+            for alert in alerts
+        ])
+        db.commit()
+
+
+class LoginAnomalyWriter:
+    """Background task storing queued alerts every FLUSH_INTERVAL_SECONDS."""
+
+    def __init__(self, detector: LoginAnomalyDetector):
+        self.detector = detector
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the writer on the running event loop."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="login-anomaly-writer")
+
+    async def stop(self) -> None:
+        """Stop the writer, storing what is still queued."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        try:
+            await asyncio.to_thread(self.detector.flush)
+        except Exception:
+            logger.exception("Failed to store login anomalies")
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+            try:
+                await asyncio.to_thread(self.detector.flush)
+            except Exception:
+                logger.exception("Failed to store login anomalies")
+
+
+# Singleton instances
+login_anomaly_detector = LoginAnomalyDetector()
+login_anomaly_writer = LoginAnomalyWriter(login_anomaly_detector)
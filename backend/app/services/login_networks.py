@@ -0,0 +1,134 @@
+"""
+Login traffic per network (IP prefix).
+
+Every login attempt handled by this process (successful logins and failed
+password checks) is counted by the client's network: the address is parsed
+once into an integer and added to a PrefixTrie of the current BUCKET_SECONDS
+of wall-clock time, which keeps the totals per /16 and /24 (IPv4) and per /48
+(IPv6). Buckets older than LOGIN_NETWORKS_WINDOW_HOURS are dropped, and each
+holds at most LOGIN_NETWORKS_MAX_NODES trie nodes.
+
+The admin endpoint merges the buckets within the requested window and returns
+the busiest networks, with the announcing autonomous system when an IP to ASN
+table is loaded (IP_ASN_FILE). Counts are per process, like the rate limiters
+and the anomaly detector.
+"""
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.ip_asn import ip_asn
+from app.core.ip_prefixes import PrefixTrie, format_prefix, parse_ip
+
+LOGINS = 0
+FAILURES = 1
+
+BUCKET_SECONDS = 900
+
+# Prefix lengths offered by the endpoint, with their IP version
+PREFIX_LENGTHS = {16: 4, 24: 4, 48: 6}
+
+SORT_KEYS = {
+    "attempts": lambda counts: counts[LOGINS] + counts[FAILURES],
+    "logins": lambda counts: counts[LOGINS],
+    "failures": lambda counts: counts[FAILURES],
+}
+
+
+class LoginNetworks:
+    """Login attempts per network, in one prefix trie per time bucket."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[int, PrefixTrie]" = OrderedDict()
+
+    def observe(self, ip_address: Optional[str], failed: bool = False, now: Optional[float] = None) -> None:
+        """
+        Count a login attempt.
+
+        Args:
+            ip_address: Client IP (attempts without a parseable IP are ignored)
+            failed: Whether the credentials were rejected
+            now: Wall-clock time of the attempt (defaults to now)
+        """
+        parsed = parse_ip(ip_address) if ip_address else None
+        if parsed is None:
+            return
+        version, value = parsed
+        now = time.time() if now is None else now
+        bucket = int(now // BUCKET_SECONDS)
+        with self._lock:
+            trie = self._buckets.get(bucket)
+            if trie is None:
+                trie = self._buckets[bucket] = PrefixTrie(2, settings.login_networks_max_nodes)
+                self._expire(bucket)
+            trie.add(version, value, FAILURES if failed else LOGINS)
+
+    def _expire(self, current: int) -> None:
+        oldest = current - settings.login_networks_window_hours * 3600 // BUCKET_SECONDS
+        while self._buckets:
+            bucket = next(iter(self._buckets))
+            if bucket > oldest:
+                break
+            del self._buckets[bucket]
+
+    def top(
+        self,
+        prefix_length: int = 24,
+        hours: int = 1,
+        limit: int = 20,
+        sort: str = "attempts",
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the networks with the most login attempts.
+
+        Args:
+            prefix_length: 16 or 24 (IPv4 networks) or 48 (IPv6 networks)
+            hours: Window, rounded up to whole buckets
+            limit: Number of networks
+            sort: "attempts", "logins" or "failures"
+            now: Wall-clock end of the window (defaults to now)
+
+        Returns:
+            List of dictionaries with the network, counts and AS (if known), busiest first
+        """
+        version = PREFIX_LENGTHS[prefix_length]
+        key = SORT_KEYS[sort]
+        now = time.time() if now is None else now
+        oldest = int((now - hours * 3600) // BUCKET_SECONDS)
+
+        merged: Dict[int, List[int]] = {}
+        with self._lock:
+            for bucket, trie in self._buckets.items():
+                if bucket <= oldest:
+                    continue
+                for network, counts in trie.prefixes(version, prefix_length):
+                    total = merged.get(network)
+                    if total is None:
+                        merged[network] = list(counts)
+                    else:
+                        total[LOGINS] += counts[LOGINS]
+                        total[FAILURES] += counts[FAILURES]
+
+        busiest: List[Tuple[int, List[int]]] = heapq.nlargest(
+            limit, merged.items(), key=lambda item: key(item[1])
+        )
+        networks = []
+        for network, counts in busiest:
+            asn = ip_asn.lookup(version, network)
+            networks.append({
+                "prefix": format_prefix(version, network, prefix_length),
+                "logins": counts[LOGINS],
+                "failures": counts[FAILURES],
+                "asn": asn[0] if asn else None,
+                "as_name": asn[1] if asn else None,
+            })
+        return networks
+
+
+# Singleton instance
+login_networks = LoginNetworks()
@@ -0,0 +1,111 @@
+"""
+One-time tokens for email links (address verification, password reset).
+
+Only the SHA-256 hash of a token is stored, in the one_time_tokens table
+whose unique index on token_hash turns every link click into an index
+lookup. A token is deleted when it is used or replaced by a newer one for
+the same purpose; expired tokens are deleted by the token sweeper.
+"""
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import naive_utc
+from app.core.security import hash_token
+from app.models.one_time_token import OneTimeToken
+
+PURPOSE_EMAIL_VERIFICATION = "email_verification"
+PURPOSE_PASSWORD_RESET = "password_reset"
+
+
+def generate_token() -> str:
+    """Return a new random URL-safe token."""
+    return secrets.token_urlsafe(32)
+
+
+def token_lifetime(purpose: str) -> timedelta:
+    """How long a token for purpose stays valid."""
+    if purpose == PURPOSE_PASSWORD_RESET:
+        return timedelta(minutes=settings.password_reset_token_minutes)
+    return timedelta(hours=settings.email_verification_token_hours)
+
+
+class OneTimeTokenService:
+    """Service for issuing and redeeming one-time tokens."""
+
+    @staticmethod
+    def issue(db: Session, user_id: uuid.UUID, purpose: str) -> str:
+        """
+        Create a token, replacing earlier ones of the user for the same purpose (committed by the caller).
+
+        Args:
+            db: Database session
+            user_id: User the token belongs to
+            purpose: PURPOSE_EMAIL_VERIFICATION or PURPOSE_PASSWORD_RESET
+
+        Returns:
+            The token to put in the link (not stored)
+        """
+        db.query(OneTimeToken).filter(
+            OneTimeToken.user_id == user_id, OneTimeToken.purpose == purpose
+        ).delete(synchronize_session=False)
+
+        token = generate_token()
+        db.add(OneTimeToken(
+            token_hash=hash_token(token),
+            purpose=purpose,
+            user_id=user_id,
+            expires_at=datetime.utcnow() + token_lifetime(purpose),
+        ))
+        return token
+
+    @staticmethod
+    def find(db: Session, token: str, purpose: str) -> Optional[OneTimeToken]:
+        """
+        Look a token up by its hash.
+
+        Args:
+            db: Database session
+            token: Token from the link
+            purpose: Purpose the token must have been issued for
+
+        Returns:
+            The token row (possibly expired), or None if unknown
+        """
+        return (
+            db.query(OneTimeToken)
+            .filter(OneTimeToken.token_hash == hash_token(token), OneTimeToken.purpose == purpose)
+            .first()
+        )
+
+    @staticmethod
+    def is_expired(record: OneTimeToken) -> bool:
+        """Whether the token is past its expiry."""
+        return naive_utc(record.expires_at) <= datetime.utcnow()
+
+    @staticmethod
+    def redeem(db: Session, record: OneTimeToken) -> bool:
+        """
+        Use up a token (committed by the caller).
+
+        Args:
+            db: Database session
+            record: Token row returned by find()
+
+        Returns:
+            False if a concurrent request already used it
+        """
+        deleted = (
+            db.query(OneTimeToken)
+            .filter(OneTimeToken.id == record.id)
+            .delete(synchronize_session=False)
+        )
+        return deleted == 1
+
+
+# Singleton instance
+one_time_tokens = OneTimeTokenService()
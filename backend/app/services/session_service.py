@@ -0,0 +1,246 @@
+"""
+Login sessions: short-lived access tokens renewed with rotating refresh tokens.
+
+A login starts a session (refresh token family). Every refresh exchanges the
+refresh token for a new pair; presenting an already used token again means it
+leaked, so the whole family is revoked (except for one concurrent refresh
+right after rotation, see REUSE_GRACE). Revoking a session also denylists the
+access tokens issued in it, which then stop working immediately instead of at
+their expiry.
+"""
+import logging
+import secrets
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import naive_utc
+from app.core.revocation import revocation_list
+from app.core.security import create_access_token, hash_token
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# A refresh token used again this soon after rotation is a concurrent refresh
+# (e.g. two browser tabs), not a replay: it gets a new pair instead of revoking
+# the session, but only once; any further use revokes it
+REUSE_GRACE = timedelta(seconds=10)
+
+
+@dataclass
+class IssuedTokens:
+    """Token pair returned to the client."""
+
+    access_token: str
+    refresh_token: str
+    expires_in: int  # Access token lifetime in seconds
+
+
+def _invalid_refresh_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
+class SessionService:
+    """Service for issuing, refreshing and revoking login sessions."""
+
+    @staticmethod
+    def issue(db: Session, user: User, family_id: Optional[uuid.UUID] = None) -> IssuedTokens:
+        """
+        Issue an access token and a refresh token.
+
+        Args:
+            db: Database session (committed)
+            user: Authenticated user
+            family_id: Session to continue (a new session if omitted)
+
+        Returns:
+            The token pair
+        """
+        now = datetime.utcnow()
+        family_id = family_id or uuid.uuid4()
+        jti = uuid.uuid4().hex
+        lifetime = timedelta(minutes=settings.access_token_expire_minutes)
+        access_token = create_access_token(
+            data={
+                "sub": user.email,
+                "uid": str(user.id),
+                "adm": user.is_admin,
+                "sid": str(family_id),
+                "jti": jti,
+            },
+            expires_delta=lifetime,
+        )
+        refresh_token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            user_id=user.id,
+            token_hash=hash_token(refresh_token),
+            family_id=family_id,
+            access_jti=jti,
+            access_expires_at=now + lifetime,
+            expires_at=now + timedelta(days=settings.refresh_token_expire_days),
+            created_at=now,
+        ))
+        db.commit()
+        return IssuedTokens(
+            access_token=access_token,
+            refresh_token=refresh_token,
+            expires_in=int(lifetime.total_seconds()),
+        )
+
+    @staticmethod
+    def refresh(db: Session, refresh_token: str) -> Tuple[User, IssuedTokens]:
+        """
+        Exchange a refresh token for a new token pair.
+
+        Args:
+            db: Database session
+            refresh_token: Refresh token from the client
+
+        Returns:
+            The user and the new token pair
+
+        Raises:
+            HTTPException: If the token is unknown, expired, revoked or replayed
+        """
+        now = datetime.utcnow()
+        row = db.query(RefreshToken).filter(RefreshToken.token_hash == hash_token(refresh_token)).first()
+        if row is None or row.revoked_at is not None or naive_utc(row.expires_at) <= now:
+            raise _invalid_refresh_token()
+
+        if row.used_at is not None and naive_utc(row.used_at) + REUSE_GRACE < now:
+            logger.warning(f"Refresh token reused; revoking session {row.family_id} of user {row.user_id}")
+            SessionService.revoke_session(db, row.family_id)
+            raise _invalid_refresh_token()
+
+        user = db.get(User, row.user_id)
+        if user is None:
+            raise _invalid_refresh_token()
+
+        # One request rotates the token, and at most one more (within
+        # REUSE_GRACE, checked above) gets a pair of its own
+        row_id, family_id = row.id, row.family_id
+        rotated = SessionService._claim(db, row_id, RefreshToken.used_at, now)
+        if not rotated and not SessionService._claim(db, row_id, RefreshToken.reused_at, now):
+            logger.warning(f"Refresh token reused twice; revoking session {family_id} of user {user.id}")
+            SessionService.revoke_session(db, family_id)
+            raise _invalid_refresh_token()
+        return user, SessionService.issue(db, user, family_id)
+
+    @staticmethod
+    def _claim(db: Session, token_id: uuid.UUID, column, now: datetime) -> bool:
+        """Set an unset timestamp column of a refresh token; False if another request set it first."""
+        claimed = (
+            db.query(RefreshToken)
+            .filter(RefreshToken.id == token_id, column.is_(None))
+            .update({column: now}, synchronize_session=False)
+        )
+        if not claimed:
+            db.rollback()
+        return bool(claimed)
+
+    @staticmethod
+    def _revoke(db: Session, query) -> int:
+        """Revoke the refresh tokens matched by query and denylist their live access tokens."""
+        now = datetime.utcnow()
+        live_access = [
+            (jti, naive_utc(expires_at))
+            for jti, expires_at in query.filter(RefreshToken.access_expires_at > now)
+            .with_entities(RefreshToken.access_jti, RefreshToken.access_expires_at)
+            .all()
+        ]
+        revoked = query.filter(RefreshToken.revoked_at.is_(None)).update(
+            {RefreshToken.revoked_at: now}, synchronize_session=False
+        )
+        revocation_list.revoke(db, live_access)
+        return revoked
+
+    @staticmethod
+    def revoke_session(db: Session, family_id: uuid.UUID) -> int:
+        """
+        End one session (logout).
+
+        Args:
+            db: Database session (committed)
+            family_id: Session ID ("sid" claim)
+
+        Returns:
+            Number of refresh tokens revoked
+        """
+        return SessionService._revoke(db, db.query(RefreshToken).filter(RefreshToken.family_id == family_id))
+
+    @staticmethod
+    def revoke_refresh_session(db: Session, refresh_token: str) -> Optional[uuid.UUID]:
+        """
+        End the session a refresh token belongs to (logout without a valid access token).
+
+        Args:
+            db: Database session (committed)
+            refresh_token: Refresh token from the client (used, expired or revoked ones too)
+
+        Returns:
+            The session ID, or None if the token is unknown
+        """
+        row = db.query(RefreshToken).filter(RefreshToken.token_hash == hash_token(refresh_token)).first()
+        if row is None:
+            return None
+        family_id = row.family_id
+        SessionService.revoke_session(db, family_id)
+        return family_id
+
+    @staticmethod
+    def revoke_user_sessions(
+        db: Session, user_id: uuid.UUID, keep_family_id: Optional[uuid.UUID] = None
+    ) -> int:
+        """
+        End every session of a user (password reset or change).
+
+        Args:
+            db: Database session (committed)
+            user_id: User whose sessions end
+            keep_family_id: Session to leave signed in (the one making the change)
+
+        Returns:
+            Number of refresh tokens revoked
+        """
+        query = db.query(RefreshToken).filter(RefreshToken.user_id == user_id)
+        if keep_family_id is not None:
+            query = query.filter(RefreshToken.family_id != keep_family_id)
+        return SessionService._revoke(db, query)
+
+    @staticmethod
+    def revoke_access_tokens(db: Session, user_id: uuid.UUID) -> int:
+        """
+        Reject a user's current access tokens but keep the sessions.
+
+        Used when claims in the token (the admin flag) change: the next
+        refresh issues a token with the new claims.
+
+        Args:
+            db: Database session (committed)
+            user_id: User whose access tokens are revoked
+
+        Returns:
+            Number of access tokens revoked
+        """
+        now = datetime.utcnow()
+        live_access: List[Tuple[str, datetime]] = [
+            (jti, naive_utc(expires_at))
+            for jti, expires_at in db.query(RefreshToken.access_jti, RefreshToken.access_expires_at)
+            .filter(RefreshToken.user_id == user_id, RefreshToken.access_expires_at > now)
+            .all()
+        ]
+        return revocation_list.revoke(db, live_access)
+
+
+# Singleton instance
+session_service = SessionService()
@@ -0,0 +1,252 @@
+"""
+Pooled SMTP connections.
+
+Opening an SMTP session costs several round trips (greeting, EHLO, STARTTLS,
+EHLO again, AUTH) and providers throttle clients that reconnect for every
+message. The pool keeps authenticated sessions open and reuses them across
+messages from the outbox worker's threads:
+
+- sessions idle for longer than SMTP_POOL_IDLE_SECONDS are closed instead of
+  reused (servers drop idle clients, typically after 60-300 seconds);
+- a session is retired after SMTP_MAX_MESSAGES_PER_CONNECTION messages;
+- a send that fails because a reused session was dropped is retried once on
+  a fresh session;
+- when the server advertises PIPELINING (RFC 2920), MAIL FROM, RCPT TO and
+  DATA are sent in one write, saving two round trips per message.
+"""
+import smtplib
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+
+def _is_disconnect(error: Exception) -> bool:
+    """Whether a failure means the session is gone rather than that the message was refused."""
+    if isinstance(error, smtplib.SMTPResponseException):
+        # 421: the server is closing the connection (idle timeout, shutdown)
+        return error.smtp_code == 421
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+class PooledConnection:
+    """An open SMTP session with its usage bookkeeping."""
+
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.messages = 0
+        self.last_used = time.monotonic()
+
+    def close(self) -> None:
+        try:
+            self.smtp.quit()
+        except Exception:
+            self.smtp.close()
+
+
+def send_pipelined(smtp: smtplib.SMTP, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+    """
+    Run one mail transaction, pipelining the envelope when the server allows it.
+
+    Raises:
+        smtplib.SMTPSenderRefused, smtplib.SMTPRecipientsRefused,
+        smtplib.SMTPDataError: If the server refuses the message
+    """
+    if not smtp.has_extn("pipelining"):
+        smtp.sendmail(from_addr, to_addrs, message)
+        return
+
+    # One write, so the commands reach the server in a single packet
+    commands = [f"MAIL FROM:{smtplib.quoteaddr(from_addr)}"]
+    commands.extend(f"RCPT TO:{smtplib.quoteaddr(to_addr)}" for to_addr in to_addrs)
+    commands.append("DATA")
+    smtp.send("".join(f"{command}{smtplib.CRLF}" for command in commands))
+
+    # Replies arrive in command order
+    mail_reply = smtp.getreply()
+    rcpt_replies = [smtp.getreply() for _ in to_addrs]
+    data_reply = smtp.getreply()
+
+    if data_reply[0] != 354:
+        # The server rejected the envelope; DATA was refused as a consequence
+        smtp.rset()
+        if mail_reply[0] != 250:
+            raise smtplib.SMTPSenderRefused(mail_reply[0], mail_reply[1], from_addr)
+        refused = {
+            to_addr: reply for to_addr, reply in zip(to_addrs, rcpt_replies)
+            if reply[0] not in (250, 251)
+        }
+        if refused:
+            raise smtplib.SMTPRecipientsRefused(refused)
+        raise smtplib.SMTPDataError(*data_reply)
+
+    payload = smtplib._quote_periods(message)
+    if not payload.endswith(smtplib.bCRLF):
+        payload += smtplib.bCRLF
+    smtp.send(payload + b"." + smtplib.bCRLF)
+    code, reply = smtp.getreply()
+    if code != 250:
+        smtp.rset()
+        raise smtplib.SMTPDataError(code, reply)
+
+
+class SMTPConnectionPool:
+    """Thread-safe pool of authenticated SMTP sessions."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: str = "",
+        password: str = "",
+        max_size: int = 4,
+        idle_timeout: float = 30.0,
+        max_messages: int = 100,
+        timeout: float = 30.0,
+        pipelining: bool = True,
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self.timeout = timeout
+        self.pipelining = pipelining
+        self.connections_opened = 0
+        self._idle: Deque[PooledConnection] = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    def _transaction(self, conn: PooledConnection, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        if self.pipelining:
+            send_pipelined(conn.smtp, from_addr, to_addrs, message)
+        else:
+            conn.smtp.sendmail(from_addr, to_addrs, message)
+
+    def _connect(self) -> PooledConnection:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            smtp.ehlo()
+            if self.user and self.password:
+                smtp.starttls()
+                smtp.ehlo()
+                smtp.login(self.user, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        with self._lock:
+            self.connections_opened += 1
+        return PooledConnection(smtp)
+
+    def _take_idle(self) -> Optional[PooledConnection]:
+        """Most recently used idle session that has not timed out."""
+        expired: List[PooledConnection] = []
+        conn = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.pop()
+                if time.monotonic() - candidate.last_used < self.idle_timeout:
+                    conn = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            stale.close()
+        return conn
+
+    def _release(self, conn: PooledConnection) -> None:
+        conn.messages += 1
+        conn.last_used = time.monotonic()
+        if conn.messages >= self.max_messages:
+            conn.close()
+            return
+        with self._lock:
+            self._idle.append(conn)
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        if not self._slots.acquire(timeout=self.timeout):
+            raise TimeoutError("Timed out waiting for a free SMTP connection")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def send(self, from_addr: str, to_addrs: List[str], message: bytes) -> None:
+        """
+        Send one message over a pooled session.
+
+        Raises:
+            smtplib.SMTPException, OSError: If delivery fails
+        """
+        with self._slot():
+            conn = self._take_idle()
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect()
+            try:
+                self._transaction(conn, from_addr, to_addrs, message)
+            except Exception as e:
+                if not _is_disconnect(e):
+                    if isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                        # Refused message; the session itself is still usable
+                        self._release(conn)
+                    else:
+                        conn.close()
+                    raise
+                conn.smtp.close()
+                if not reused:
+                    raise
+                # The server dropped the idle session; retry once on a new one
+                conn = self._connect()
+                try:
+                    self._transaction(conn, from_addr, to_addrs, message)
+                except Exception:
+                    conn.close()
+                    raise
+            self._release(conn)
+
+    def close(self) -> None:
+        """Close all idle sessions."""
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+        for conn in idle:
+            conn.close()
+
+    def stats(self) -> Tuple[int, int]:
+        """Return (idle sessions, sessions opened so far)."""
+        with self._lock:
+            return len(self._idle), self.connections_opened
+
+
+_pool: Optional[SMTPConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Pool for the configured SMTP server (created on first use in each process)."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = SMTPConnectionPool(
+                    settings.smtp_host,
+                    settings.smtp_port,
+                    settings.smtp_user,
+                    settings.smtp_password,
+                    max_size=settings.smtp_pool_size or settings.email_outbox_concurrency,
+                    idle_timeout=settings.smtp_pool_idle_seconds,
+                    max_messages=settings.smtp_max_messages_per_connection,
+                    timeout=settings.smtp_timeout_seconds,
+                )
+    return _pool
+
+
+def close_smtp_pool() -> None:
+    """Close the idle sessions of this process's pool, if any."""
+    if _pool is not None:
+        _pool.close()
@@ -0,0 +1,113 @@
+"""
+Background deletion of expired tokens.
+
+Expired one-time tokens and refresh tokens are useless but would pile up
+forever. Every API process runs the sweeper (deletes are idempotent, and the
+start is jittered so processes rarely overlap); it deletes in batches of
+TOKEN_SWEEP_BATCH_SIZE rows, one short transaction each, so a large backlog
+never holds long locks on the tables.
+"""
+import asyncio
+import logging
+import random
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.one_time_token import OneTimeToken
+from app.models.refresh_token import RefreshToken
+
+logger = logging.getLogger(__name__)
+
+SWEPT_MODELS = (OneTimeToken, RefreshToken)
+
+
+def delete_expired(model, batch_size: int) -> int:
+    """
+    Delete rows of model whose expires_at has passed, batch_size rows per transaction.
+
+    Args:
+        model: Table with id and expires_at columns
+        batch_size: Rows deleted per transaction
+
+    Returns:
+        Number of rows deleted
+    """
+    now = datetime.utcnow()
+    total = 0
+    while True:
+        db = SessionLocal()
+        try:
+            ids = [
+                row_id
+                for (row_id,) in db.query(model.id)
+                .filter(model.expires_at <= now)
+                .limit(batch_size)
+                .all()
+            ]
+            if ids:
+                total += (
+                    db.query(model)
+                    .filter(model.id.in_(ids))
+                    .delete(synchronize_session=False)
+                )
+                db.commit()
+        finally:
+            db.close()
+        if len(ids) < batch_size:
+            return total
+
+
+def sweep_expired_tokens() -> Dict[str, int]:
+    """
+    Delete all expired one-time and refresh tokens.
+
+    Returns:
+        Rows deleted per table
+    """
+    deleted = {
+        model.__tablename__: delete_expired(model, settings.token_sweep_batch_size)
+        for model in SWEPT_MODELS
+    }
+    if any(deleted.values()):
+        logger.info(f"Deleted expired tokens: {deleted}")
+    return deleted
+
+
+class TokenSweeper:
+    """Background task running sweep_expired_tokens periodically."""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start the sweeper on the running event loop."""
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._run(), name="token-sweeper")
+
+    async def stop(self) -> None:
+        """Stop the sweeper (an interrupted sweep resumes on the next run)."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        interval = settings.token_sweep_interval_seconds
+        await asyncio.sleep(random.uniform(0, interval))
+        while True:
+            try:
+                await asyncio.to_thread(sweep_expired_tokens)
+            except Exception:
+                logger.exception("Token sweep failed")
+            await asyncio.sleep(interval)
+
+
+# Singleton instance
+token_sweeper = TokenSweeper()
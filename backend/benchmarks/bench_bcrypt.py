@@ -0,0 +1,54 @@
+"""
+bcrypt hash time versus cost factor on this machine.
+
+Prints the time of one hash (= one password login) for each cost factor, with
+the rate a single core can sustain, and marks the current BCRYPT_ROUNDS.
+With --calibrate it prints the highest cost whose hash stays within
+--target-ms instead; put that into BCRYPT_ROUNDS (run it on the production
+instance type, not a laptop).
+
+Usage:
+    cd backend
+    python benchmarks/bench_bcrypt.py
+    python benchmarks/bench_bcrypt.py --min-rounds 10 --max-rounds 14 --samples 5
+    python benchmarks/bench_bcrypt.py --calibrate --target-ms 250
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.bcrypt_cost import MAX_ROUNDS, MIN_ROUNDS, calibrate, cost_curve
+
+
+def current_rounds() -> int:
+    # Read the setting without requiring the rest of the configuration
+    return int(os.environ.get("BCRYPT_ROUNDS", 12))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure bcrypt hash time per cost factor")
+    parser.add_argument("--min-rounds", type=int, default=MIN_ROUNDS)
+    parser.add_argument("--max-rounds", type=int, default=14)
+    parser.add_argument("--samples", type=int, default=3, help="Timed hashes per cost factor (median)")
+    parser.add_argument("--calibrate", action="store_true", help="Print the cost factor for --target-ms")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="Acceptable time per hash")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        rounds = calibrate(args.target_ms / 1000, args.samples)
+        print(f"BCRYPT_ROUNDS={rounds}  (target {args.target_ms:.0f} ms, range {MIN_ROUNDS}-{MAX_ROUNDS})")
+        return 0
+
+    configured = current_rounds()
+    print(f"{'cost':>4}  {'ms/hash':>10}  {'hashes/s/core':>14}")
+    print("-" * 34)
+    for rounds, seconds in cost_curve(args.min_rounds, args.max_rounds, args.samples):
+        marker = "  <- BCRYPT_ROUNDS" if rounds == configured else ""
+        print(f"{rounds:>4}  {seconds * 1000:>10.1f}  {1 / seconds:>14.1f}{marker}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
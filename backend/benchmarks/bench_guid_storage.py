@@ -0,0 +1,152 @@
+"""
+GUID key storage on SQLite: insert rate and on-disk size.
+
+Fills a login_history-shaped table (GUID primary key, GUID user_id, timestamp,
+with the (user_id, logged_in_at DESC, id DESC) index) in a fresh SQLite file
+for each combination of:
+
+- storage: CHAR(36) text (GUID before binary storage) or 16 raw bytes (GUID now)
+- keys: random UUIDv4 or time-ordered UUIDv7 (uuid7)
+
+Rows are inserted through SQLAlchemy in batches of --batch, one transaction
+each, so the GUID bind processing is included. For each combination it prints
+rows inserted per second, the size of the table and of each index (from the
+dbstat virtual table), and the time to read all rows back as UUIDs.
+
+Usage:
+    cd backend
+    python benchmarks/bench_guid_storage.py
+    python benchmarks/bench_guid_storage.py --rows 1000000 --batch 5000
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; this benchmark uses its own databases
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import CHAR, Column, DateTime, Index, MetaData, String, Table, create_engine, select
+from sqlalchemy.types import TypeDecorator
+
+from app.models.user import GUID, uuid7
+
+
+class TextGUID(TypeDecorator):
+    """GUID stored as CHAR(36) text, like GUID before binary storage."""
+
+    impl = CHAR(36)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else str(value)
+
+    def process_result_value(self, value, dialect):
+        return None if value is None else uuid.UUID(value)
+
+
+STORAGES = {"char36": TextGUID, "binary16": GUID}
+KEYS: Dict[str, Callable[[], uuid.UUID]] = {"uuid4": uuid.uuid4, "uuid7": uuid7}
+USERS = 10_000
+
+
+def make_table(guid_type) -> Table:
+    metadata = MetaData()
+    table = Table(
+        "login_history",
+        metadata,
+        Column("id", guid_type, primary_key=True),
+        Column("user_id", guid_type, nullable=False),
+        Column("logged_in_at", DateTime, nullable=False),
+        Column("ip_address", String),
+    )
+    Index("ix_login_history_user_id_logged_in_at", table.c.user_id, table.c.logged_in_at.desc(), table.c.id.desc())
+    return table
+
+
+def run(path: str, storage: str, keys: str, rows: int, batch: int) -> Dict[str, float]:
+    """Fill one database and measure it."""
+    new_key = KEYS[keys]
+    table = make_table(STORAGES[storage])
+    engine = create_engine(f"sqlite:///{path}")
+    table.metadata.create_all(engine)
+
+    user_ids = [new_key() for _ in range(USERS)]
+    start_at = datetime(2026, 1, 1)
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        for offset in range(0, rows, batch):
+            conn.execute(table.insert(), [
+                {
+                    "id": new_key(),
+                    "user_id": user_ids[i % USERS],
+                    "logged_in_at": start_at + timedelta(seconds=i),
+                    "ip_address": f"10.0.{i // 256 % 256}.{i % 256}",
+                }
+                for i in range(offset, min(offset + batch, rows))
+            ])
+            conn.commit()
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with engine.connect() as conn:
+        for _ in conn.execute(select(table.c.id, table.c.user_id)):
+            pass
+    scan_seconds = time.perf_counter() - start
+    engine.dispose()
+
+    sizes = {}
+    with sqlite3.connect(path) as conn:
+        try:
+            for name, size in conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"):
+                sizes[name] = size
+        except sqlite3.OperationalError:
+            pass  # SQLite built without dbstat; only the file size is reported
+    return {
+        "rows_per_second": rows / insert_seconds,
+        "scan_ms": scan_seconds * 1000,
+        "table": sizes.get("login_history", 0),
+        "primary_key": sizes.get("sqlite_autoindex_login_history_1", 0),
+        "user_index": sizes.get("ix_login_history_user_id_logged_in_at", 0),
+        "file": os.path.getsize(path),
+    }
+
+
+def mib(size: float) -> str:
+    return f"{size / 1024 / 1024:.1f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure GUID storage and key kinds on SQLite")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--batch", type=int, default=1000, help="Rows per transaction")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows, {args.batch} per transaction, {USERS} users (sizes in MiB)")
+    print(
+        f"{'storage':<9} {'keys':<6} {'rows/s':>9} {'table':>7} {'pk index':>9} "
+        f"{'user index':>11} {'file':>7} {'scan ms':>8}"
+    )
+    print("-" * 74)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for storage in STORAGES:
+            for keys in KEYS:
+                result = run(os.path.join(tmp_dir, f"{storage}-{keys}.db"), storage, keys, args.rows, args.batch)
+                print(
+                    f"{storage:<9} {keys:<6} {result['rows_per_second']:>9.0f} {mib(result['table']):>7} "
+                    f"{mib(result['primary_key']):>9} {mib(result['user_index']):>11} "
+                    f"{mib(result['file']):>7} {result['scan_ms']:>8.0f}"
+                )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
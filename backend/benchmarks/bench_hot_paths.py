@@ -0,0 +1,348 @@
+"""
+Microbenchmarks for hot pure-Python paths of the backend.
+
+Covers JWT creation/decoding (RS256 with cached key objects, legacy HS256),
+Google ID token verification with a warm signing key cache,
+the access token revocation check with many revoked tokens, password policy validation,
+the breached password lookup in a memory-mapped Bloom filter, GUID bind/result
+processing and key generation (UUIDv4 vs UUIDv7), the in-memory rate limiter with many tracked IPs, the per-account login
+throttle with a full LRU of failure counters, counting logins per network and
+reading the busiest networks, the memory-mapped IP to ASN lookup, auth settings
+lookup and JSON parsing, UserResponse validation from a User row, and email
+template rendering (precompiled vs parsed per message).
+
+Usage:
+    cd backend
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --save baseline.json
+    python benchmarks/bench_hot_paths.py --compare baseline.json -k jwt
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Settings are required at import time; the benchmarks use private in-memory databases
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ.setdefault("JWT_ACCEPT_HS256", "true")
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from jose import jwt
+
+from harness import run_suite
+
+from app.core import keys as keys_module
+from app.core import revocation as revocation_module
+from app.core.bloom import BloomFilter
+from app.core.breached_passwords import BreachedPasswords, password_key, write_filter
+from app.core.config import settings
+from app.core.google_certs import LocalGoogleCerts, google_certs
+from app.core.ip_asn import IpAsnTable, write_table
+from app.core.rate_limit import AccountThrottle, RateLimiter
+from app.core.revocation import RevocationList
+from app.core.security import create_access_token, decode_access_token
+from app.models.revoked_token import RevokedToken
+from app.models.signing_key import SigningKey
+from app.models.system_settings import SystemSettings
+from app.models.user import GUID, User, uuid7
+from app.schemas.auth import UserResponse
+from app.services.admin_service import AdminService
+from app.services.auth_service import auth_service
+from app.services.email_templates import email_templates
+from app.services.login_networks import LoginNetworks
+
+ASN_RANGES = 500_000
+BREACHED_PASSWORDS = 100_000
+LOGIN_NETWORK_IPS = 10_000
+RATE_LIMIT_KEYS = 10_000
+REVOKED_TOKENS = 10_000
+
+
+# Signing keys and revoked tokens are read through the module's SessionLocal;
+# point those at a private in-memory database instead of DATABASE_URL
+tokens_engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SigningKey.__table__.create(tokens_engine)
+RevokedToken.__table__.create(tokens_engine)
+keys_module.SessionLocal = revocation_module.SessionLocal = sessionmaker(bind=tokens_engine)
+
+
+# JWT
+TOKEN = create_access_token({"sub": "user@example.com"})
+HS256_TOKEN = jwt.encode(
+    {"sub": "user@example.com", "iss": settings.jwt_issuer}, settings.secret_key, algorithm="HS256"
+)
+
+
+def bench_jwt_create():
+    create_access_token({"sub": "user@example.com"})
+
+
+def bench_jwt_decode():
+    decode_access_token(TOKEN)
+
+
+def bench_jwt_decode_hs256():
+    decode_access_token(HS256_TOKEN)
+
+
+# Google ID token verification (keys cached, no request to Google)
+LOCAL_GOOGLE = LocalGoogleCerts()
+google_certs.load(LOCAL_GOOGLE.jwks(), max_age=86400)
+GOOGLE_ID_TOKEN = LOCAL_GOOGLE.id_token("user@example.com", "User", audience=settings.google_client_id)
+
+
+def bench_google_id_token_verify():
+    auth_service.verify_google_token(GOOGLE_ID_TOKEN)
+
+
+# Revocation check (Bloom filter plus exact set, no database query)
+revocations = RevocationList()
+revocations.sync()
+revocations._remember((uuid.uuid4().hex, datetime(2100, 1, 1)) for _ in range(REVOKED_TOKENS))
+LIVE_JTI = uuid.uuid4().hex
+REVOKED_JTI = next(iter(revocations._exact))
+
+
+def bench_revocation_check_live():
+    revocations.is_revoked(LIVE_JTI)
+
+
+def bench_revocation_check_revoked():
+    revocations.is_revoked(REVOKED_JTI)
+
+
+# Password policy
+STRICT_POLICY = {
+    "password_min_length": 12,
+    "password_require_uppercase": True,
+    "password_require_lowercase": True,
+    "password_require_number": True,
+    "password_require_special": True,
+}
+
+
+def bench_password_strength_default():
+    auth_service.validate_password_strength("CorrectHorse9Battery")
+
+
+def bench_password_strength_strict():
+    auth_service.validate_password_strength("CorrectHorse9Battery!", STRICT_POLICY)
+
+
+# Breached password check (Bloom filter file mapped like BREACHED_PASSWORDS_FILE)
+_breached_bloom = BloomFilter(BREACHED_PASSWORDS)
+_breached_bloom.update(password_key(f"leaked-Passw0rd{i}") for i in range(BREACHED_PASSWORDS))
+_breached_file = tempfile.NamedTemporaryFile(suffix=".bloom")  # Removed on exit
+write_filter(_breached_file.name, _breached_bloom)
+breached = BreachedPasswords()
+breached.load(_breached_file.name)
+
+
+def bench_breached_password_miss():
+    breached.is_breached("Unique-Passw0rd")
+
+
+def bench_breached_password_hit():
+    breached.is_breached("leaked-Passw0rd42")
+
+
+# GUID TypeDecorator, through the processors SQLAlchemy actually calls
+GUID_VALUE = uuid.uuid4()
+GUID_BYTES = GUID_VALUE.bytes
+SQLITE_DIALECT = sqlite.dialect()
+POSTGRES_DIALECT = postgresql.psycopg2.dialect()
+SQLITE_BIND = GUID().dialect_impl(SQLITE_DIALECT).bind_processor(SQLITE_DIALECT)
+SQLITE_RESULT = GUID().dialect_impl(SQLITE_DIALECT).result_processor(SQLITE_DIALECT, None)
+POSTGRES_BIND = GUID().dialect_impl(POSTGRES_DIALECT).bind_processor(POSTGRES_DIALECT)
+POSTGRES_RESULT = GUID().dialect_impl(POSTGRES_DIALECT).result_processor(POSTGRES_DIALECT, None)
+
+
+def bench_guid_bind_sqlite():
+    SQLITE_BIND(GUID_VALUE)
+
+
+def bench_guid_result_sqlite():
+    SQLITE_RESULT(GUID_BYTES)
+
+
+def bench_guid_bind_postgres():
+    POSTGRES_BIND(GUID_VALUE)
+
+
+def bench_guid_result_postgres():
+    POSTGRES_RESULT(GUID_VALUE)
+
+
+# Rate limiter with many tracked IPs
+rate_limiter = RateLimiter()
+RATE_LIMIT_IPS = [f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}" for i in range(RATE_LIMIT_KEYS)]
+
+
+def reset_rate_limiter():
+    """Start each repeat with every IP holding two recent attempts."""
+    now = datetime.utcnow()
+    rate_limiter.login_attempts.clear()
+    for ip in RATE_LIMIT_IPS:
+        rate_limiter.login_attempts[ip] = [now, now]
+    random.seed(0)
+
+
+def bench_rate_limit_check():
+    rate_limiter._check_rate_limit(
+        rate_limiter.login_attempts,
+        "login",
+        RATE_LIMIT_IPS[random.randrange(RATE_LIMIT_KEYS)],
+        1_000_000,
+        15,
+        "",
+    )
+
+
+
+# Per-account login throttle with every LRU slot holding a failure counter
+account_throttle = AccountThrottle()
+for i in range(account_throttle.max_accounts):
+    account_throttle.record_failure(f"user{i}@example.com")
+
+
+def bench_account_throttle_check():
+    account_throttle.check(f"user{random.randrange(account_throttle.max_accounts)}@example.com")
+
+
+def bench_account_throttle_record_failure():
+    account_throttle.record_failure(f"attacker{random.randrange(1_000_000)}@example.com")
+
+# Login attempts per network, with every IP spread over its own /24
+login_networks = LoginNetworks()
+LOGIN_NETWORK_ADDRESSES = [f"{i % 200 + 1}.{i // 200 % 256}.{i % 256}.{i % 97}" for i in range(LOGIN_NETWORK_IPS)]
+for i, ip in enumerate(LOGIN_NETWORK_ADDRESSES):
+    login_networks.observe(ip, failed=i % 4 == 0)
+
+
+def bench_login_networks_observe():
+    login_networks.observe(LOGIN_NETWORK_ADDRESSES[random.randrange(LOGIN_NETWORK_IPS)])
+
+
+def bench_login_networks_top():
+    login_networks.top(prefix_length=24, hours=1, limit=20)
+
+
+# IP to ASN table mapped like IP_ASN_FILE (IPv4 space split into equal ranges)
+_asn_step = (1 << 32) // ASN_RANGES
+_asn_file = tempfile.NamedTemporaryFile(suffix=".bin")  # Removed on exit
+write_table(
+    _asn_file.name,
+    [(i * _asn_step, (i + 1) * _asn_step - 1, 64512 + i % 1000) for i in range(ASN_RANGES)],
+    [],
+    {64512 + i: f"AS-EXAMPLE-{i}" for i in range(1000)},
+)
+ip_asn = IpAsnTable()
+ip_asn.load(_asn_file.name)
+
+
+def bench_ip_asn_lookup():
+    ip_asn.lookup(4, random.getrandbits(32))
+
+
+# Auth settings lookup (one SELECT on in-memory SQLite plus JSON parsing)
+settings_engine = create_engine(
+    "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+)
+SystemSettings.__table__.create(settings_engine)
+settings_session = sessionmaker(bind=settings_engine)()
+settings_session.add(SystemSettings(
+    id=uuid.uuid4(),
+    key=AdminService.SETTINGS_AUTH,
+    value=json.dumps({**AdminService.DEFAULT_AUTH_SETTINGS, **STRICT_POLICY}),
+))
+settings_session.commit()
+
+
+def bench_get_setting():
+    AdminService.get_setting(settings_session, AdminService.SETTINGS_AUTH)
+    settings_session.expire_all()
+
+
+# Response validation from an ORM row
+USER = User(
+    id=uuid.uuid4(),
+    email="user@example.com",
+    name="Benchmark User",
+    auth_provider="email",
+    email_verified=True,
+    is_admin=False,
+    terms_accepted=True,
+    terms_accepted_at=datetime.utcnow(),
+    last_login_at=datetime.utcnow(),
+    created_at=datetime.utcnow(),
+)
+
+
+def bench_user_response_validate():
+    UserResponse.model_validate(USER)
+
+
+# Email templates: precompiled (what the service does) vs parsed for every message
+VERIFICATION_TEMPLATE = email_templates.get(settings_session, "verification")
+VERIFICATION_SOURCES = email_templates.default_sources("verification")
+
+
+def bench_email_render_compiled():
+    VERIFICATION_TEMPLATE.render(
+        verification_url="https://example.com/verify-email?token=abc", valid_for="7日間"
+    )
+
+
+def bench_email_render_parsed():
+    email_templates.compile_override("verification", VERIFICATION_SOURCES).render(
+        verification_url="https://example.com/verify-email?token=abc", valid_for="7日間"
+    )
+
+
+BENCHMARKS = {
+    "jwt.create_access_token": bench_jwt_create,
+    "jwt.decode_access_token": bench_jwt_decode,
+    "jwt.decode_hs256_legacy": bench_jwt_decode_hs256,
+    "google.verify_id_token_cached": bench_google_id_token_verify,
+    f"revocation.check_live_{REVOKED_TOKENS}": bench_revocation_check_live,
+    f"revocation.check_revoked_{REVOKED_TOKENS}": bench_revocation_check_revoked,
+    "password.strength_default": bench_password_strength_default,
+    "password.strength_strict": bench_password_strength_strict,
+    f"password.breached_miss_{BREACHED_PASSWORDS}": bench_breached_password_miss,
+    f"password.breached_hit_{BREACHED_PASSWORDS}": bench_breached_password_hit,
+    "guid.bind_sqlite": bench_guid_bind_sqlite,
+    "guid.result_sqlite": bench_guid_result_sqlite,
+    "guid.bind_postgres": bench_guid_bind_postgres,
+    "guid.result_postgres": bench_guid_result_postgres,
+    "guid.new_uuid4": uuid.uuid4,
+    "guid.new_uuid7": uuid7,
+    f"rate_limit.check_{RATE_LIMIT_KEYS}_ips": bench_rate_limit_check,
+    "rate_limit.account_check": bench_account_throttle_check,
+    "rate_limit.account_record_failure": bench_account_throttle_record_failure,
+    "login_networks.observe": bench_login_networks_observe,
+    f"login_networks.top_24_{LOGIN_NETWORK_IPS}_networks": bench_login_networks_top,
+    f"ip_asn.lookup_{ASN_RANGES}_ranges": bench_ip_asn_lookup,
+    "settings.get_setting_auth": bench_get_setting,
+    "schema.user_response_validate": bench_user_response_validate,
+    "email.render_compiled": bench_email_render_compiled,
+    "email.render_parsed": bench_email_render_parsed,
+}
+
+SETUPS = {
+    f"rate_limit.check_{RATE_LIMIT_KEYS}_ips": reset_rate_limiter,
+}
+
+
+if __name__ == "__main__":
+    sys.exit(run_suite(BENCHMARKS, SETUPS, description="Benchmark backend hot paths"))
@@ -0,0 +1,137 @@
+"""
+Serialization benchmark for API response schemas.
+
+Compares FastAPI's default response pipeline (response_model validation,
+serialization and json.dumps) against the PydanticResponse fast path for
+every *Response schema in app/schemas, reporting median per-call times
+measured with the benchmark harness.
+
+Usage:
+    cd backend
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --items 100 --repeats 9
+"""
+import argparse
+import asyncio
+import inspect
+import sys
+import os
+import typing
+import uuid
+from datetime import datetime, date
+from typing import Any, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from pydantic import BaseModel
+
+from harness import measure
+
+from app.core.responses import PydanticResponse
+from app.schemas import admin as admin_schemas
+from app.schemas import auth as auth_schemas
+
+
+def response_schemas() -> List[type]:
+    """Collect every response schema defined in app/schemas."""
+    schemas = []
+    for module in (auth_schemas, admin_schemas):
+        for name, obj in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(obj, BaseModel)
+                and obj.__module__ == module.__name__
+                and name.endswith("Response")
+            ):
+                schemas.append(obj)
+    return schemas
+
+
+def sample_value(annotation: Any, name: str, items: int) -> Any:
+    """Build a representative value for a field annotation."""
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Union:
+        return sample_value(next(a for a in args if a is not type(None)), name, items)
+    if origin in (list, List):
+        return [sample_value(args[0], name, items) for _ in range(items)]
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return sample_model(annotation, items)
+    if annotation is datetime:
+        return datetime.utcnow()
+    if annotation is date:
+        return date.today()
+    if annotation is bool:
+        return True
+    if annotation is int:
+        return 42
+    if annotation is float:
+        return 12.5
+    if "UUID" in getattr(annotation, "__name__", "") or "uuid" in repr(annotation).lower():
+        return uuid.uuid4()
+    if "email" in name or "Email" in repr(annotation):
+        return "user@example.com"
+    return f"{name}-value"
+
+
+def sample_model(model: type, items: int) -> BaseModel:
+    """Build a populated instance of a response model."""
+    values = {
+        field_name: sample_value(field.annotation, field_name, items)
+        for field_name, field in model.model_fields.items()
+    }
+    return model(**values)
+
+
+def bench_schema(
+    schema: type, items: int, repeats: int, loop: asyncio.AbstractEventLoop
+) -> List[Tuple[str, float, float]]:
+    """Benchmark one schema, returned both as a single model and a list."""
+    results = []
+    name = f"{schema.__module__.rsplit('.', 1)[-1]}.{schema.__name__}"
+    for label, response_type, content in (
+        (name, schema, sample_model(schema, items)),
+        (f"List[{name}]", List[schema], [sample_model(schema, items) for _ in range(items)]),
+    ):
+        field = create_response_field(name="response", type_=response_type)
+
+        def default_path():
+            value = loop.run_until_complete(
+                serialize_response(field=field, response_content=content)
+            )
+            return JSONResponse(value).body
+
+        def fast_path():
+            return PydanticResponse(content, response_type).body
+
+        assert default_path() == fast_path(), f"Output mismatch for {response_type}"
+        results.append((
+            label,
+            measure(default_path, repeats=repeats).median_us,
+            measure(fast_path, repeats=repeats).median_us,
+        ))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--items", type=int, default=50, help="Items per list response")
+    parser.add_argument("--repeats", type=int, default=5, help="Measured repeats per path")
+    args = parser.parse_args()
+
+    loop = asyncio.new_event_loop()
+    print(f"{'schema':<38} {'default (us)':>14} {'fast (us)':>12} {'speedup':>9}")
+    print("-" * 76)
+    try:
+        for schema in response_schemas():
+            for name, default_us, fast_us in bench_schema(schema, args.items, args.repeats, loop):
+                print(f"{name:<38} {default_us:>14.1f} {fast_us:>12.1f} {default_us / fast_us:>8.1f}x")
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+SMTP delivery throughput benchmark.
+
+Starts the local SMTP sink (scripts/smtp_sink.py) in a background thread and
+delivers the same batch of messages from a thread pool, the way the email
+outbox worker does, with three strategies:
+
+- connection: a new SMTP connection per message (the old EmailService behavior)
+- pooled: sessions reused from SMTPConnectionPool, one command per round trip
+- pipelined: pooled sessions with PIPELINING (the default)
+
+Use --latency to simulate the round-trip time to a real provider; on
+loopback every round trip is nearly free and the differences shrink.
+
+Usage:
+    cd backend
+    python benchmarks/bench_smtp.py
+    python benchmarks/bench_smtp.py --messages 2000 --concurrency 8 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from typing import Callable, Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, "scripts"))
+
+from app.services.smtp_pool import SMTPConnectionPool
+from smtp_sink import SMTPSink
+
+FROM_ADDR = "noreply@example.com"
+
+
+class SinkThread:
+    """SMTP sink running on its own event loop thread."""
+
+    def __init__(self, latency: float):
+        self.sink = SMTPSink(port=0, quiet=True, latency=latency)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> SMTPSink:
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self.sink.start(), self.loop).result()
+        return self.sink
+
+    def __exit__(self, *exc) -> None:
+        asyncio.run_coroutine_threadsafe(self.sink.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+def build_message(index: int) -> bytes:
+    message = MIMEText(f"Benchmark message {index}\n" + "Lorem ipsum dolor sit amet.\n" * 20)
+    message["From"] = FROM_ADDR
+    message["To"] = f"user{index}@example.com"
+    message["Subject"] = f"Benchmark {index}"
+    return message.as_bytes()
+
+
+def connection_per_message(port: int) -> Callable[[str, bytes], None]:
+    def send(to_addr: str, message: bytes) -> None:
+        with smtplib.SMTP("127.0.0.1", port, timeout=30) as smtp:
+            smtp.sendmail(FROM_ADDR, [to_addr], message)
+
+    return send
+
+
+def run(strategy: str, args: argparse.Namespace) -> Dict[str, float]:
+    messages = [(f"user{i}@example.com", build_message(i)) for i in range(args.messages)]
+    with SinkThread(args.latency) as sink:
+        pool = None
+        if strategy == "connection":
+            send = connection_per_message(sink.port)
+        else:
+            pool = SMTPConnectionPool(
+                "127.0.0.1",
+                sink.port,
+                max_size=args.concurrency,
+                max_messages=args.max_messages,
+                pipelining=strategy == "pipelined",
+            )
+            send = lambda to_addr, message: pool.send(FROM_ADDR, [to_addr], message)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            list(executor.map(lambda item: send(*item), messages))
+        elapsed = time.perf_counter() - start
+        if pool is not None:
+            pool.close()
+
+        assert sink.accepted == args.messages, f"sink accepted {sink.accepted}/{args.messages}"
+        return {
+            "seconds": elapsed,
+            "rate": args.messages / elapsed,
+            "connections": sink.connections,
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="SMTP delivery throughput benchmark")
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=4,
+                        help="Delivery threads (EMAIL_OUTBOX_CONCURRENCY)")
+    parser.add_argument("--latency", type=float, default=0.005,
+                        help="Simulated round-trip time in seconds")
+    parser.add_argument("--max-messages", type=int, default=100,
+                        help="Messages per pooled connection (SMTP_MAX_MESSAGES_PER_CONNECTION)")
+    parser.add_argument("--strategy", action="append", choices=["connection", "pooled", "pipelined"],
+                        help="Strategies to run (default: all)")
+    args = parser.parse_args()
+
+    strategies = args.strategy or ["connection", "pooled", "pipelined"]
+    print(
+        f"{args.messages} messages, {args.concurrency} threads, "
+        f"{args.latency * 1000:.1f} ms simulated RTT"
+    )
+    print(f"{'strategy':<12} {'seconds':>9} {'msgs/sec':>10} {'connections':>12} {'speedup':>8}")
+
+    baseline = None
+    for strategy in strategies:
+        result = run(strategy, args)
+        baseline = baseline or result["rate"]
+        print(
+            f"{strategy:<12} {result['seconds']:>9.2f} {result['rate']:>10.1f} "
+            f"{result['connections']:>12} {result['rate'] / baseline:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Microbenchmark harness.
+
+Each benchmark is timed like timeit: the number of calls per repeat is
+calibrated so one repeat takes at least --min-time, warmup repeats are
+discarded, the garbage collector is disabled while timing, and statistics
+are computed over the per-call times of the measured repeats. Results can be
+saved as a JSON baseline and compared against later runs; a change is only
+flagged when it exceeds both --threshold and the combined noise (stddev) of
+the two runs.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+
+class BenchmarkResult:
+    """Per-call timing statistics of one benchmark, in seconds."""
+
+    def __init__(self, name: str, times: List[float], number: int):
+        self.name = name
+        self.times = times
+        self.number = number
+        self.min = min(times)
+        self.median = statistics.median(times)
+        self.mean = statistics.fmean(times)
+        self.stddev = statistics.stdev(times) if len(times) > 1 else 0.0
+
+    @property
+    def median_us(self) -> float:
+        return self.median * 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "number": self.number,
+            "repeats": len(self.times),
+            "min_us": self.min * 1_000_000,
+            "median_us": self.median * 1_000_000,
+            "mean_us": self.mean * 1_000_000,
+            "stddev_us": self.stddev * 1_000_000,
+        }
+
+
+def _time_calls(func: Callable[[], Any], number: int) -> float:
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure(
+    func: Callable[[], Any],
+    name: str = "",
+    setup: Optional[Callable[[], Any]] = None,
+    warmup: int = 2,
+    repeats: int = 7,
+    min_time: float = 0.1,
+) -> BenchmarkResult:
+    """
+    Time func() with calibrated call counts, warmup and repeats.
+
+    Args:
+        func: Function to benchmark (called without arguments)
+        name: Benchmark name
+        setup: Optional function called before every repeat (untimed), e.g.
+            to reset state that func() accumulates
+        warmup: Repeats run and discarded before measuring
+        repeats: Measured repeats
+        min_time: Minimum duration of one repeat in seconds
+
+    Returns:
+        BenchmarkResult with per-call statistics
+    """
+    if setup:
+        setup()
+    number = 1
+    while True:
+        elapsed = _time_calls(func, number)
+        if elapsed >= min_time:
+            break
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9) * 1.1))
+
+    times = []
+    for i in range(warmup + repeats):
+        if setup:
+            setup()
+        elapsed = _time_calls(func, number)
+        if i >= warmup:
+            times.append(elapsed / number)
+    return BenchmarkResult(name, times, number)
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    if seconds >= 1e-6:
+        return f"{seconds * 1e6:.2f} us"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def compare(
+    result: BenchmarkResult, baseline: Optional[Dict[str, Any]], threshold: float
+) -> str:
+    """Describe the change against a baseline entry ("" without a baseline)."""
+    if not baseline:
+        return ""
+    base_median = baseline["median_us"] / 1_000_000
+    base_stddev = baseline["stddev_us"] / 1_000_000
+    change = (result.median - base_median) / base_median
+    noise = (result.stddev ** 2 + base_stddev ** 2) ** 0.5
+    significant = abs(change) >= threshold and abs(result.median - base_median) > 2 * noise
+    if not significant:
+        return f"{change:+.1%} (no change)"
+    return f"{change:+.1%} ({'slower' if change > 0 else 'faster'})"
+
+
+def environment() -> Dict[str, Any]:
+    """Run metadata stored with saved results."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+
+def run_suite(
+    benchmarks: Dict[str, Callable[[], Any]],
+    setups: Optional[Dict[str, Callable[[], Any]]] = None,
+    description: str = "Run microbenchmarks",
+    argv: Optional[List[str]] = None,
+) -> int:
+    """
+    Command line entry point for a suite of named benchmarks.
+
+    Args:
+        benchmarks: Benchmark functions by name
+        setups: Optional per-repeat setup functions by benchmark name
+        description: Help text of the command
+        argv: Command line arguments (default: sys.argv)
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("-k", "--filter", help="Only run benchmarks whose name matches this regex")
+    parser.add_argument("--repeats", type=int, default=7, help="Measured repeats (default: 7)")
+    parser.add_argument("--warmup", type=int, default=2, help="Discarded repeats (default: 2)")
+    parser.add_argument("--min-time", type=float, default=0.1,
+                        help="Minimum seconds per repeat (default: 0.1)")
+    parser.add_argument("--save", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.05,
+                        help="Smallest relative change reported (default: 0.05)")
+    args = parser.parse_args(argv)
+
+    baseline: Dict[str, Any] = {}
+    if args.compare:
+        with open(args.compare) as f:
+            saved = json.load(f)
+        baseline = saved["results"]
+        meta = saved.get("meta", {})
+        print(f"Baseline: commit {meta.get('commit')} ({meta.get('timestamp')})\n")
+
+    setups = setups or {}
+    pattern = re.compile(args.filter) if args.filter else None
+    width = max(len(name) for name in benchmarks)
+    print(f"{'benchmark':<{width}} {'median':>11} {'stddev':>9} {'min':>11} {'calls':>8}  change")
+    print("-" * (width + 60))
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, func in benchmarks.items():
+        if pattern and not pattern.search(name):
+            continue
+        result = measure(
+            func, name, setups.get(name),
+            warmup=args.warmup, repeats=args.repeats, min_time=args.min_time,
+        )
+        results[name] = result.to_dict()
+        relative_stddev = result.stddev / result.median if result.median else 0.0
+        print(
+            f"{name:<{width}} {_format_time(result.median):>11} {relative_stddev:>8.1%} "
+            f"{_format_time(result.min):>11} {result.number:>8}  "
+            f"{compare(result, baseline.get(name), args.threshold)}"
+        )
+        sys.stdout.flush()
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"meta": environment(), "results": results}, f, indent=2)
+        print(f"\nResults written to {args.save}")
+    return 0
@@ -0,0 +1,367 @@
+"""
+End-to-end load test for the API.
+
+Boots app.main:app with uvicorn in a subprocess against a throwaway SQLite
+database (or --database-url), seeds verified users, then drives each
+scenario with concurrent async HTTP clients for a fixed duration. Reports
+p50/p95/p99 latency and requests per second per scenario and operation, and
+saves the results as JSON so runs from different commits can be compared.
+
+Requires the dev requirements (pip install -r requirements-dev.txt).
+
+Usage:
+    cd backend
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --scenario me --concurrency 50 --duration 30
+    python benchmarks/load_test.py --output after.json --compare before.json
+"""
+import argparse
+import asyncio
+import importlib
+import itertools
+import json
+import os
+import pkgutil
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+PASSWORD = "LoadTest123"
+ADMIN_EMAIL = "loadtest-admin@example.com"
+
+# Weighted operation mix of each scenario
+SCENARIOS: Dict[str, Dict[str, int]] = {
+    "settings": {"settings": 1},
+    "me": {"me": 1},
+    "login": {"login": 1},
+    "register": {"register": 1},
+    "admin": {"admin_users": 1, "admin_usage_users": 1},
+    "mixed": {
+        "settings": 30,
+        "me": 40,
+        "login": 10,
+        "admin_users": 8,
+        "admin_usage_users": 7,
+        "register": 5,
+    },
+}
+
+
+class Context:
+    """Shared state of a load test run (seeded credentials, unique counters)."""
+
+    def __init__(self, user_emails: List[str], user_tokens: List[str], admin_token: str):
+        self.user_emails = user_emails
+        self.user_tokens = user_tokens
+        self.admin_token = admin_token
+        self.run_id = uuid.uuid4().hex[:8]
+        self.counter = itertools.count()
+
+
+async def op_settings(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get("/api/v1/auth/settings")
+
+
+async def op_me(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    token = random.choice(ctx.user_tokens)
+    return await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+
+
+async def op_login(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    email = random.choice(ctx.user_emails)
+    return await client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+
+
+async def op_register(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    email = f"loadtest-{ctx.run_id}-{next(ctx.counter)}@example.com"
+    return await client.post(
+        "/api/v1/auth/register",
+        json={"email": email, "password": PASSWORD, "name": "Load Test"},
+    )
+
+
+async def op_admin_users(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(
+        "/api/v1/admin/users/details",
+        headers={"Authorization": f"Bearer {ctx.admin_token}"},
+    )
+
+
+async def op_admin_usage_users(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(
+        "/api/v1/admin/usage/users",
+        headers={"Authorization": f"Bearer {ctx.admin_token}"},
+    )
+
+
+OPERATIONS = {
+    "settings": op_settings,
+    "me": op_me,
+    "login": op_login,
+    "register": op_register,
+    "admin_users": op_admin_users,
+    "admin_usage_users": op_admin_usage_users,
+}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed(users: int) -> Context:
+    """Create the schema and verified users; return their credentials."""
+    import app.models
+    from app.core.database import Base, SessionLocal, engine
+    from app.core.security import create_access_token
+    from app.models.user import User
+    from app.services.auth_service import auth_service
+
+    # Register every model, so tables added later are created too
+    for module in pkgutil.iter_modules(app.models.__path__):
+        importlib.import_module(f"app.models.{module.name}")
+    Base.metadata.create_all(bind=engine)
+
+    # One bcrypt hash for every seeded user keeps seeding fast
+    hashed_password = auth_service.hash_password(PASSWORD)
+    run_id = uuid.uuid4().hex[:8]
+    emails = [f"loadtest-user-{run_id}-{i}@example.com" for i in range(users)]
+
+    db = SessionLocal()
+    try:
+        for email in emails:
+            db.add(User(email=email, name="Load Test", hashed_password=hashed_password,
+                        auth_provider="email", email_verified=True))
+        if not db.query(User).filter(User.email == ADMIN_EMAIL).first():
+            db.add(User(email=ADMIN_EMAIL, name="Load Test Admin", hashed_password=hashed_password,
+                        auth_provider="email", email_verified=True, is_admin=True))
+        db.commit()
+    finally:
+        db.close()
+    engine.dispose()
+
+    return Context(
+        user_emails=emails,
+        user_tokens=[create_access_token({"sub": email}) for email in emails],
+        admin_token=create_access_token({"sub": ADMIN_EMAIL}),
+    )
+
+
+def start_server(port: int, env: Dict[str, str]) -> subprocess.Popen:
+    """Start uvicorn and wait until it answers /health/live."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health/live").status_code == 200:
+                return process
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Server did not start within 60 seconds")
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of pre-sorted values."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / elapsed, 1) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 2),
+        "p95_ms": round(percentile(values, 95) * 1000, 2),
+        "p99_ms": round(percentile(values, 99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+    }
+
+
+async def run_scenario(
+    base_url: str,
+    ctx: Context,
+    mix: Dict[str, int],
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> Dict[str, Any]:
+    """Run a closed-loop scenario: each client sends its next request when the last completes."""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    results: Dict[str, Tuple[List[float], List[int]]] = {name: ([], [0]) for name in names}
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def worker() -> None:
+            while True:
+                name = random.choices(names, weights)[0]
+                t0 = time.perf_counter()
+                if t0 >= stop_at:
+                    return
+                try:
+                    response = await OPERATIONS[name](client, ctx)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                t1 = time.perf_counter()
+                if t0 < measure_from:
+                    continue
+                latencies, errors = results[name]
+                latencies.append(t1 - t0)
+                if not ok:
+                    errors[0] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - measure_from
+
+    all_latencies = [value for latencies, _ in results.values() for value in latencies]
+    summary = summarize(all_latencies, sum(errors[0] for _, errors in results.values()), elapsed)
+    summary["operations"] = {
+        name: summarize(latencies, errors[0], elapsed)
+        for name, (latencies, errors) in results.items()
+    }
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]]) -> None:
+    header = f"{'scenario':<22} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'rps Δ':>8} {'p95 Δ':>8}"
+    print(header)
+    print("-" * len(header))
+
+    base_scenarios = (baseline or {}).get("scenarios", {})
+    for scenario, summary in results["scenarios"].items():
+        rows = [(scenario, summary, base_scenarios.get(scenario))]
+        if len(summary["operations"]) > 1:
+            base_ops = (base_scenarios.get(scenario) or {}).get("operations", {})
+            rows += [
+                (f"  {name}", op, base_ops.get(name))
+                for name, op in summary["operations"].items()
+            ]
+        for label, row, base in rows:
+            line = (
+                f"{label:<22} {row['requests']:>9} {row['errors']:>7} {row['rps']:>9.1f} "
+                f"{row['p50_ms']:>9.2f} {row['p95_ms']:>9.2f} {row['p99_ms']:>9.2f}"
+            )
+            if baseline:
+                line += f" {change(row['rps'], base, 'rps'):>8} {change(row['p95_ms'], base, 'p95_ms'):>8}"
+            print(line)
+
+
+def change(value: float, base: Optional[Dict[str, Any]], key: str) -> str:
+    if not base or not base.get(key):
+        return "n/a"
+    return f"{(value - base[key]) / base[key] * 100:+.1f}%"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test the API")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable, default: all)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds measured per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds per scenario")
+    parser.add_argument("--users", type=int, default=50, help="Seeded users")
+    parser.add_argument("--database-url", help="Database to test against (default: temporary SQLite)")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against")
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp(prefix='load-test-')}/load.db"
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "SECRET_KEY": os.environ.get("SECRET_KEY", "load-test-secret"),
+        "DEBUG": "false",
+        "RATE_LIMIT_ENABLED": "false",
+        "PYTHONPATH": BACKEND_DIR,
+    }
+    os.environ.update(env)
+
+    print(f"Seeding {args.users} users into {database_url.split('@')[-1]}...")
+    ctx = seed(args.users)
+
+    port = free_port()
+    server = start_server(port, env)
+    try:
+        scenarios = {}
+        for scenario in args.scenario or list(SCENARIOS):
+            print(f"Running {scenario} ({args.concurrency} clients, {args.duration:g}s)...")
+            scenarios[scenario] = asyncio.run(run_scenario(
+                f"http://127.0.0.1:{port}", ctx, SCENARIOS[scenario],
+                args.concurrency, args.duration, args.warmup,
+            ))
+    finally:
+        server.terminate()
+        server.wait()
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": database_url.split(":")[0],
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "users": args.users,
+        },
+        "scenarios": scenarios,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\nBaseline: commit {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    print()
+    print_results(results, baseline)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
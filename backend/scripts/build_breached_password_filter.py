@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+流出パスワードフィルタの作成 - 流出パスワード一覧からBloomフィルタファイルを作成
+
+1行1件の一覧ファイル（平文のパスワード、またはHave I Been Pwnedの
+"SHA1ハッシュ:件数" 形式）を読み込み、BREACHED_PASSWORDS_FILE で指定する
+フィルタファイルを作成します。各ワーカーは起動時にこのファイルをメモリマップし、
+登録・パスワード変更時の確認をネットワークなしで行います。
+
+サイズの目安は誤検出率0.1%で1件あたり約1.8バイト（1000万件で約18MB）です。
+
+使用方法:
+    cd backend
+    python scripts/build_breached_password_filter.py passwords.txt -o breached.bloom
+    python scripts/build_breached_password_filter.py pwned-passwords-sha1.txt.gz -o breached.bloom --error-rate 0.0001
+
+    # 作成後
+    BREACHED_PASSWORDS_FILE=breached.bloom python start.py
+"""
+
+import argparse
+import gzip
+import os
+import re
+import sys
+import time
+from typing import IO, Iterator, List
+
+# パスの設定
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 設定の読み込みに必要な値（このスクリプトはDBを使いません）
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "build-breached-password-filter")
+
+from app.core.bloom import BloomFilter
+from app.core.breached_passwords import password_key, write_filter
+
+SHA1_LINE = re.compile(rb"^([0-9A-Fa-f]{40})(?::\d+)?$")
+
+
+def open_list(path: str) -> IO[bytes]:
+    """一覧ファイルを開く（.gzは展開しながら読む）"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_keys(paths: List[str], input_format: str) -> Iterator[bytes]:
+    """一覧ファイルの各行をフィルタの要素（パスワードのSHA-1）に変換"""
+    for path in paths:
+        with open_list(path) as f:
+            for line in f:
+                line = line.rstrip(b"\r\n")
+                if not line:
+                    continue
+                if input_format != "plain":
+                    match = SHA1_LINE.match(line)
+                    if match:
+                        yield bytes.fromhex(match.group(1).decode())
+                        continue
+                    if input_format == "sha1":
+                        continue
+                yield password_key(line)
+
+
+def count_lines(paths: List[str]) -> int:
+    """件数を数える（容量の指定がない場合）"""
+    total = 0
+    for path in paths:
+        with open_list(path) as f:
+            total += sum(1 for line in f if line.strip())
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="流出パスワード一覧からBloomフィルタファイルを作成")
+    parser.add_argument("lists", nargs="+", help="一覧ファイル（1行1件、.gz可）")
+    parser.add_argument("-o", "--output", required=True, help="出力ファイル")
+    parser.add_argument("--error-rate", type=float, default=0.001, help="誤検出率（既定0.001）")
+    parser.add_argument("--capacity", type=int, help="件数（省略時は一覧を数える）")
+    parser.add_argument(
+        "--format",
+        choices=["auto", "plain", "sha1"],
+        default="auto",
+        help="auto: 40桁の16進数はSHA-1、それ以外は平文として扱う",
+    )
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    capacity = args.capacity or count_lines(args.lists)
+    bloom = BloomFilter(capacity, args.error_rate)
+    print(f"容量: {capacity}件, {bloom.num_bits // 8} バイト, ハッシュ関数 {bloom.num_hashes}個")
+
+    for key in read_keys(args.lists, args.format):
+        bloom.add(key)
+        if bloom.count % 1_000_000 == 0:
+            print(f"  {bloom.count}件...")
+
+    if bloom.count > capacity:
+        print(f"警告: 件数({bloom.count})が容量を超えているため誤検出率が上がります", file=sys.stderr)
+
+    tmp_path = f"{args.output}.tmp"
+    write_filter(tmp_path, bloom)
+    # 読み込み中のワーカーがあっても壊れないよう置き換える
+    os.replace(tmp_path, args.output)
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ {bloom.count}件を {args.output} に書き込みました（{elapsed:.1f}秒）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+IP→ASN表の作成 - IPアドレス範囲とAS番号の一覧から検索用ファイルを作成
+
+iptoasn.com の ip2asn-combined.tsv（.gz可）と同じ形式のTSV
+（"開始IP<TAB>終了IP<TAB>AS番号<TAB>国コード<TAB>AS名"、IPv4/IPv6混在可）を読み込み、
+IP_ASN_FILE で指定するファイルを作成します。各ワーカーは起動時にこのファイルを
+メモリマップし、管理画面のネットワーク別ログイン集計にAS番号とAS名を付けます。
+
+AS番号0（経路なし）の行は除外します。
+
+使用方法:
+    cd backend
+    curl -O https://iptoasn.com/data/ip2asn-combined.tsv.gz
+    python scripts/build_ip_asn_file.py ip2asn-combined.tsv.gz -o ip-asn.bin
+
+    # 作成後
+    IP_ASN_FILE=ip-asn.bin python start.py
+"""
+
+import argparse
+import gzip
+import os
+import sys
+import time
+from typing import Dict, IO, List, Tuple
+
+# パスの設定
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 設定の読み込みに必要な値（このスクリプトはDBを使いません）
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "build-ip-asn-file")
+
+from app.core.ip_asn import Range, write_table
+from app.core.ip_prefixes import parse_ip
+
+
+def open_list(path: str) -> IO[str]:
+    """一覧ファイルを開く（.gzは展開しながら読む）"""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def read_ranges(paths: List[str]) -> Tuple[Dict[int, List[Range]], Dict[int, str], int]:
+    """一覧ファイルを読み込み、IPバージョンごとの範囲とAS名を返す"""
+    ranges: Dict[int, List[Range]] = {4: [], 6: []}
+    names: Dict[int, str] = {}
+    skipped = 0
+    for path in paths:
+        with open_list(path) as f:
+            for line in f:
+                fields = line.rstrip("\r\n").split("\t")
+                if len(fields) < 3:
+                    skipped += 1
+                    continue
+                first, last = parse_ip(fields[0]), parse_ip(fields[1])
+                try:
+                    asn = int(fields[2])
+                except ValueError:
+                    asn = 0
+                if not first or not last or first[0] != last[0] or asn == 0:
+                    skipped += 1
+                    continue
+                ranges[first[0]].append((first[1], last[1], asn))
+                if len(fields) >= 5 and fields[4] and asn not in names:
+                    names[asn] = fields[4]
+    return ranges, names, skipped
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="IPアドレス範囲とAS番号の一覧からIP→ASN表を作成")
+    parser.add_argument("lists", nargs="+", help="一覧ファイル（ip2asn形式のTSV、.gz可）")
+    parser.add_argument("-o", "--output", required=True, help="出力ファイル")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    ranges, names, skipped = read_ranges(args.lists)
+    for version in ranges:
+        ranges[version].sort()
+        # 重なりがあると二分探索で正しく引けないため、後の範囲を切り詰める
+        merged: List[Range] = []
+        for first, last, asn in ranges[version]:
+            if merged and first <= merged[-1][1]:
+                first = merged[-1][1] + 1
+                if first > last:
+                    continue
+            merged.append((first, last, asn))
+        ranges[version] = merged
+
+    tmp_path = f"{args.output}.tmp"
+    write_table(tmp_path, ranges[4], ranges[6], names)
+    # 読み込み中のワーカーがあっても壊れないよう置き換える
+    os.replace(tmp_path, args.output)
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"✓ IPv4 {len(ranges[4])}件, IPv6 {len(ranges[6])}件, AS名 {len(names)}件を "
+        f"{args.output} に書き込みました（除外 {skipped}行, {elapsed:.1f}秒）"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+クエリ数バジェットチェック - エンドポイントごとのSQL発行数を検証
+
+一時的なSQLiteデータベースにテストデータを投入し、各エンドポイントを
+TestClientで呼び出して、発行されたSQL文の数が宣言したバジェット以内か
+確認します。N+1クエリが混入するとデータ件数に比例してクエリ数が増えるため
+失敗します。
+
+使用方法:
+    cd backend
+    python scripts/check_query_budgets.py
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+
+# パスの設定
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# アプリのインポート前にテスト用データベースを設定
+_db_dir = tempfile.mkdtemp(prefix="query-budgets-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/budgets.db"
+os.environ.setdefault("SECRET_KEY", "query-budget-check")
+os.environ["DEBUG"] = "false"
+
+from fastapi.testclient import TestClient
+
+from app.core.database import Base, SessionLocal, engine
+from app.core.query_stats import assert_max_queries
+from app.core.revocation import revocation_list
+from app.main import app
+from app.models import admin_user, email_outbox, login_history, system_settings, usage_stats  # noqa: F401
+from app.models.admin_user import AdminUser
+from app.models.user import User
+from app.services.session_service import session_service
+
+# 件数に依存しないようにするため、各テーブルに複数行を投入する
+SEED_USERS = 20
+SEED_ADMINS = 10
+
+# (メソッド, パス, 最大クエリ数)
+BUDGETS = [
+    ("GET", "/api/v1/auth/me", 1),
+    ("GET", "/api/v1/auth/settings", 1),
+    ("GET", "/api/v1/admin/admins", 1),
+    ("GET", "/api/v1/admin/users/details", 2),
+    ("GET", "/api/v1/admin/usage/summary", 2),
+    ("GET", "/api/v1/admin/usage/stats", 1),
+    ("GET", "/api/v1/admin/usage/users", 2),
+    ("GET", "/api/v1/admin/usage/login-anomalies", 1),
+    ("GET", "/api/v1/admin/usage/login-networks", 0),
+    ("GET", "/api/v1/admin/logins", 1),
+    ("GET", "/api/v1/admin/logins?ip=127.0.0.1&since=2026-01-01T00:00:00", 1),
+    ("GET", "/api/v1/admin/settings/auth", 1),
+]
+
+
+def seed() -> str:
+    """テストデータを投入し、管理者のアクセストークンを返す"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        owner = User(id=uuid.uuid4(), email="owner@example.com", name="Owner",
+                     email_verified=True, is_admin=True)
+        db.add(owner)
+        for i in range(SEED_USERS):
+            user = User(id=uuid.uuid4(), email=f"user{i}@example.com", name=f"User {i}",
+                        email_verified=True, is_admin=i < SEED_ADMINS)
+            db.add(user)
+            if i < SEED_ADMINS:
+                db.add(AdminUser(user_id=user.id, added_by_user_id=owner.id))
+        db.commit()
+        token = session_service.issue(db, owner).access_token
+    finally:
+        db.close()
+    # 失効リストの初回読み込みは計測対象外にする
+    revocation_list.sync()
+    return token
+
+
+def main() -> int:
+    token = seed()
+    headers = {"Authorization": f"Bearer {token}"}
+    client = TestClient(app)
+
+    failures = 0
+    for method, path, budget in BUDGETS:
+        try:
+            with assert_max_queries(budget) as statements:
+                response = client.request(method, path, headers=headers)
+        except AssertionError as e:
+            failures += 1
+            print(f"✗ {method} {path}\n{e}")
+            continue
+        if response.status_code >= 400:
+            failures += 1
+            print(f"✗ {method} {path}: HTTP {response.status_code}")
+            continue
+        print(f"✓ {method} {path}: {len(statements)}/{budget} queries")
+
+    print()
+    if failures:
+        print(f"✗ {failures}件のエンドポイントがバジェットを超えました")
+        return 1
+    print("✓ すべてのエンドポイントがバジェット内です")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,7 +16,16 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.core.database import SessionLocal
 from app.models.user import User
+from app.core.security import hash_token
 from app.services.auth_service import auth_service
+from app.services.one_time_tokens import (
+    PURPOSE_EMAIL_VERIFICATION,
+    PURPOSE_PASSWORD_RESET,
+    generate_token,
+    one_time_tokens,
+    token_lifetime,
+)
+from datetime import datetime
 from sqlalchemy import func
 import uuid
 
@@ -69,15 +78,17 @@ def test_token_generation():
     print_section("トークン生成テスト")
 
     # メール検証トークン
-    verification_token = auth_service.generate_verification_token()
+    verification_token = generate_token()
     print(f"メール検証トークン: {verification_token[:30]}...")
     print(f"長さ: {len(verification_token)} 文字")
+    print(f"保存されるハッシュ: {hash_token(verification_token)}")
+    print(f"有効期間: {token_lifetime(PURPOSE_EMAIL_VERIFICATION)}")
 
     # パスワードリセットトークン
-    reset_token, expires = auth_service.generate_password_reset_token()
+    reset_token = generate_token()
+    expires = datetime.utcnow() + token_lifetime(PURPOSE_PASSWORD_RESET)
     print(f"\nパスワードリセットトークン: {reset_token[:30]}...")
-    print(f"有効期限: {expires}")
-    print(f"有効期限（相対）: {expires.strftime('%Y-%m-%d %H:%M:%S UTC')}")
+    print(f"有効期限: {expires.strftime('%Y-%m-%d %H:%M:%S UTC')}")
 
 def show_database_status():
     """データベースの状態を表示"""
@@ -148,7 +159,6 @@ def create_test_user():
         # 新規作成
         test_password = "QuickTest123"
         hashed_password = auth_service.hash_password(test_password)
-        verification_token = auth_service.generate_verification_token()
 
         test_user = User(
             id=uuid.uuid4(),
@@ -157,11 +167,12 @@ def create_test_user():
             hashed_password=hashed_password,
             auth_provider="email",
             email_verified=False,
-            email_verification_token=verification_token,
             is_admin=False,
         )
 
         db.add(test_user)
+        db.flush()
+        verification_token = one_time_tokens.issue(db, test_user.id, PURPOSE_EMAIL_VERIFICATION)
         db.commit()
 
         print(f"✓ テストユーザーを作成しました")
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+ローカルSMTPシンク - 開発・テスト用のSMTPサーバー
+
+受信したメールを配送せずに記録します。SMTP_HOST/SMTP_PORTをこのサーバーに
+向けると、メール送信キュー（アウトボックス）の動作を実際のSMTP通信で
+確認できます。--fail-rateで一時エラー(451)を返し、再送処理も試せます。
+--latencyで応答ごとの往復遅延を、--idle-timeoutでアイドル接続の切断を
+再現し、SMTP接続プールの効果や再接続の動作を確認できます。
+
+使用方法:
+    cd backend
+    python scripts/smtp_sink.py --port 1025
+    python scripts/smtp_sink.py --port 1025 --fail-rate 0.3 --save-dir /tmp/mails
+    python scripts/smtp_sink.py --port 1025 --latency 0.02 --idle-timeout 10
+
+    # 別ターミナルで
+    SMTP_HOST=localhost SMTP_PORT=1025 python start.py
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import time
+from email import message_from_bytes
+from email.header import decode_header, make_header
+from typing import List, Optional
+
+
+class SMTPSink:
+    """受信したメッセージを記録する最小限のSMTPサーバー"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 1025,
+        fail_rate: float = 0.0,
+        delay: float = 0.0,
+        save_dir: Optional[str] = None,
+        quiet: bool = False,
+        latency: float = 0.0,
+        idle_timeout: float = 0.0,
+    ):
+        self.host = host
+        self.port = port
+        self.fail_rate = fail_rate
+        self.delay = delay
+        self.save_dir = save_dir
+        self.quiet = quiet
+        self.latency = latency
+        self.idle_timeout = idle_timeout
+        self.messages: List[bytes] = []
+        self.accepted = 0
+        self.rejected = 0
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> None:
+        """サーバーを起動する（port=0の場合は空きポートを使用）"""
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """サーバーを停止する"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+
+        def reply(line: str) -> None:
+            writer.write(f"{line}\r\n".encode())
+
+        async def flush() -> None:
+            # パイプライン化されたコマンドが残っている間は応答をまとめて返し、
+            # クライアントが応答待ちになった時点で往復遅延を1回だけ加える
+            if reader._buffer:
+                return
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            await writer.drain()
+
+        reply("220 smtp-sink ESMTP ready")
+        await flush()
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.idle_timeout or None)
+                except asyncio.TimeoutError:
+                    reply("421 Idle timeout, closing connection")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                command = line.decode("utf-8", "replace").strip()
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    reply("250-smtp-sink")
+                    reply("250-PIPELINING")
+                    reply("250-8BITMIME")
+                    reply("250 SIZE 10485760")
+                elif verb == "HELO":
+                    reply("250 smtp-sink")
+                elif verb in ("MAIL", "RCPT", "RSET", "NOOP"):
+                    reply("250 OK")
+                elif verb == "DATA":
+                    reply("354 End data with <CR><LF>.<CR><LF>")
+                    await flush()
+                    data = await self._read_data(reader)
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    if random.random() < self.fail_rate:
+                        self.rejected += 1
+                        reply("451 Temporary failure (injected)")
+                    else:
+                        self._store(data)
+                        reply("250 OK queued")
+                elif verb == "QUIT":
+                    reply("221 Bye")
+                    await writer.drain()
+                    break
+                else:
+                    reply("502 Command not implemented")
+                await flush()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_data(reader: asyncio.StreamReader) -> bytes:
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                break
+            # ドットスタッフィングを解除
+            lines.append(line[1:] if line.startswith(b"..") else line)
+        return b"".join(lines)
+
+    def _store(self, data: bytes) -> None:
+        self.accepted += 1
+        self.messages.append(data)
+        if self.save_dir:
+            path = os.path.join(self.save_dir, f"{time.time():.6f}-{self.accepted}.eml")
+            with open(path, "wb") as f:
+                f.write(data)
+        if not self.quiet:
+            message = message_from_bytes(data)
+            subject = str(make_header(decode_header(message.get("Subject", ""))))
+            print(f"✓ {message.get('To')}: {subject}")
+
+
+async def serve(args: argparse.Namespace) -> None:
+    sink = SMTPSink(
+        args.host, args.port, args.fail_rate, args.delay, args.save_dir, args.quiet,
+        args.latency, args.idle_timeout,
+    )
+    await sink.start()
+    print(f"SMTPシンクを起動しました: {sink.host}:{sink.port} (Ctrl+Cで終了)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sink.stop()
+        print(f"\n受信: {sink.accepted}件, 一時エラー: {sink.rejected}件, 接続: {sink.connections}件")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local SMTP sink for development and tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--fail-rate", type=float, default=0.0,
+                        help="Share of messages answered with 451 (0-1)")
+    parser.add_argument("--delay", type=float, default=0.0,
+                        help="Seconds to wait before answering each message")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Simulated round-trip time in seconds added to each reply")
+    parser.add_argument("--idle-timeout", type=float, default=0.0,
+                        help="Close connections idle for this many seconds (0 = never)")
+    parser.add_argument("--save-dir", help="Write received messages as .eml files")
+    parser.add_argument("--quiet", action="store_true", help="Do not print each message")
+    args = parser.parse_args()
+    if args.save_dir:
+        os.makedirs(args.save_dir, exist_ok=True)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,98 @@
 #!/usr/bin/env python
-"""Entry point script to start the FastAPI application."""
+"""Entry point script to start the FastAPI application.
+
+Set STARTUP_MODE=fast to skip diagnostics, defer optional imports and use a
+cached schema revision check. The fast mode prints a per-phase startup timing
+breakdown once the server is accepting requests.
+
+Set SERVER_MODE=multi to serve with one preloaded Gunicorn/Uvicorn worker per
+CPU (or WEB_CONCURRENCY) instead of a single process.
+
+Migrations normally run as a separate job (python -m app.scripts.migrate).
+Set MIGRATE_ON_STARTUP=true to run them here instead; they are serialized
+across instances by the migration lock either way. Until the schema is at
+head, /health/ready reports not ready.
+
+In multi-process mode, Prometheus metrics are written to per-process files
+under PROMETHEUS_MULTIPROC_DIR (a fresh temporary directory unless set) and
+aggregated by /metrics.
+"""
+import time
+
+_PROCESS_START = time.perf_counter()
+
 import sys
 import os
 
-print("=== Markdown Editor Backend Startup ===")
-print(f"Python version: {sys.version}")
-print(f"Working directory: {os.getcwd()}")
-print(f"PYTHONPATH: {os.environ.get('PYTHONPATH', 'not set')}")
-print(f"PORT: {os.environ.get('PORT', '8080')}")
-print()
 
-try:
+def configure_metrics() -> None:
+    """
+    Prepare multi-process metric storage.
+
+    Must run before the app (and with it prometheus_client) is imported.
+    """
+    if os.environ.get("SERVER_MODE", "single").lower() != "multi":
+        return
+
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not metrics_dir:
+        import tempfile
+
+        os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="prometheus-")
+        return
+
+    # Files left over from a previous run would be aggregated as live data
+    os.makedirs(metrics_dir, exist_ok=True)
+    for name in os.listdir(metrics_dir):
+        if name.endswith(".db"):
+            os.remove(os.path.join(metrics_dir, name))
+
+
+def prepare_schema() -> str:
+    """Check (or, if enabled, migrate) the schema and open the readiness gate."""
+    from app.core.config import settings
+    from app.core.schema import check_schema, migrate, schema_gate
+
+    status = migrate() if settings.migrate_on_startup else check_schema()
+    if status != "pending":
+        schema_gate.mark_ready()
+    return status
+
+
+def serve(app, timer=None):
+    """Run the server in the configured single- or multi-process mode."""
+    from app.core.config import settings
+
+    port = int(os.environ.get("PORT", "8080"))
+
+    if settings.server_mode == "multi":
+        from app.core.server import run_multi_worker
+
+        run_multi_worker(app, port, timer)
+        return
+
+    import uvicorn
+
+    if timer is None:
+        uvicorn.run(app, host="0.0.0.0", port=port)
+        return
+
+    from app.core.startup import TimedServer
+
+    TimedServer(uvicorn.Config(app, host="0.0.0.0", port=port), timer).run()
+
+
+def run_standard():
+    """Start with full diagnostics and a schema check (or migration run)."""
+    print("=== Markdown Editor Backend Startup ===")
+    print(f"Python version: {sys.version}")
+    print(f"Working directory: {os.getcwd()}")
+    print(f"PYTHONPATH: {os.environ.get('PYTHONPATH', 'not set')}")
+    print(f"PORT: {os.environ.get('PORT', '8080')}")
+    print()
+
+    configure_metrics()
+
     print("Testing Python imports...")
     import fastapi
     print(f"FastAPI version: {fastapi.__version__}")
@@ -20,31 +102,57 @@ try:
     print("FastAPI app imported successfully")
     print()
 
-    print("Running database migrations...")
+    print("Checking database schema...")
     try:
-        from alembic.config import Config
-        from alembic.command import upgrade
-
-        alembic_cfg = Config("/app/alembic.ini")
-        upgrade(alembic_cfg, "head")
-        print("Database migration completed successfully")
-    except Exception as migration_error:
-        print(f"WARNING: Database migration encountered an issue: {migration_error}")
-        print("Attempting to create tables using SQLAlchemy...")
-        try:
-            from app.core.database import engine, Base
-            Base.metadata.create_all(bind=engine)
-            print("Tables created using SQLAlchemy")
-        except Exception as table_error:
-            print(f"WARNING: Could not create tables: {table_error}")
-        print("Continuing startup anyway...")
+        status = prepare_schema()
+        print(f"Database schema: {status}")
+        if status == "pending":
+            print("WARNING: Schema is behind the code; /health/ready reports not ready until migrated")
+    except Exception as schema_error:
+        print(f"WARNING: Database schema check failed: {schema_error}")
+        print("Continuing startup; /health/ready reports not ready until the schema is current")
     print()
 
-    print("Starting uvicorn server...")
-    port = int(os.environ.get("PORT", "8080"))
-    uvicorn.run(app, host="0.0.0.0", port=port)
-except Exception as e:
-    print(f"ERROR: {e}", file=sys.stderr)
-    import traceback
-    traceback.print_exc()
-    sys.exit(1)
+    print("Starting server...")
+    serve(app)
+
+
+def run_fast():
+    """
+    Start with deferred imports, a cached schema check and phase timing.
+
+    Sentry is initialized by the application lifespan (see app.main).
+    """
+    from app.core.startup import StartupTimer
+    import uvicorn
+
+    timer = StartupTimer(start=_PROCESS_START)
+    timer.mark("import_server")
+
+    configure_metrics()
+    with timer.phase("import_app"):
+        from app.main import app
+
+    with timer.phase("schema_check"):
+        try:
+            schema_status = prepare_schema()
+        except Exception as schema_error:
+            schema_status = f"failed ({schema_error})"
+
+    print(f"Schema check: {schema_status}")
+    serve(app, timer)
+
+
+if __name__ == "__main__":
+    try:
+        from app.core.config import settings
+
+        if settings.startup_mode == "fast":
+            run_fast()
+        else:
+            run_standard()
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
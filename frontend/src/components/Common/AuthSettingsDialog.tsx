@@ -195,6 +195,21 @@ const AuthSettingsDialog = ({
               label="特殊文字必須"
               sx={{ color: '#000' }}
             />
+            <FormControlLabel
+              control={
+                <Checkbox
+                  checked={settings.password_check_breached}
+                  onChange={(e) =>
+                    setSettings({
+                      ...settings,
+                      password_check_breached: e.target.checked,
+                    })
+                  }
+                />
+              }
+              label="流出済みパスワードを禁止"
+              sx={{ color: '#000' }}
+            />
             <FormControlLabel
               control={
                 <Checkbox
@@ -246,6 +246,10 @@ const AdminSettingsPage = () => {
                   control={<Checkbox checked={authSettings.password_require_special} />}
                   label="特殊文字必須"
                 />
+                <FormControlLabel
+                  control={<Checkbox checked={authSettings.password_check_breached} />}
+                  label="流出済みパスワードを禁止"
+                />
                 <FormControlLabel
                   control={<Checkbox checked={authSettings.email_verification_required} />}
                   label="メール検証必須"
@@ -84,8 +84,9 @@ export const useAuthStore = create<AuthState>()(
             { token: googleToken }
           );
 
-          // アクセストークンをローカルストレージに保存
+          // アクセストークンとリフレッシュトークンをローカルストレージに保存
           localStorage.setItem('accessToken', response.access_token);
+          localStorage.setItem('refreshToken', response.refresh_token);
 
           set({
             user: response.user,
@@ -145,8 +146,9 @@ export const useAuthStore = create<AuthState>()(
             password,
           });
 
-          // アクセストークンをローカルストレージに保存
+          // アクセストークンとリフレッシュトークンをローカルストレージに保存
           localStorage.setItem('accessToken', response.access_token);
+          localStorage.setItem('refreshToken', response.refresh_token);
 
           set({
             user: response.user,
@@ -328,6 +330,7 @@ export const useAuthStore = create<AuthState>()(
 
           // トークンが無効な場合は認証情報をクリア
           localStorage.removeItem('accessToken');
+          localStorage.removeItem('refreshToken');
           set({
             user: null,
             accessToken: null,
@@ -375,7 +378,16 @@ export const useAuthStore = create<AuthState>()(
 
       // ログアウト
       logout: () => {
+        // サーバー側のセッションを失効（失敗してもローカルの認証情報は破棄する）。
+        // アクセストークンの期限切れ後も失効できるよう、破棄する前のリフレッシュトークンを送る
+        const refreshToken = localStorage.getItem('refreshToken');
+        if (refreshToken || get().accessToken) {
+          apiClient
+            .post('/api/v1/auth/logout', refreshToken ? { refresh_token: refreshToken } : undefined)
+            .catch(() => {});
+        }
         localStorage.removeItem('accessToken');
+        localStorage.removeItem('refreshToken');
         set({
           user: null,
           accessToken: null,
@@ -402,6 +414,7 @@ export const useAuthStore = create<AuthState>()(
       clearError: () => set({ error: null }),
       clearAuth: () => {
         localStorage.removeItem('accessToken');
+        localStorage.removeItem('refreshToken');
         set({
           user: null,
           accessToken: null,
@@ -421,3 +434,8 @@ export const useAuthStore = create<AuthState>()(
     }
   )
 );
+
+// APIクライアントがアクセストークンを更新したらストアにも反映
+apiClient.onTokenRefreshed((accessToken) => {
+  useAuthStore.setState({ accessToken });
+});
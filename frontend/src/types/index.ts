@@ -49,7 +49,9 @@ export interface UserDisplay {
 // 認証レスポンスの型定義
 export interface AuthResponse {
   access_token: string;
+  refresh_token: string;
   token_type: string;
+  expires_in: number;
   user: User;
 }
 
@@ -285,4 +287,5 @@ export interface AuthMethodSettings {
   password_require_lowercase: boolean;
   password_require_number: boolean;
   password_require_special: boolean;
+  password_check_breached: boolean;
 }
@@ -10,13 +10,30 @@ export interface ApiError {
   detail?: string;
 }
 
+// Endpoints whose 401 means bad credentials, not an expired access token
+const NO_REFRESH_ENDPOINTS = [
+  '/api/v1/auth/login',
+  '/api/v1/auth/google/login',
+  '/api/v1/auth/refresh',
+  '/api/v1/auth/logout',
+];
+
 class ApiClient {
   private baseUrl: string;
+  private refreshing: Promise<boolean> | null = null;
+  private tokenListener: ((accessToken: string) => void) | null = null;
 
   constructor(baseUrl: string) {
     this.baseUrl = baseUrl;
   }
 
+  /**
+   * Register a callback for access tokens renewed by the client
+   */
+  onTokenRefreshed(listener: (accessToken: string) => void): void {
+    this.tokenListener = listener;
+  }
+
   /**
    * Get authorization header with access token
    */
@@ -30,6 +47,77 @@ class ApiClient {
     };
   }
 
+  /**
+   * Exchange the stored refresh token for a new token pair.
+   * Concurrent callers share one request (a refresh token works only once).
+   */
+  private refreshTokens(): Promise<boolean> {
+    const refreshToken = localStorage.getItem('refreshToken');
+    if (!refreshToken) {
+      return Promise.resolve(false);
+    }
+
+    if (!this.refreshing) {
+      this.refreshing = (async () => {
+        try {
+          const response = await fetch(`${this.baseUrl}/api/v1/auth/refresh`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ refresh_token: refreshToken }),
+          });
+          if (!response.ok) {
+            localStorage.removeItem('refreshToken');
+            return false;
+          }
+
+          const data = await response.json();
+          localStorage.setItem('accessToken', data.access_token);
+          localStorage.setItem('refreshToken', data.refresh_token);
+          this.tokenListener?.(data.access_token);
+          return true;
+        } catch {
+          return false;
+        } finally {
+          this.refreshing = null;
+        }
+      })();
+    }
+    return this.refreshing;
+  }
+
+  /**
+   * Send a request; on 401 renew the access token once and retry
+   */
+  private async request<T>(
+    method: string,
+    endpoint: string,
+    body?: string,
+    token?: string
+  ): Promise<T> {
+    const send = (accessToken?: string) =>
+      fetch(`${this.baseUrl}${endpoint}`, {
+        method,
+        headers: {
+          'Content-Type': 'application/json',
+          ...this.getAuthHeader(accessToken),
+        },
+        body,
+      });
+
+    let response = await send(token);
+
+    if (
+      response.status === 401 &&
+      !NO_REFRESH_ENDPOINTS.includes(endpoint) &&
+      (token || localStorage.getItem('accessToken')) &&
+      (await this.refreshTokens())
+    ) {
+      response = await send(localStorage.getItem('accessToken') || undefined);
+    }
+
+    return this.handleResponse<T>(response);
+  }
+
   /**
    * Handle API response
    */
@@ -61,31 +149,14 @@ class ApiClient {
     data?: D,
     token?: string
   ): Promise<T> {
-    const response = await fetch(`${this.baseUrl}${endpoint}`, {
-      method: 'POST',
-      headers: {
-        'Content-Type': 'application/json',
-        ...this.getAuthHeader(token),
-      },
-      body: data ? JSON.stringify(data) : undefined,
-    });
-
-    return this.handleResponse<T>(response);
+    return this.request<T>('POST', endpoint, data ? JSON.stringify(data) : undefined, token);
   }
 
   /**
    * GET request
    */
   async get<T>(endpoint: string, token?: string): Promise<T> {
-    const response = await fetch(`${this.baseUrl}${endpoint}`, {
-      method: 'GET',
-      headers: {
-        'Content-Type': 'application/json',
-        ...this.getAuthHeader(token),
-      },
-    });
-
-    return this.handleResponse<T>(response);
+    return this.request<T>('GET', endpoint, undefined, token);
   }
 
   /**
@@ -96,31 +167,14 @@ class ApiClient {
     data: D,
     token?: string
   ): Promise<T> {
-    const response = await fetch(`${this.baseUrl}${endpoint}`, {
-      method: 'PUT',
-      headers: {
-        'Content-Type': 'application/json',
-        ...this.getAuthHeader(token),
-      },
-      body: JSON.stringify(data),
-    });
-
-    return this.handleResponse<T>(response);
+    return this.request<T>('PUT', endpoint, JSON.stringify(data), token);
   }
 
   /**
    * DELETE request
    */
   async delete<T>(endpoint: string, token?: string): Promise<T> {
-    const response = await fetch(`${this.baseUrl}${endpoint}`, {
-      method: 'DELETE',
-      headers: {
-        'Content-Type': 'application/json',
-        ...this.getAuthHeader(token),
-      },
-    });
-
-    return this.handleResponse<T>(response);
+    return this.request<T>('DELETE', endpoint, undefined, token);
   }
 }
 